@@ -18,9 +18,82 @@ class Config:
         'tickets': "tickets.json",
         'reservations': "reservations.json",
         'payments': "payments.json",
-        'showtimes': "showtimes.json"
+        'showtimes': "showtimes.json",
+        'orders': "orders.json",
+        'refunds': "refunds.json",
+        'cash_closes': "cash_closes.json"
     }
     
+    # Colecciones particionadas por mes: archivo -> campo de fecha
+    PARTITIONED_FILES = {
+        'tickets.json': 'showtime',
+        'payments.json': 'payment_date',
+        'reservations.json': 'showtime',
+        'orders.json': 'created_at',
+        'refunds.json': 'refunded_at'
+    }
+    
+    # Archivo histórico comprimido: archivo -> campo de fecha (None = solo inactivos)
+    ARCHIVED_FILES = {
+        'tickets.json': 'showtime',
+        'payments.json': 'payment_date',
+        'reservations.json': 'showtime',
+        'orders.json': 'created_at',
+        'refunds.json': 'refunded_at'
+    }
+    # Colecciones maestras: no se archivan (sus índices únicos y búsquedas por
+    # ID deben ver también los registros desactivados)
+    MASTER_FILES = {
+        'movies.json': 'movie_id',
+        'food_menu.json': 'item_id',
+        'users.json': 'user_id'
+    }
+    ARCHIVE_COMPRESSION = 'gzip'     # 'gzip' o 'lzma'
+    ARCHIVE_INTERVAL_HOURS = 24      # Frecuencia de la compactación
+    ARCHIVE_RETENTION_DAYS = 30      # Antigüedad de funciones/pagos antes de archivarlos
+    
+    # Reportes en paralelo por partición (1 = ejecución en serie)
+    REPORT_WORKERS = min(4, os.cpu_count() or 1)
+    REPORT_PARALLEL_MIN_PARTITIONS = 2
+    REPORT_CACHE_SIZE = 64           # Resultados de reportes guardados en memoria
+    
+    # Cifrado de contraseñas ('scrypt' o 'pbkdf2_sha256'); calibrar con
+    # `python -m services.password_hasher` para no superar PASSWORD_HASH_TARGET_MS
+    PASSWORD_HASH_ALGORITHM = 'scrypt'
+    PASSWORD_HASH_PARAMS = {
+        'scrypt': {'n': 2 ** 14, 'r': 8, 'p': 1},
+        'pbkdf2_sha256': {'i': 600000}
+    }
+    # Máximos aceptados en hashes importados: limitan la memoria y el tiempo de un login
+    PASSWORD_HASH_MAX_PARAMS = {
+        'scrypt': {'n': 2 ** 16, 'r': 16, 'p': 4},
+        'pbkdf2_sha256': {'i': 2000000}
+    }
+    PASSWORD_HASH_WORKERS = min(4, os.cpu_count() or 1)
+    PASSWORD_HASH_TARGET_MS = 250
+    
+    # Importación masiva de usuarios (filas validadas por lote)
+    USER_IMPORT_BATCH_SIZE = 1000
+    
+    # Programación de funciones: limpieza entre funciones de una sala y horario de atención
+    SHOWTIME_CLEANING_MINUTES = 15
+    CINEMA_OPENING_TIME = "09:00"
+    CINEMA_CLOSING_TIME = "24:00"
+    
+    # Generador de programación: inicios en múltiplos de SCHEDULE_SLOT_MINUTES y
+    # cada repetición de una película en el mismo día vale SCHEDULE_REPEAT_DECAY veces la anterior
+    SCHEDULE_SLOT_MINUTES = 15
+    SCHEDULE_REPEAT_DECAY = 0.7
+    SCHEDULE_LOCAL_SEARCH_PASSES = 5
+    
+    # Existencias de comida: umbral de alerta por defecto y escritura por lotes de los contadores
+    FOOD_LOW_STOCK_THRESHOLD = 10
+    COUNTER_FLUSH_EVERY = 50         # Cambios acumulados antes de escribir
+    COUNTER_FLUSH_SECONDS = 5.0      # Máximo tiempo con cambios sin escribir
+    
+    # Búsqueda aproximada: similitud mínima de trigramas (0-1) para sugerir resultados
+    FUZZY_THRESHOLD = 0.3
+    
     # Configuración de la aplicación
     APP_NAME = "DDS-CINE"
     APP_VERSION = "1.0.0"
@@ -44,6 +117,10 @@ class Config:
     # Configuración de reservas
     RESERVATION_DAYS_MIN = 2
     RESERVATION_DAYS_MAX = 7
+    RESERVATION_EXPIRY_BATCH_SIZE = 500   # Reservas vencidas procesadas por escritura
+    # Códigos de reserva: permutación de Feistel del ID con esta clave, en base 32
+    RESERVATION_CODE_KEY = "dds-cine-reservas"
+    RESERVATION_CODE_LENGTH = 8
     CANCELLATION_DAYS_MIN = 1
     CANCELLATION_DAYS_MAX = 2
     
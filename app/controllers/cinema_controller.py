@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from models.cinema import Cinema
 from core.database import Database
@@ -175,42 +175,57 @@ class CinemaController:
                     return True
         return False 
     
+    @staticmethod
+    def _free_seat(cinema: Dict, seat_type: str, seat_number: str) -> bool:
+        """Quita el asiento de temporales y confirmados de la sala y lo devuelve a disponibles."""
+        seat_freed = False
+        # Liberar de reservas temporales
+        if 'temp_reservations' in cinema and seat_type in cinema['temp_reservations']:
+            before = len(cinema['temp_reservations'][seat_type])
+            cinema['temp_reservations'][seat_type] = [
+                r for r in cinema['temp_reservations'][seat_type]
+                if r['seat_number'] != seat_number
+            ]
+            if len(cinema['temp_reservations'][seat_type]) != before:
+                seat_freed = True
+        
+        # Liberar de reservas confirmadas
+        if 'confirmed_seats' in cinema and seat_type in cinema['confirmed_seats']:
+            before = len(cinema['confirmed_seats'][seat_type])
+            cinema['confirmed_seats'][seat_type] = [
+                s for s in cinema['confirmed_seats'][seat_type]
+                if s != seat_number
+            ]
+            if len(cinema['confirmed_seats'][seat_type]) != before:
+                seat_freed = True
+        
+        # Agregar a disponibles si se liberó
+        if seat_freed and seat_type in cinema['seats']:
+            if seat_number not in cinema['available_seats'].get(seat_type, []):
+                cinema['available_seats'].setdefault(seat_type, []).append(seat_number)
+        return seat_freed
+    
     def release_seat(self, cinema_id: int, seat_type: str, seat_number: str) -> bool:
         """Libera un asiento reservado (temporal o confirmado)."""
+        return self.release_seats_bulk([(cinema_id, seat_type, seat_number)]) == 1
+    
+    def release_seats_bulk(self, seats: List[Tuple[int, str, str]]) -> int:
+        """
+        Libera varios asientos (cinema_id, tipo, número) con una sola lectura y
+        una sola escritura de cinemas.json. Devuelve cuántos se liberaron.
+        """
         try:
             cinemas = self.db.load_data(self.cinemas_file)
-            seat_freed = False
-            
-            for i, cinema in enumerate(cinemas):
-                if cinema['cinema_id'] == cinema_id:
-                    # Liberar de reservas temporales
-                    if 'temp_reservations' in cinema and seat_type in cinema['temp_reservations']:
-                        before = len(cinema['temp_reservations'][seat_type])
-                        cinemas[i]['temp_reservations'][seat_type] = [
-                            r for r in cinema['temp_reservations'][seat_type]
-                            if r['seat_number'] != seat_number
-                        ]
-                        if len(cinemas[i]['temp_reservations'][seat_type]) != before:
-                            seat_freed = True
-                    
-                    # Liberar de reservas confirmadas
-                    if 'confirmed_seats' in cinema and seat_type in cinema['confirmed_seats']:
-                        before = len(cinema['confirmed_seats'][seat_type])
-                        cinemas[i]['confirmed_seats'][seat_type] = [
-                            s for s in cinema['confirmed_seats'][seat_type]
-                            if s != seat_number
-                        ]
-                        if len(cinemas[i]['confirmed_seats'][seat_type]) != before:
-                            seat_freed = True
-                    
-                    # Agregar a disponibles si se liberó
-                    if seat_freed and seat_type in cinema['seats']:
-                        if seat_number not in cinemas[i]['available_seats'].get(seat_type, []):
-                            cinemas[i]['available_seats'].setdefault(seat_type, []).append(seat_number)
-                            self.db.save_data(self.cinemas_file, cinemas)
-                            return True
-            
-            return seat_freed
+            by_id: Dict[int, Dict] = {}
+            for cinema in cinemas:
+                by_id.setdefault(cinema['cinema_id'], cinema)
+            freed = sum(
+                1 for cinema_id, seat_type, seat_number in seats
+                if cinema_id in by_id and self._free_seat(by_id[cinema_id], seat_type, seat_number)
+            )
+            if freed:
+                self.db.save_data(self.cinemas_file, cinemas)
+            return freed
         except Exception as e:
             print(f"Error crítico al liberar asiento: {str(e)}")
-            return False
\ No newline at end of file
+            return 0
\ No newline at end of file
@@ -1,6 +1,12 @@
+from pathlib import Path
 from typing import Dict, List, Optional
 from models.food import Food
 from core.database import Database
+from core.counter_store import CounterStore, InsufficientCount
+from core.indexes import CollectionIndexes, UniqueIndex
+from core.menu_snapshot import MenuSnapshot
+from core.search_index import fold
+from core.trigram_index import TrigramIndex
 
 class FoodController:
     """Controlador para manejar operaciones relacionadas con el menú de comida."""
@@ -8,12 +14,37 @@ class FoodController:
     def __init__(self, db: Database):
         self.db = db
         self.food_file = "food_menu.json"
+        # Índices en memoria: por ID y trigramas del producto (precalculado en disco)
+        self.indexes = CollectionIndexes(
+            db, self.food_file,
+            item_id=UniqueIndex('item_id'),
+            fuzzy=TrigramIndex('item_id', ('product',),
+                               path=Path(db.data_dir) / "indexes" / "food_menu.trigrams.json")
+        )
+        # Existencias por item_id; los ítems sin contador no llevan control de inventario
+        self.stock = CounterStore(Path(db.data_dir) / "counters" / "food_stock.json")
+        # Menú activo precalculado; se descarta al escribir el menú
+        self._menu: Optional[MenuSnapshot] = None
+    
+    def rebuild_indexes(self) -> None:
+        """Reconstruye (o restaura desde disco) los índices del menú."""
+        self.indexes.rebuild()
+    
+    def _save_food_items(self) -> bool:
+        """Guarda el menú indexado y deja los índices sincronizados."""
+        self._menu = None
+        if self.db.save_data(self.food_file, self.indexes.records):
+            self.indexes.mark_synced()
+            return True
+        self.indexes.rebuild()
+        return False
     
     def create_food_item(self, code: str, category: str, product: str, 
                         price: float, description: str, size: str = None) -> Dict:
         """Crea un nuevo ítem en el menú de comida."""
-        food_items = self.db.load_data(self.food_file)
-        item_id = self.db.get_next_id("food_menu.json", "item_id")
+        self.indexes.ensure()
+        food_items = self.indexes.records
+        item_id = self.db.get_next_id("food_menu.json", "item_id", data=food_items)
         
         new_item = Food(
             item_id=item_id,
@@ -25,63 +56,148 @@ class FoodController:
             description=description
         )
         
-        food_items.append(new_item.to_dict())
-        self.db.save_data(self.food_file, food_items)
-        return new_item.to_dict()
+        record = new_item.to_dict()
+        food_items.append(record)
+        for index in self.indexes.indexes.values():
+            index.add(record)
+        self._save_food_items()
+        return dict(record)
     
     def get_food_item_by_id(self, item_id: int) -> Optional[Dict]:
         """Obtiene un ítem de comida por su ID."""
-        food_items = self.db.load_data(self.food_file)
-        for item in food_items:
-            if item['item_id'] == item_id:
-                return item
-        return None
+        item = self.indexes['item_id'].get(item_id)
+        return dict(item) if item else None
     
     def update_food_item(self, item_id: int, **kwargs) -> Optional[Dict]:
         """Actualiza los datos de un ítem de comida."""
-        food_items = self.db.load_data(self.food_file)
-        for i, item in enumerate(food_items):
-            if item['item_id'] == item_id:
-                for key, value in kwargs.items():
-                    if key in item and key != 'item_id':
-                        food_items[i][key] = value
-                self.db.save_data(self.food_file, food_items)
-                return food_items[i]
-        return None
+        item = self.indexes['item_id'].get(item_id)
+        if item is None:
+            return None
+        for index in self.indexes.indexes.values():
+            index.discard(item)
+        for key, value in kwargs.items():
+            if key in item and key != 'item_id':
+                item[key] = value
+        for index in self.indexes.indexes.values():
+            index.add(item)
+        self._save_food_items()
+        return dict(item)
     
     def delete_food_item(self, item_id: int) -> bool:
         """Elimina un ítem de comida (cambia su estado a inactivo)."""
-        food_items = self.db.load_data(self.food_file)
-        for i, item in enumerate(food_items):
-            if item['item_id'] == item_id:
-                food_items[i]['status'] = 'inactivo'
-                self.db.save_data(self.food_file, food_items)
-                return True
-        return False
+        item = self.indexes['item_id'].get(item_id)
+        if item is None:
+            return False
+        item['status'] = 'inactivo'
+        self._save_food_items()
+        return True
+    
+    def menu_snapshot(self) -> MenuSnapshot:
+        """
+        Menú activo agrupado, ordenado y con precios formateados. Se reutiliza
+        hasta la siguiente escritura del menú o reconstrucción de los índices,
+        así que mostrarlo no lee el archivo.
+        """
+        if not self.indexes.generation:
+            self.indexes.ensure()
+        if self._menu is None or self._menu.generation != self.indexes.generation:
+            self._menu = MenuSnapshot(self.indexes.records, self.indexes.generation)
+        return self._menu
     
     def list_food_items(self, active_only: bool = True) -> List[Dict]:
-        """Lista todos los ítems de comida."""
-        food_items = self.db.load_data(self.food_file)
+        """Lista todos los ítems de comida (los activos salen del menú precalculado)."""
         if active_only:
-            return [i for i in food_items if i['status'] == 'activo']
-        return food_items
+            return [dict(i) for i in self.menu_snapshot().items]
+        self.indexes.ensure()
+        return [dict(i) for i in self.indexes.records]
+    
+    # ------------------------------------------------------------------ #
+    # Inventario
+    # ------------------------------------------------------------------ #
+    def get_stock(self, item_id: int) -> Optional[int]:
+        """Existencias disponibles de un ítem (None si no lleva control de inventario)."""
+        return self.stock.available(item_id)
     
-    def search_food_items(self, name: str = None, category: str = None) -> List[Dict]:
-        """Busca ítems de comida por nombre o categoría."""
-        food_items = self.db.load_data(self.food_file)
+    def restock(self, item_id: int, quantity: int) -> int:
+        """Suma existencias a un ítem (activa su control de inventario) y devuelve el total."""
+        if quantity <= 0:
+            raise ValueError("La cantidad a reponer debe ser mayor que cero")
+        if self.get_food_item_by_id(item_id) is None:
+            raise ValueError(f"Ítem no encontrado: {item_id}")
+        return self.stock.add(item_id, quantity)
+    
+    def set_low_stock_threshold(self, item_id: int, threshold: int) -> None:
+        """Umbral de existencias bajo el cual el ítem aparece en low_stock_items."""
+        self.stock.set_threshold(item_id, threshold)
+    
+    def inventory(self) -> List[Dict]:
+        """Ítems activos con sus existencias ('stock', None sin control) y umbral ('threshold')."""
+        return [
+            {**item, 'stock': self.stock.available(item['item_id']),
+             'threshold': self.stock.threshold(item['item_id'])}
+            for item in self.list_food_items()
+        ]
+    
+    def low_stock_items(self) -> List[Dict]:
+        """Ítems activos con existencias en su umbral o por debajo (con 'stock')."""
+        by_id = self.indexes['item_id']
+        items = []
+        for key, available in self.stock.low().items():
+            item = by_id.get(int(key))
+            if item is not None and item['status'] == 'activo':
+                items.append({**item, 'stock': available})
+        return sorted(items, key=lambda i: i['stock'])
+    
+    def reserve_stock(self, food_items: List[Dict]) -> int:
+        """
+        Aparta las existencias de una selección [{'item': ítem, 'quantity': n}]
+        (todo o nada) y devuelve el token para commit_stock/release_stock.
+        Lanza ValueError si algún ítem no alcanza.
+        """
+        amounts: Dict[int, int] = {}
+        for entry in food_items:
+            item_id = entry['item']['item_id']
+            amounts[item_id] = amounts.get(item_id, 0) + entry['quantity']
+        try:
+            return self.stock.reserve(amounts)
+        except InsufficientCount as e:
+            item = self.indexes['item_id'].get(int(e.key))
+            name = item['product'] if item else e.key
+            raise ValueError(f"Sin existencias suficientes de {name} (disponibles: {e.available})")
+    
+    def commit_stock(self, token: int) -> bool:
+        """Descuenta las existencias apartadas al confirmar la orden."""
+        return self.stock.commit(token)
+    
+    def release_stock(self, token: int) -> bool:
+        """Devuelve las existencias apartadas si la orden no se completa."""
+        return self.stock.release(token)
+    
+    def search_food_items(self, name: str = None, category: str = None,
+                          fuzzy: bool = True) -> List[Dict]:
+        """
+        Busca ítems de comida por nombre o categoría (sin distinguir tildes).
+        Primero los que contienen `name`; con `fuzzy` siguen las coincidencias
+        aproximadas por trigramas, de la más a la menos parecida.
+        """
+        self.indexes.ensure()
+        food_items = self.indexes.records
+        if name:
+            needle = fold(name).strip()
+            food_items = [i for i in food_items if needle in fold(i['product'])]
+            if fuzzy:
+                found = {i['item_id'] for i in food_items}
+                food_items += [
+                    i for i, _ in self.indexes['fuzzy'].search(name)
+                    if i['item_id'] not in found
+                ]
         results = []
         
         for item in food_items:
             if item['status'] != 'activo':
                 continue
-                
-            match = True
-            if name and name.lower() not in item['product'].lower():
-                match = False
-            if category and category.lower() != item['category'].lower():
-                match = False
-            
-            if match:
-                results.append(item)
+            if category and fold(category) != fold(item['category']):
+                continue
+            results.append(dict(item))
         
-        return results
\ No newline at end of file
+        return results
@@ -1,14 +1,54 @@
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Optional
 from models.movie import Movie
 from core.database import Database
+from controllers.showtime_controller import ShowtimeController
+from core.indexes import CollectionIndexes, UniqueIndex
+from core.search_index import fold
+from core.text_index import InvertedIndex
+from core.trigram_index import TrigramIndex
+
+# Campos de la búsqueda de texto completo y su peso en la relevancia
+SEARCH_FIELDS = {
+    'title': 3.0,
+    'director': 2.0,
+    'category': 2.0,
+    'language': 1.0,
+    'synopsis': 1.0
+}
+# Campos de la búsqueda aproximada (tolerante a errores de escritura)
+FUZZY_FIELDS = ('title', 'director')
 
 class MovieController:
     """Controlador para manejar operaciones relacionadas con películas."""
     
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, showtime_controller: Optional[ShowtimeController] = None):
         self.db = db
         self.movies_file = "movies.json"
+        # Las funciones de cada fecha salen del calendario de showtimes.json
+        self.showtime_controller = showtime_controller or ShowtimeController(db)
+        # Índices en memoria: por ID, texto completo y trigramas (este último
+        # precalculado en data/indexes para no reconstruirlo al iniciar)
+        self.indexes = CollectionIndexes(
+            db, self.movies_file,
+            movie_id=UniqueIndex('movie_id'),
+            text=InvertedIndex('movie_id', SEARCH_FIELDS),
+            fuzzy=TrigramIndex('movie_id', FUZZY_FIELDS,
+                               path=Path(db.data_dir) / "indexes" / "movies.trigrams.json")
+        )
+    
+    def rebuild_indexes(self) -> None:
+        """Reconstruye los índices de películas en bloque (se invoca al iniciar)."""
+        self.indexes.rebuild()
+    
+    def _save_movies(self) -> bool:
+        """Guarda las películas indexadas y deja los índices sincronizados."""
+        if self.db.save_data(self.movies_file, self.indexes.records):
+            self.indexes.mark_synced()
+            return True
+        self.indexes.rebuild()
+        return False
     
     def create_movie(self, title: str, release_year: int, director: str, 
                     category: str, synopsis: str, duration: int, 
@@ -16,8 +56,9 @@ class MovieController:
                     room_type: str, showtimes: List[Dict], hall: str, 
                     ticket_price: float, available_seats: Dict) -> Dict:
         """Crea una nueva película."""
-        movies = self.db.load_data(self.movies_file)
-        movie_id = self.db.get_next_id("movies.json", "movie_id")
+        self.indexes.ensure()
+        movies = self.indexes.records
+        movie_id = self.db.get_next_id("movies.json", "movie_id", data=movies)
         
         new_movie = Movie(
             movie_id=movie_id,
@@ -37,51 +78,78 @@ class MovieController:
             available_seats=available_seats
         )
         
-        movies.append(new_movie.to_dict())
-        self.db.save_data(self.movies_file, movies)
-        return new_movie.to_dict()
+        record = new_movie.to_dict()
+        movies.append(record)
+        for index in self.indexes.indexes.values():
+            index.add(record)
+        self._save_movies()
+        return dict(record)
     
     def get_movie_by_id(self, movie_id: int) -> Optional[Dict]:
         """Obtiene una película por su ID."""
-        movies = self.db.load_data(self.movies_file)
-        for movie in movies:
-            if movie['movie_id'] == movie_id:
-                return movie
-        return None
+        movie = self.indexes['movie_id'].get(movie_id)
+        return dict(movie) if movie else None
     
     def update_movie(self, movie_id: int, **kwargs) -> Optional[Dict]:
         """Actualiza los datos de una película."""
-        movies = self.db.load_data(self.movies_file)
-        for i, movie in enumerate(movies):
-            if movie['movie_id'] == movie_id:
-                for key, value in kwargs.items():
-                    if key in movie and key != 'movie_id':
-                        movies[i][key] = value
-                self.db.save_data(self.movies_file, movies)
-                return movies[i]
-        return None
+        movie = self.indexes['movie_id'].get(movie_id)
+        if movie is None:
+            return None
+        for index in self.indexes.indexes.values():
+            index.discard(movie)
+        for key, value in kwargs.items():
+            if key in movie and key != 'movie_id':
+                movie[key] = value
+        for index in self.indexes.indexes.values():
+            index.add(movie)
+        self._save_movies()
+        return dict(movie)
     
     def delete_movie(self, movie_id: int) -> bool:
         """Elimina una película (cambia su estado a inactivo)."""
-        movies = self.db.load_data(self.movies_file)
-        for i, movie in enumerate(movies):
-            if movie['movie_id'] == movie_id:
-                movies[i]['status'] = 'inactivo'
-                self.db.save_data(self.movies_file, movies)
-                return True
-        return False
+        movie = self.indexes['movie_id'].get(movie_id)
+        if movie is None:
+            return False
+        movie['status'] = 'inactivo'
+        self._save_movies()
+        return True
     
-    def list_movies(self, active_only: bool = True) -> List[Dict]:
-        """Lista todas las películas."""
-        movies = self.db.load_data(self.movies_file)
+    def list_movies(self, active_only: bool = True, include_archived: bool = False) -> List[Dict]:
+        """Lista todas las películas (con include_archived, también las archivadas)."""
+        movies = self.db.load_range(self.movies_file, include_archive=include_archived)
         if active_only:
             return [m for m in movies if m['status'] == 'activo']
         return movies
     
     def search_movies(self, title: str = None, category: str = None, 
-                        date: datetime = None, available: bool = True) -> List[Dict]:
-        """Busca películas por diferentes criterios."""
-        movies = self.db.load_data(self.movies_file)
+                        date: datetime = None, available: bool = True,
+                        text: str = None, fuzzy: bool = True) -> List[Dict]:
+        """
+        Busca películas por diferentes criterios. `text` busca en título,
+        director, sinopsis, categoría e idioma; `title` solo en el título. Ambos
+        ignoran mayúsculas y tildes y devuelven los resultados por relevancia;
+        con `fuzzy` se agregan al final las coincidencias aproximadas por
+        trigramas ("Avnegers" -> "Avengers"). `date` usa el calendario de
+        funciones de showtimes.json.
+        """
+        if date:
+            on_date = self.showtime_controller.calendar.movies_on(date)
+        if text or title:
+            query, fields = (text, None) if text else (title, ('title',))
+            movies = [m for m, _ in self.indexes['text'].search(query, fields)]
+            if fuzzy:
+                found = {m['movie_id'] for m in movies}
+                movies += [
+                    m for m, _ in self.indexes['fuzzy'].search(query, fields)
+                    if m['movie_id'] not in found
+                ]
+        elif date:
+            by_id = self.indexes['movie_id']
+            movies = [by_id.get(movie_id) for movie_id in sorted(on_date)]
+            movies = [m for m in movies if m is not None]
+        else:
+            self.indexes.ensure()
+            movies = self.indexes.records
         results = []
         
         for movie in movies:
@@ -89,23 +157,16 @@ class MovieController:
                 continue
                 
             match = True
-            if title and title.lower() not in movie['title'].lower():
+            if category and fold(category) != fold(movie['category']):
                 match = False
-            if category and category.lower() != movie['category'].lower():
+            if date and movie['movie_id'] not in on_date:
                 match = False
-            if date:
-                has_showtime = any(
-                    datetime.strptime(st['date'], "%Y-%m-%d").date() == date.date()
-                    for st in movie['showtimes']
-                )
-                if not has_showtime:
-                    match = False
             if available:
                 total_seats = sum(movie['available_seats'].values())
                 if total_seats <= 0:
                     match = False
             
             if match:
-                results.append(movie)
+                results.append(dict(movie))
         
-        return results
\ No newline at end of file
+        return results
@@ -0,0 +1,197 @@
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from models.order import Order
+from core.database import Database
+from controllers.payment_controller import PaymentController
+from controllers.ticket_controller import TicketController
+from services.discount_service import DiscountService
+
+class OrderController:
+    """
+    Controlador de órdenes: una compra (entradas + comida + pagos) en un solo registro.
+
+    La orden se guarda con un único append en orders.json (particionado por
+    mes de compra). Los tickets y pagos que leen los reportes, la ocupación
+    y las cancelaciones se derivan de sus líneas y se agregan en bloque
+    (un append por archivo, no uno por asiento), con ``order_id`` como
+    clave de unión. Los pagos se registran con ``PaymentController.create_payments_bulk``
+    y los tickets con ``TicketController.create_tickets_bulk``.
+    """
+
+    def __init__(self, db: Database, payment_controller: Optional[PaymentController] = None,
+                 ticket_controller: Optional[TicketController] = None):
+        self.db = db
+        self.payment_controller = payment_controller or PaymentController(db)
+        self.ticket_controller = ticket_controller or TicketController(db)
+        self.orders_file = "orders.json"
+        self.tickets_file = "tickets.json"
+        self.payments_file = "payments.json"
+
+    def _next_id(self, filename: str, id_field: str) -> int:
+        """
+        Próximo ID de `filename` sin reutilizar los que ya figuran en pagos:
+        los pagos se escriben primero, así que un cobro anulado antes de
+        guardar su orden o sus tickets conserva sus IDs.
+        """
+        return max(self.db.get_next_id(filename, id_field),
+                   self.db.get_next_id(self.payments_file, id_field))
+
+    @staticmethod
+    def _food_lines(food_items: List[Dict]) -> List[Dict]:
+        """Líneas de comida a partir de la selección [{'item': ítem, 'quantity': n}]."""
+        return [
+            {
+                'type': 'food',
+                'item_id': entry['item']['item_id'],
+                'code': entry['item']['code'],
+                'product': entry['item']['product'],
+                'category': entry['item']['category'],
+                'quantity': entry['quantity'],
+                'unit_price': entry['item']['price'],
+                'subtotal': entry['item']['price'] * entry['quantity']
+            }
+            for entry in food_items if entry['quantity'] > 0
+        ]
+
+    def quote(self, tickets: List[Dict], food_items: Optional[List[Dict]] = None) -> Dict:
+        """
+        Calcula las líneas y totales de una compra sin guardarla.
+        `tickets`: [{'movie_id', 'showtime' (datetime), 'seat_number', 'ticket_type',
+        'base_price', 'price'}]; `food_items`: selección de FoodView.select_food_items.
+        """
+        ticket_lines = [{'type': 'ticket', **ticket} for ticket in tickets]
+        food_lines = self._food_lines(food_items or [])
+        ticket_base = sum(line['base_price'] for line in ticket_lines)
+        ticket_total = sum(line['price'] for line in ticket_lines)
+        food_base = sum(line['subtotal'] for line in food_lines)
+        # Descuento de combos: un combo por entrada da 10% sobre la comida
+        expanded = [
+            {'category': line['category'], 'price': line['unit_price']}
+            for line in food_lines for _ in range(line['quantity'])
+        ]
+        food_total = DiscountService.apply_food_combo_discount(len(ticket_lines), expanded) if expanded else 0
+        subtotal = ticket_base + food_base
+        total = ticket_total + food_total
+        return {
+            'items': ticket_lines + food_lines,
+            'ticket_total': ticket_total,
+            'food_total': food_total,
+            'subtotal': subtotal,
+            'discount': subtotal - total,
+            'total': total
+        }
+
+    def create_order(self, user_id: int, tickets: List[Dict], payment_method: str,
+                     food_items: Optional[List[Dict]] = None,
+                     idempotency_key: Optional[str] = None,
+                     cash_received: Optional[float] = None,
+                     operator_id: Optional[int] = None) -> Dict:
+        """
+        Registra una compra completa y devuelve la orden con sus líneas y pagos.
+        Cada entrada genera su ticket y su pago (como antes, para los reportes por
+        película); la comida se paga con un pago adicional sin ticket.
+
+        Se guardan en orden pagos, tickets y orden; la orden se escribe al final
+        y marca la compra como completa, y cualquier fallo de escritura lanza
+        IOError. Si ya se cobró con `idempotency_key` (un reintento) no se
+        cobra de nuevo: se devuelve la orden existente o, si no alcanzó a
+        guardarse, se completa con los IDs de ese cobro, escribiendo solo los
+        tickets que falten.
+        `cash_received` y `operator_id` se registran en los pagos para el
+        cierre de caja.
+        """
+        charged = (self.payment_controller.get_payments_by_idempotency_key(idempotency_key)
+                   if idempotency_key else [])
+        if charged:
+            order = self.get_order_by_id(charged[0]['order_id'])
+            if order is not None:
+                ticket_ids = {p['ticket_id'] for p in charged if p['ticket_id'] is not None}
+                tickets_saved = [t for t in self.db.load_data(self.tickets_file)
+                                 if t['ticket_id'] in ticket_ids]
+                return {**order, 'tickets': tickets_saved, 'payment_records': charged}
+            order_id = charged[0]['order_id']
+            ticket_ids = [p['ticket_id'] for p in charged if p['ticket_id'] is not None]
+        else:
+            order_id = self._next_id(self.orders_file, "order_id")
+            first_ticket_id = self._next_id(self.tickets_file, "ticket_id")
+            ticket_ids = [first_ticket_id + offset for offset in range(len(tickets))]
+        quote = self.quote(tickets, food_items)
+        created_at = datetime.now().isoformat()
+
+        ticket_data, payment_lines = [], []
+        ticket_lines = (line for line in quote['items'] if line['type'] == 'ticket')
+        for line, ticket_id in zip(ticket_lines, ticket_ids):
+            line['ticket_id'] = ticket_id
+            ticket_data.append({
+                'ticket_id': ticket_id,
+                'user_id': user_id,
+                'movie_id': line['movie_id'],
+                'showtime': line['showtime'],
+                'seat_number': line['seat_number'],
+                'ticket_type': line['ticket_type'],
+                'price': line['price'],
+                'order_id': order_id
+            })
+            line['showtime'] = line['showtime'].strftime("%Y-%m-%d %H:%M")
+            payment_lines.append({'amount': line['price'], 'ticket_id': line['ticket_id']})
+        if quote['food_total']:
+            payment_lines.append({'amount': quote['food_total'], 'ticket_id': None})
+
+        payments = self.payment_controller.create_payments_bulk(
+            user_id, payment_method, payment_lines, order_id=order_id,
+            idempotency_key=idempotency_key, payment_date=created_at,
+            operator_id=operator_id, cash_received=cash_received
+        )
+        order = Order(
+            order_id=order_id,
+            user_id=user_id,
+            items=quote['items'],
+            subtotal=quote['subtotal'],
+            discount=quote['discount'],
+            total=quote['total'],
+            payments=[
+                {k: p[k] for k in ('payment_id', 'ticket_id', 'amount', 'payment_method')}
+                for p in payments
+            ],
+            created_at=created_at
+        ).to_dict()
+
+        saved = {}
+        if charged:
+            wanted = set(ticket_ids)
+            saved = {t['ticket_id']: t for t in self.db.load_data(self.tickets_file)
+                     if t['ticket_id'] in wanted}
+        created = self.ticket_controller.create_tickets_bulk(
+            [data for data in ticket_data if data['ticket_id'] not in saved])
+        saved.update((t['ticket_id'], t) for t in created)
+        if not self.db.append_data(self.orders_file, [order]):
+            raise IOError("No se pudo guardar la orden")
+        return {**order, 'tickets': [saved[data['ticket_id']] for data in ticket_data],
+                'payment_records': payments}
+
+    def cancel_checkout(self, idempotency_key: str) -> bool:
+        """
+        Anula un cobro que no llegó a tener orden (todos los reintentos de
+        ``create_order`` fallaron): anula sus pagos y cancela los tickets ya escritos.
+        Devuelve False si no hay nada que anular o si la orden sí se guardó.
+        """
+        charged = self.payment_controller.get_payments_by_idempotency_key(idempotency_key)
+        if not charged or self.get_order_by_id(charged[0]['order_id']) is not None:
+            return False
+        ticket_ids = [p['ticket_id'] for p in charged if p['ticket_id'] is not None]
+        if ticket_ids:
+            self.ticket_controller.cancel_tickets(ticket_ids)
+        self.payment_controller.cancel_payments([p['payment_id'] for p in charged], void=True)
+        return True
+    
+    def get_order_by_id(self, order_id: int) -> Optional[Dict]:
+        """Obtiene una orden por su ID."""
+        for order in self.db.load_data(self.orders_file):
+            if order['order_id'] == order_id:
+                return order
+        return None
+
+    def get_orders_by_user(self, user_id: int, since: Optional[date] = None) -> List[Dict]:
+        """Órdenes activas de un usuario (solo las particiones desde `since`, si se indica)."""
+        orders = self.db.load_range(self.orders_file, start=since)
+        return [o for o in orders if o['user_id'] == user_id and o['status'] == 'activo']
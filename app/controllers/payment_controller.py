@@ -1,44 +1,153 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from models.payment import Payment
+from models.refund import Refund
 from core.database import Database
 
+# Códigos del menú de pago -> nombre guardado en el pago
+PAYMENT_METHODS = {
+    '1': 'Efectivo',
+    '2': 'Tarjeta',
+    '3': 'Transferencia'
+}
+
 class PaymentController:
-    """Controlador para manejar operaciones relacionadas con pagos."""
+    """
+    Controlador para manejar operaciones relacionadas con pagos.
+
+    Lleva en memoria el índice de claves de idempotencia: los pagos (día e
+    ID) creados con cada clave. Se arma con una lectura de payments.json y
+    luego se actualiza con cada cobro hecho aquí; si el archivo cambia por
+    otra vía (``Database.data_version``), se vuelve a armar en el siguiente
+    acceso. Las devoluciones se registran en refunds.json, particionado por
+    el día de la devolución, para el cierre de caja.
+    """
     
     def __init__(self, db: Database):
         self.db = db
         self.payments_file = "payments.json"
+        self.refunds_file = "refunds.json"
+        # Clave de idempotencia -> (día, payment_id) de los pagos creados con ella
+        self._by_key: Dict[str, List[Tuple[str, int]]] = {}
+        self._ledger_version = None
+    
+    # ------------------------------------------------------------------ #
+    # Índice de cobros
+    # ------------------------------------------------------------------ #
+    def _rebuild_ledger(self) -> None:
+        self._by_key.clear()
+        for payment in self.db.load_data(self.payments_file):
+            self._account(payment)
+        self._ledger_version = self.db.data_version(self.payments_file)
+    
+    def _ensure_ledger(self) -> None:
+        if self._ledger_version != self.db.data_version(self.payments_file):
+            self._rebuild_ledger()
+    
+    def _account(self, payment: Dict) -> None:
+        """Agrega un pago al índice de su clave de idempotencia."""
+        if payment.get('idempotency_key'):
+            day = str(payment.get('payment_date', ''))[:10]
+            self._by_key.setdefault(payment['idempotency_key'], []).append((day, payment['payment_id']))
+    
+    def get_payments_by_idempotency_key(self, idempotency_key: str) -> List[Dict]:
+        """
+        Pagos ya registrados con esa clave (vacío si el cobro no se hizo). El
+        índice solo guarda día e ID: se leen las particiones de esos días.
+        """
+        self._ensure_ledger()
+        entries = self._by_key.get(idempotency_key)
+        if not entries:
+            return []
+        days = [day for day, _ in entries]
+        ids = {payment_id for _, payment_id in entries}
+        payments = self.db.load_range(self.payments_file, min(days) or None, max(days) or None,
+                                      include_archive=True)
+        found = {p['payment_id']: p for p in payments if p['payment_id'] in ids}
+        return [found[payment_id] for _, payment_id in entries if payment_id in found]
+    
+    # ------------------------------------------------------------------ #
+    # Creación
+    # ------------------------------------------------------------------ #
+    def create_payments_bulk(self, user_id: int, payment_method: str, lines: List[Dict],
+                             order_id: Optional[int] = None,
+                             idempotency_key: Optional[str] = None,
+                             payment_date: Optional[str] = None,
+                             operator_id: Optional[int] = None,
+                             cash_received: Optional[float] = None) -> List[Dict]:
+        """
+        Registra varios pagos de un mismo cobro con una sola escritura.
+        `lines`: [{'amount': monto, 'ticket_id': ID o None}]. Los IDs se toman
+        en bloque y todos los pagos comparten `order_id` e `idempotency_key`:
+        si ya hay pagos con esa clave se devuelven sin cobrar de nuevo.
+        `operator_id` (por defecto el usuario) es la caja que cobra y
+        `cash_received` el efectivo entregado, que se reparte en los pagos
+        (ver ``_split_tender``) para cuadrar la caja al cierre.
+        """
+        self._ensure_ledger()
+        if idempotency_key and idempotency_key in self._by_key:
+            return self.get_payments_by_idempotency_key(idempotency_key)
+        first_id = self.db.get_next_id(self.payments_file, "payment_id")
+        method_name = self._get_payment_method_name(payment_method)
+        payment_date = payment_date or datetime.now().isoformat()
+        payments = [
+            Payment(
+                payment_id=first_id + offset,
+                user_id=user_id,
+                amount=line['amount'],
+                payment_method=method_name,
+                ticket_id=line.get('ticket_id'),
+                payment_date=payment_date,
+                order_id=order_id,
+                idempotency_key=idempotency_key,
+                operator_id=operator_id if operator_id is not None else user_id
+            ).to_dict()
+            for offset, line in enumerate(lines)
+        ]
+        if not payments:
+            return []
+        if cash_received is not None and method_name == PAYMENT_METHODS['1']:
+            self._split_tender(payments, cash_received)
+        synced = self._ledger_version == self.db.data_version(self.payments_file)
+        if not self.db.append_data(self.payments_file, payments):
+            raise IOError("No se pudieron registrar los pagos")
+        if synced:
+            for payment in payments:
+                self._account(payment)
+            self._ledger_version = self.db.data_version(self.payments_file)
+        return payments
+    
+    @staticmethod
+    def _split_tender(payments: List[Dict], cash_received: float) -> None:
+        """
+        Reparte el efectivo recibido entre los pagos del cobro: cada uno
+        recibe su monto, el primero además el cambio que se devolvió y, si
+        faltó dinero, el faltante se descuenta de los primeros pagos.
+        """
+        surplus = cash_received - sum(p['amount'] for p in payments)
+        for payment in payments:
+            payment['cash_received'] = payment['amount']
+            payment['change_given'] = 0
+        if surplus >= 0:
+            payments[0]['cash_received'] += surplus
+            payments[0]['change_given'] = surplus
+            return
+        shortfall = -surplus
+        for payment in payments:
+            taken = min(shortfall, payment['amount'])
+            payment['cash_received'] -= taken
+            shortfall -= taken
     
     def create_payment(self, user_id: int, amount: float, 
                         payment_method: str, ticket_id: Optional[int] = None) -> Dict:
         """Crea un nuevo registro de pago."""
-        payments = self.db.load_data(self.payments_file)
-        payment_id = self.db.get_next_id("payments.json", "payment_id")
-        
-        # Crear objeto Payment
-        new_payment = Payment(
-            payment_id=payment_id,
-            user_id=user_id,
-            amount=amount,
-            payment_method=self._get_payment_method_name(payment_method),
-            ticket_id=ticket_id
-        )
-        
-        # Guardar el pago
-        payments.append(new_payment.to_dict())
-        self.db.save_data(self.payments_file, payments)
-        
-        return new_payment.to_dict()
+        return self.create_payments_bulk(
+            user_id, payment_method, [{'amount': amount, 'ticket_id': ticket_id}]
+        )[0]
     
     def _get_payment_method_name(self, method_code: str) -> str:
         """Convierte código de método de pago a nombre descriptivo."""
-        methods = {
-            '1': 'Efectivo',
-            '2': 'Tarjeta',
-            '3': 'Transferencia'
-        }
-        return methods.get(method_code, 'Desconocido')
+        return PAYMENT_METHODS.get(method_code, 'Desconocido')
     
     def get_payment_by_id(self, payment_id: int) -> Optional[Dict]:
         """Obtiene un pago por su ID."""
@@ -55,13 +164,63 @@ class PaymentController:
     
     def cancel_payment(self, payment_id: int) -> bool:
         """Cancela un pago (cambia su estado a inactivo)."""
+        return self.cancel_payments([payment_id]) == 1
+    
+    def cancel_payments(self, payment_ids: List[int], void: bool = False) -> int:
+        """
+        Cancela varios pagos con una sola escritura; devuelve cuántos encontró.
+        Cada pago activo guarda ``cancelled_at`` y su devolución se registra en
+        refunds.json con esa fecha (ver ``_record_refunds``). Con `void`
+        (compensación de una operación que no llegó a completarse) guarda
+        ``voided_at`` en su lugar, sin devolución: el pago no cuenta ni como
+        venta ni como devolución.
+        """
+        wanted = set(payment_ids)
+        stamp_field = 'voided_at' if void else 'cancelled_at'
+        stamp = datetime.now().isoformat()
+        synced = self._ledger_version == self.db.data_version(self.payments_file)
         payments = self.db.load_data(self.payments_file)
-        for i, payment in enumerate(payments):
-            if payment['payment_id'] == payment_id:
-                payments[i]['status'] = 'inactivo'
-                self.db.save_data(self.payments_file, payments)
-                return True
-        return False
+        cancelled = []
+        for payment in payments:
+            if payment['payment_id'] in wanted:
+                if payment['status'] == 'activo':
+                    payment[stamp_field] = stamp
+                    cancelled.append(payment)
+                payment['status'] = 'inactivo'
+                wanted.discard(payment['payment_id'])
+        found = len(set(payment_ids)) - len(wanted)
+        if not found:
+            return 0
+        if not self.db.save_data(self.payments_file, payments):
+            return found
+        if synced:
+            # Cancelar no cambia las claves de idempotencia de los pagos
+            self._ledger_version = self.db.data_version(self.payments_file)
+        if cancelled and not void:
+            self._record_refunds(cancelled, stamp)
+        return found
+
+    def _record_refunds(self, payments: List[Dict], refunded_at: str) -> None:
+        """
+        Registra con una sola escritura la devolución de pagos recién
+        cancelados; lanza IOError si no se pudo guardar.
+        """
+        first_id = self.db.get_next_id(self.refunds_file, "refund_id")
+        refunds = [
+            Refund(
+                refund_id=first_id + offset,
+                payment_id=payment['payment_id'],
+                user_id=payment['user_id'],
+                operator_id=payment.get('operator_id'),
+                amount=payment['amount'],
+                payment_method=payment['payment_method'],
+                payment_date=payment['payment_date'],
+                refunded_at=refunded_at
+            ).to_dict()
+            for offset, payment in enumerate(payments)
+        ]
+        if not self.db.append_data(self.refunds_file, refunds):
+            raise IOError("No se pudieron registrar las devoluciones")
     
     def list_payments(self, active_only: bool = True) -> List[Dict]:
         """Lista todos los pagos."""
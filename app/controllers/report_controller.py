@@ -1,16 +1,33 @@
-from datetime import datetime
-from typing import List, Dict, Optional
+from datetime import datetime, timedelta
+from typing import Any, List, Dict, Optional, Tuple
 from core.database import Database
+from core.partitioned_store import as_day
 from controllers.movie_controller import MovieController
 from controllers.user_controller import UserController
+from services.report_aggregation import (
+    PartitionAggregator, food_sales_partial, grouped_sum_partial, map_partial, merge_maps,
+    merge_nested, merge_sums, merge_totals, range_tasks, select_top, sum_partial
+)
+from services.report_cache import ReportCache
+from services.cash_close_service import CashCloseService
+from services.occupancy_series import build_occupancy_series, showtime_key
 
 class ReportController:
     """Genera datos para los distintos reportes."""
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, aggregator: Optional[PartitionAggregator] = None,
+                 cache: Optional[ReportCache] = None,
+                 movie_controller: Optional[MovieController] = None,
+                 user_controller: Optional[UserController] = None):
         self.db = db
-        self.movie_ctrl = MovieController(db)
-        self.user_ctrl = UserController(db)
+        self.movie_ctrl = movie_controller or MovieController(db)
+        self.user_ctrl = user_controller or UserController(db)
+        # Agregación por partición en paralelo (con respaldo en serie)
+        self.aggregator = aggregator or PartitionAggregator()
+        # Resultados reutilizables mientras no cambien los archivos consultados
+        self.cache = cache or ReportCache(db)
+        # Cierres de caja diarios: los días cerrados no se vuelven a leer
+        self.closes = CashCloseService(db, self.aggregator)
 
     def total_sales(
         self,
@@ -18,14 +35,65 @@ class ReportController:
         end:   Optional[datetime.date] = None
     ) -> float:
         """Suma todos los pagos entre start y end (inclusive)."""
-        payments = self.db.load_data("payments.json")
-        total = 0.0
-        for p in payments:
-            # suponemos p['date'] es algo como "2025-04-23T20:15:00"
-            dt = datetime.fromisoformat(p["date"]).date()
-            if (not start or dt >= start) and (not end or dt <= end):
-                total += p.get("amount", 0)
-        return total
+        return self.cache.get_or_compute(
+            "total_sales", (as_day(start), as_day(end)), ("payments.json", "cash_closes.json"),
+            lambda: self._total_sales(start, end)
+        )
+
+    def _total_sales(self, start: Optional[datetime.date],
+                     end: Optional[datetime.date]) -> float:
+        # Los días cerrados salen de su registro de cierre; del resto solo se leen
+        # las particiones y segmentos archivados que cubren los días abiertos
+        closes = self.closes.closes_between(start, end)
+        closed_total = sum(c['gross'] for c in closes.values())
+        date_field = self.db.date_field("payments.json")
+        paths: Dict[str, None] = {}
+        for gap_start, gap_end in self._open_ranges(start, end, closes):
+            paths.update(dict.fromkeys(
+                self.db.source_paths("payments.json", gap_start, gap_end, include_archive=True)))
+        tasks = [
+            (path, date_field, as_day(start), as_day(end), "amount", None, frozenset(closes))
+            for path in paths
+        ]
+        return closed_total + merge_totals(self.aggregator.map(sum_partial, tasks))["total"]
+
+    @staticmethod
+    def _open_ranges(start: Optional[datetime.date], end: Optional[datetime.date],
+                     closed_days: Dict[str, Any]) -> List[Tuple]:
+        """Tramos (inicio, fin) del rango sin cierre de caja (None = sin límite)."""
+        ranges, cursor = [], start
+        for day in sorted(datetime.strptime(d, "%Y-%m-%d").date() for d in closed_days):
+            if cursor is None or cursor < day:
+                ranges.append((cursor, day - timedelta(days=1)))
+            cursor = day + timedelta(days=1)
+        if end is None or cursor is None or cursor <= end:
+            ranges.append((cursor, end))
+        return ranges
+
+    def close_day(self, day: datetime.date, counted_cash: Optional[float] = None,
+                  force: bool = False) -> Dict:
+        """Cierra la caja del día (ver ``CashCloseService.close_day``)."""
+        return self.closes.close_day(day, counted_cash, force)
+
+    def _ticket_map(self, fields: Tuple[str, ...], start: Optional[datetime.date],
+                    end: Optional[datetime.date] = None) -> Dict[int, Any]:
+        """
+        Mapa ticket_id -> campo(s) del ticket. Un ticket se paga antes de su
+        función, así que basta con las particiones de tickets desde la fecha
+        inicial del reporte (o solo las del rango de funciones si se indica end).
+        """
+        tasks = [
+            (path, "ticket_id", *fields)
+            for path in self.db.source_paths("tickets.json", start, end, include_archive=True)
+        ]
+        return merge_maps(self.aggregator.map(map_partial, tasks))
+
+    def _sales_by_ticket_field(self, field: str, start: Optional[datetime.date],
+                               end: Optional[datetime.date]) -> Dict[int, float]:
+        """Suma los pagos del rango agrupados por un campo del ticket pagado."""
+        join = self._ticket_map((field,), start)
+        tasks = range_tasks(self.db, "payments.json", start, end, ("ticket_id", "amount"))
+        return merge_sums(self.aggregator.map(grouped_sum_partial, tasks, join=join))
 
     def sales_by_movie(
         self,
@@ -37,26 +105,20 @@ class ReportController:
         [{'movie_id': X, 'title': '...', 'sales': 123.0}, ...]
         Incluye todas las películas (ventas=0 si no hay pagos).
         """
-        payments = self.db.load_data("payments.json")
-        tickets  = self.db.load_data("tickets.json")
-        # ticket_id -> movie_id
-        tid2mid = {t["ticket_id"]: t["movie_id"] for t in tickets}
+        return self.cache.get_or_compute(
+            "sales_by_movie", (as_day(start), as_day(end)),
+            ("payments.json", "tickets.json", "movies.json"),
+            lambda: self._sales_by_movie(start, end)
+        )
 
+    def _sales_by_movie(self, start: Optional[datetime.date],
+                        end: Optional[datetime.date]) -> List[Dict]:
         # Agregamos solo los que tengan pagos, pero luego
         # rellenaremos todos con zero
-        agg: Dict[int,float] = {}
-        for p in payments:
-            try:
-                dt = datetime.fromisoformat(p["date"]).date()
-            except Exception:
-                continue
-            if (not start or dt >= start) and (not end or dt <= end):
-                mid = tid2mid.get(p.get("ticket_id"))
-                if mid:
-                    agg[mid] = agg.get(mid, 0) + p.get("amount", 0)
+        agg = self._sales_by_ticket_field("movie_id", start, end)
 
         # Ahora recorremos todas las películas y asignamos 0 si no están en agg
-        all_movies = self.movie_ctrl.list_movies(active_only=False)
+        all_movies = self.movie_ctrl.list_movies(active_only=False, include_archived=True)
         result: List[Dict] = []
         for m in all_movies:
             result.append({
@@ -74,26 +136,21 @@ class ReportController:
         """
         Devuelve lista de dicts:
         [{'user_id': U, 'username':'...', 'sales':123.0}, ...]
-        Incluye todos los usuarios (ventas=0 si no hay pagos).
+        Incluye todos los usuarios (ventas=0 si no hay pagos en el rango).
         """
-        payments = self.db.load_data("payments.json")
-        tickets  = self.db.load_data("tickets.json")
-        # ticket_id -> user_id
-        tid2uid = {t["ticket_id"]: t["user_id"] for t in tickets}
-
-        agg: Dict[int,float] = {}
-        for p in payments:
-            try:
-                dt = datetime.fromisoformat(p["date"]).date()
-            except Exception:
-                continue
-            if (not start or dt >= start) and (not end or dt <= end):
-                uid = tid2uid.get(p.get("ticket_id"))
-                if uid:
-                    agg[uid] = agg.get(uid, 0) + p.get("amount", 0)
-
-        # Ahora listamos todos los usuarios y rellenamos con zero
-        all_users = self.user_ctrl.list_users(active_only=False)
+        return self.cache.get_or_compute(
+            "sales_by_user", (as_day(start), as_day(end)),
+            ("payments.json", "tickets.json", "users.json"),
+            lambda: self._sales_by_user(start, end)
+        )
+
+    def _sales_by_user(self, start: Optional[datetime.date],
+                       end: Optional[datetime.date]) -> List[Dict]:
+        # Agrega sólo los pagos en el rango
+        agg = self._sales_by_ticket_field("user_id", start, end)
+
+        # Ahora recorre **todos** los usuarios, asignando 0 si no existe
+        all_users = self.user_ctrl.list_users(active_only=False, include_archived=True)
         result: List[Dict] = []
         for u in all_users:
             result.append({
@@ -103,40 +160,151 @@ class ReportController:
             })
         return result
 
-    def sales_by_user(
+    def occupancy_by_showtime(
         self,
         start: Optional[datetime.date] = None,
         end:   Optional[datetime.date] = None
     ) -> List[Dict]:
         """
-        Devuelve lista de dicts:
-        [{'user_id': U, 'username':'...', 'sales':123.0}, ...]
-        Incluye todos los usuarios (ventas=0 si no hay pagos en el rango).
+        Devuelve, por cada función entre start y end, la serie acumulada de
+        vendidos, reservados y retenidos:
+        [{'showtime_id': S, 'showtime': '...', 'capacity': 100, 'sold': 40,
+          'points': [{'time': '...', 'sold': 1, 'reserved': 0, 'holds': 0}, ...]}, ...]
         """
-        payments = self.db.load_data("payments.json")
-        tickets  = self.db.load_data("tickets.json")
-        # Construye mapa ticket_id → user_id
-        tid2uid = {t["ticket_id"]: t["user_id"] for t in tickets}
+        return self.cache.get_or_compute(
+            "occupancy_by_showtime", (as_day(start), as_day(end)),
+            ("showtimes.json", "tickets.json", "reservations.json", "payments.json"),
+            lambda: self._occupancy_by_showtime(start, end)
+        )
 
-        # Agrega sólo los pagos en el rango
-        agg: Dict[int,float] = {}
-        for p in payments:
-            try:
-                dt = datetime.fromisoformat(p["date"]).date()
-            except Exception:
-                continue
-            if (not start or dt >= start) and (not end or dt <= end):
-                uid = tid2uid.get(p.get("ticket_id"))
-                if uid:
-                    agg[uid] = agg.get(uid, 0.0) + p.get("amount", 0.0)
+    def _occupancy_by_showtime(self, start: Optional[datetime.date],
+                               end: Optional[datetime.date]) -> List[Dict]:
+        start_day, end_day = as_day(start), as_day(end)
+        showtimes = [
+            st for st in self.db.load_data("showtimes.json")
+            if (not start_day or st["date"] >= start_day) and (not end_day or st["date"] <= end_day)
+        ]
+        # Tickets y reservas se podan por fecha de función; los pagos son
+        # anteriores a la función, así que basta con acotar el final del rango
+        tickets = self.db.load_range("tickets.json", start, end, include_archive=True)
+        reservations = self.db.load_range("reservations.json", start, end, include_archive=True)
+        payments = self.db.load_range("payments.json", None, end, include_archive=True)
+        return build_occupancy_series(showtimes, tickets, reservations, payments,
+                                      datetime.now().isoformat())
 
-        # Ahora recorre **todos** los usuarios, asignando 0 si no existe
-        all_users = self.user_ctrl.list_users(active_only=False)
-        result: List[Dict] = []
-        for u in all_users:
-            result.append({
-                "user_id":  u["user_id"],
-                "username": u.get("username", "N/D"),
-                "sales":    agg.get(u["user_id"], 0.0)
-            })
-        return result
+    def top_movies(
+        self,
+        n: int = 10,
+        start: Optional[datetime.date] = None,
+        end:   Optional[datetime.date] = None,
+        bottom: bool = False
+    ) -> List[Dict]:
+        """Las n películas con más (o menos, con bottom=True) ventas en el rango."""
+        return self.cache.get_or_compute(
+            "top_movies", (as_day(start), as_day(end), n, bottom),
+            ("payments.json", "tickets.json", "movies.json"),
+            lambda: self._top_movies(n, start, end, bottom)
+        )
+
+    def _top_movies(self, n: int, start: Optional[datetime.date],
+                    end: Optional[datetime.date], bottom: bool) -> List[Dict]:
+        agg = self._sales_by_ticket_field("movie_id", start, end)
+        movies = self.movie_ctrl.list_movies(active_only=False, include_archived=True)
+        rows = (
+            {"movie_id": m["movie_id"], "title": m.get("title", "N/D"),
+             "sales": agg.get(m["movie_id"], 0.0)}
+            for m in movies
+        )
+        return select_top(rows, n, bottom=bottom)
+
+    def top_users(
+        self,
+        n: int = 10,
+        start: Optional[datetime.date] = None,
+        end:   Optional[datetime.date] = None,
+        bottom: bool = False
+    ) -> List[Dict]:
+        """Los n usuarios con más (o menos, con bottom=True) compras en el rango."""
+        return self.cache.get_or_compute(
+            "top_users", (as_day(start), as_day(end), n, bottom),
+            ("payments.json", "tickets.json", "users.json"),
+            lambda: self._top_users(n, start, end, bottom)
+        )
+
+    def _top_users(self, n: int, start: Optional[datetime.date],
+                   end: Optional[datetime.date], bottom: bool) -> List[Dict]:
+        agg = self._sales_by_ticket_field("user_id", start, end)
+        users = self.user_ctrl.list_users(active_only=False, include_archived=True)
+        rows = (
+            {"user_id": u["user_id"], "username": u.get("username", "N/D"),
+             "sales": agg.get(u["user_id"], 0.0)}
+            for u in users
+        )
+        return select_top(rows, n, bottom=bottom)
+
+    def top_showtimes(
+        self,
+        n: int = 10,
+        start: Optional[datetime.date] = None,
+        end:   Optional[datetime.date] = None,
+        bottom: bool = False
+    ) -> List[Dict]:
+        """
+        Las n funciones (con fecha entre start y end) con más o menos ventas.
+        Se suman todos los pagos de sus tickets, sin importar cuándo se pagaron.
+        """
+        return self.cache.get_or_compute(
+            "top_showtimes", (as_day(start), as_day(end), n, bottom),
+            ("payments.json", "tickets.json", "showtimes.json", "movies.json"),
+            lambda: self._top_showtimes(n, start, end, bottom)
+        )
+
+    def _top_showtimes(self, n: int, start: Optional[datetime.date],
+                       end: Optional[datetime.date], bottom: bool) -> List[Dict]:
+        start_day, end_day = as_day(start), as_day(end)
+        tickets = self._ticket_map(("movie_id", "showtime"), start, end)
+        join = {ticket_id: showtime_key(*value) for ticket_id, value in tickets.items()}
+        tasks = range_tasks(self.db, "payments.json", None, end, ("ticket_id", "amount"))
+        agg = merge_sums(self.aggregator.map(grouped_sum_partial, tasks, join=join))
+        titles = {
+            m["movie_id"]: m.get("title", "N/D")
+            for m in self.movie_ctrl.list_movies(active_only=False, include_archived=True)
+        }
+        rows = (
+            {"showtime_id": st["showtime_id"],
+             "title": titles.get(st["movie_id"], "N/D"),
+             "showtime": f"{st['date']} {st['start_time']}",
+             "sales": agg.get(showtime_key(st["movie_id"], f"{st['date']} {st['start_time']}"), 0.0)}
+            for st in self.db.load_data("showtimes.json")
+            if (not start_day or st["date"] >= start_day) and (not end_day or st["date"] <= end_day)
+        )
+        return select_top(rows, n, bottom=bottom)
+
+    def top_food_items(
+        self,
+        n: int = 10,
+        start: Optional[datetime.date] = None,
+        end:   Optional[datetime.date] = None,
+        bottom: bool = False
+    ) -> List[Dict]:
+        """
+        Los n productos de comida con más (o menos) ventas en el rango, según
+        las líneas de comida de las órdenes (subtotal antes de descuentos).
+        """
+        return self.cache.get_or_compute(
+            "top_food_items", (as_day(start), as_day(end), n, bottom),
+            ("orders.json", "food_menu.json"),
+            lambda: self._top_food_items(n, start, end, bottom)
+        )
+
+    def _top_food_items(self, n: int, start: Optional[datetime.date],
+                        end: Optional[datetime.date], bottom: bool) -> List[Dict]:
+        tasks = range_tasks(self.db, "orders.json", start, end)
+        agg = merge_nested(self.aggregator.map(food_sales_partial, tasks))
+        rows = (
+            {"item_id": item["item_id"], "product": item.get("product", "N/D"),
+             "quantity": agg.get(item["item_id"], {}).get("quantity", 0),
+             "sales": agg.get(item["item_id"], {}).get("sales", 0.0)}
+            for item in self.db.load_data("food_menu.json")
+        )
+        return select_top(rows, n, bottom=bottom)
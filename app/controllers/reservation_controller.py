@@ -1,12 +1,118 @@
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 from models.reservation import Reservation
 from core.database import Database
+from core.expiry_queue import ExpiryQueue
+from core.indexes import UniqueIndex
+from core.reservation_codes import FeistelCodec, normalize_code
+from controllers.payment_controller import PaymentController
+from controllers.ticket_controller import TicketController
 
 class ReservationController:
-    def __init__(self, db: Database):
+    """
+    Controlador de reservas.
+
+    Mantiene en memoria, armados con una lectura y actualizados al crear,
+    cancelar, convertir o vencer reservas:
+
+    - una cola ordenada por ``expiration_date`` con las activas, de modo que
+      ``expire_due`` solo toca el archivo cuando algo venció;
+    - un índice único por ``reservation_code`` para validar códigos en O(1).
+
+    Los códigos nuevos son la permutación de Feistel del ID de la reserva
+    (``FeistelCodec``): únicos sin buscar colisiones.
+
+    ``convert_reservations`` convierte un lote de reservas en tickets (y
+    pagos) con una escritura por archivo en lugar de una por reserva.
+    """
+    
+    def __init__(self, db: Database, payment_controller: Optional[PaymentController] = None,
+                 ticket_controller: Optional[TicketController] = None):
         self.db = db
+        self.payment_controller = payment_controller or PaymentController(db)
+        self.ticket_controller = ticket_controller or TicketController(db)
         self.reservations_file = "reservations.json"
+        self.expiry = ExpiryQueue()
+        self.codes = UniqueIndex('reservation_code', normalize_code)
+        self.codec = FeistelCodec()
+        self._indexes_version = None
+    
+    # ------------------------------------------------------------------ #
+    # Índices en memoria
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _expiry_key(reservation: Dict) -> Optional[str]:
+        """Vencimiento normalizado a ISO (None si falta o no es válido)."""
+        try:
+            return datetime.fromisoformat(str(reservation['expiration_date'])).isoformat()
+        except (KeyError, ValueError):
+            return None
+    
+    def _track(self, reservation: Dict) -> None:
+        """Refleja el estado actual de la reserva en la cola y en el índice de códigos."""
+        if reservation.get('reservation_code'):
+            self.codes.add(dict(reservation))
+        due = self._expiry_key(reservation)
+        if reservation.get('status') == 'activo' and due:
+            self.expiry.push(reservation['reservation_id'], due)
+        else:
+            self.expiry.discard(reservation['reservation_id'])
+    
+    def rebuild_indexes(self) -> None:
+        """Arma la cola de vencimientos y el índice de códigos (una lectura de reservations.json)."""
+        self.expiry.clear()
+        self.codes.clear()
+        for reservation in self.db.load_data(self.reservations_file):
+            self._track(reservation)
+        self._indexes_version = self.db.data_version(self.reservations_file)
+    
+    def _ensure_indexes(self) -> None:
+        if self._indexes_version != self.db.data_version(self.reservations_file):
+            self.rebuild_indexes()
+    
+    def _indexes_synced(self) -> bool:
+        return self._indexes_version == self.db.data_version(self.reservations_file)
+    
+    def _mark_synced(self) -> None:
+        self._indexes_version = self.db.data_version(self.reservations_file)
+    
+    def next_expiration(self) -> Optional[str]:
+        """Vencimiento más próximo entre las reservas activas (ISO)."""
+        self._ensure_indexes()
+        return self.expiry.next_due()
+    
+    def expire_due(self, now: Optional[datetime] = None,
+                   limit: Optional[int] = None) -> List[Dict]:
+        """
+        Marca como 'expirado' las reservas activas vencidas (hasta `limit`) con
+        una sola escritura y las devuelve. Si nada venció no se lee el archivo.
+        Si la escritura falla, las reservas vuelven a la cola y se lanza IOError.
+        """
+        now = now or datetime.now()
+        self._ensure_indexes()
+        due_ids = set(self.expiry.pop_due(now.isoformat(), limit))
+        if not due_ids:
+            return []
+        synced = self._indexes_synced()
+        reservations = self.db.load_data(self.reservations_file)
+        expired = []
+        for reservation in reservations:
+            if reservation['reservation_id'] in due_ids and reservation['status'] == 'activo':
+                reservation['status'] = 'expirado'
+                reservation['expired_at'] = now.isoformat()
+                expired.append(reservation)
+        if not expired:
+            return []
+        if not self.db.save_data(self.reservations_file, reservations):
+            # Siguen activas en disco: se reprograman para el próximo intento
+            for reservation in expired:
+                self.expiry.push(reservation['reservation_id'], self._expiry_key(reservation))
+            raise IOError("No se pudieron vencer las reservas")
+        if synced:
+            for reservation in expired:
+                self._track(reservation)
+            self._mark_synced()
+        return expired
     
     def create_reservation(self, user_id: int, movie_id: int, 
                             showtime: str, seat_number: str, 
@@ -15,10 +121,11 @@ class ReservationController:
         """
         Crea reserva con los campos esenciales + cualquier campo adicional.
         """
-        reservations = self.db.load_data(self.reservations_file)
-        
+        self._ensure_indexes()
+        reservation_id = self.db.get_next_id("reservations.json", "reservation_id")
+        extra_fields.setdefault('reservation_code', self._new_code(reservation_id))
         new_reservation = Reservation(
-            reservation_id=self.db.get_next_id("reservations.json", "reservation_id"),
+            reservation_id=reservation_id,
             user_id=user_id,
             movie_id=movie_id,
             showtime=showtime,
@@ -28,9 +135,23 @@ class ReservationController:
             **extra_fields  # Pasa cualquier campo adicional
         )
         
-        reservations.append(new_reservation.to_dict())
-        self.db.save_data(self.reservations_file, reservations)
-        return new_reservation.to_dict()
+        record = new_reservation.to_dict()
+        synced = self._indexes_synced()
+        self.db.append_data(self.reservations_file, [record])
+        if synced:
+            self._track(record)
+            self._mark_synced()
+        return dict(record)
+    
+    def _new_code(self, reservation_id: int) -> str:
+        """
+        Código de la reserva a partir de su ID. Si choca con un código heredado
+        (aleatorio) se usa la otra mitad del dominio, que no usa ningún ID.
+        """
+        code = self.codec.encode(reservation_id)
+        if code in self.codes:
+            code = self.codec.encode(reservation_id | 1 << (self.codec.bits - 1))
+        return code
     def _parse_datetime(self, dt: Union[datetime, str]) -> str:
         """Convierte datetime a string ISO o valida formato."""
         if isinstance(dt, datetime):
@@ -64,11 +185,12 @@ class ReservationController:
     
     def cancel_reservation(self, reservation_id: int) -> bool:
         """Cancela una reservación si no ha expirado."""
+        synced = self._indexes_synced()
         reservations = self.db.load_data(self.reservations_file)
         for i, r in enumerate(reservations):
             if r['reservation_id'] == reservation_id:
-                # Verificar si ya está cancelada
-                if r['status'] == 'inactivo':
+                # Verificar si ya está cancelada o expirada
+                if r['status'] != 'activo':
                     return False
                     
                 # Verificar expiración
@@ -78,52 +200,161 @@ class ReservationController:
                 
                 reservations[i]['status'] = 'inactivo'
                 reservations[i]['cancelled_at'] = datetime.now().isoformat()
-                self.db.save_data(self.reservations_file, reservations)
+                if self.db.save_data(self.reservations_file, reservations) and synced:
+                    self._track(reservations[i])
+                    self._mark_synced()
                 return True
         return False
     
-    def convert_reservation_to_ticket(self, reservation_id: int) -> Optional[Dict]:
-        """Convierte una reserva activa y válida en ticket."""
-        from controllers.ticket_controller import TicketController  # Importación local
-        
-        reservation = self.get_reservation_by_id(reservation_id)
-        if not reservation or reservation['status'] != 'activo':
-            return None
-            
-        # Verificar que no haya expirado
-        if datetime.fromisoformat(reservation['expiration_date']) < datetime.now():
-            raise ValueError("La reserva ha expirado y no puede convertirse")
-        
+    @staticmethod
+    def _showtime(value: str) -> datetime:
+        """Horario de la reserva como datetime (ISO o 'YYYY-MM-DD HH:MM:SS')."""
         try:
-            ticket_controller = TicketController(self.db)
-            
-            # Asegurar que showtime sea un objeto datetime
-            showtime_str = reservation['showtime']
-            try:
-                showtime = datetime.fromisoformat(showtime_str)
-            except ValueError:
-                # Si el formato no es ISO, intentar otro formato común
-                showtime = datetime.strptime(showtime_str, "%Y-%m-%d %H:%M:%S")
-            
-            new_ticket = ticket_controller.create_ticket(
-                user_id=reservation['user_id'],
-                movie_id=reservation['movie_id'],
-                showtime=showtime,  # datetime object
-                seat_number=reservation['seat_number'],
-                ticket_type=reservation['ticket_type'],
-                price=reservation['price']
-            )
-            
-            if new_ticket:
-                self.cancel_reservation(reservation_id)
-                return new_ticket
-        except Exception as e:
-            raise ValueError(f"Error al convertir reserva: {str(e)}")
-        
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+    
+    def _conversion_error(self, reservation: Optional[Dict], user_id: Optional[int],
+                          now: datetime) -> Optional[Tuple[str, str]]:
+        """(código, mensaje) si la reserva no puede convertirse; None si es válida."""
+        if not reservation:
+            return 'not_found', "La reserva no existe"
+        if user_id is not None and reservation['user_id'] != user_id:
+            return 'not_owner', "La reserva pertenece a otro usuario"
+        if reservation['status'] != 'activo':
+            return 'inactive', f"La reserva no está activa ({reservation['status']})"
+        if datetime.fromisoformat(reservation['expiration_date']) < now:
+            return 'expired', "La reserva ha expirado y no puede convertirse"
+        try:
+            self._showtime(reservation['showtime'])
+        except (KeyError, TypeError, ValueError):
+            return 'invalid', "La reserva tiene un horario inválido"
         return None
     
+    def convert_reservations(self, reservation_ids: List[int],
+                             payment_method: Optional[str] = None,
+                             user_id: Optional[int] = None,
+                             cash_received: Optional[float] = None) -> List[Dict]:
+        """
+        Convierte un lote de reservas en tickets.
+
+        Valida todas las reservas con una sola lectura y escribe las válidas
+        en bloque: un append de tickets, uno de pagos (si se indica
+        `payment_method`, con código del menú de pago) y un guardado de
+        reservas. Si falla una escritura se anulan los tickets y pagos ya
+        registrados y se relanza el IOError, así que el lote se aplica
+        completo o no se aplica. Con `user_id` solo se convierten reservas
+        de ese usuario; es obligatorio con `payment_method`, porque el cobro
+        se registra a su nombre.
+
+        Devuelve un resultado por ID, en el orden recibido:
+        {'reservation_id', 'ok', 'ticket', 'payment', 'code', 'error'}, donde
+        `code` es None o uno de 'not_found', 'not_owner', 'inactive',
+        'expired', 'invalid' o 'duplicate'.
+        """
+        if payment_method and user_id is None:
+            raise ValueError("Se requiere el usuario para cobrar las reservas")
+        now = datetime.now()
+        synced = self._indexes_synced()
+        reservations = self.db.load_data(self.reservations_file)
+        by_id = {r['reservation_id']: r for r in reservations}
+
+        results, valid, seen = [], [], set()
+        for reservation_id in reservation_ids:
+            result = {'reservation_id': reservation_id, 'ok': False, 'ticket': None,
+                      'payment': None, 'code': None, 'error': None}
+            results.append(result)
+            if reservation_id in seen:
+                result['code'], result['error'] = 'duplicate', "Reserva repetida en el lote"
+                continue
+            seen.add(reservation_id)
+            reservation = by_id.get(reservation_id)
+            failure = self._conversion_error(reservation, user_id, now)
+            if failure:
+                result['code'], result['error'] = failure
+                continue
+            valid.append((result, reservation))
+        if not valid:
+            return results
+
+        tickets = self.ticket_controller.create_tickets_bulk([
+            {
+                'user_id': reservation['user_id'],
+                'movie_id': reservation['movie_id'],
+                'showtime': self._showtime(reservation['showtime']),
+                'seat_number': reservation['seat_number'],
+                'ticket_type': reservation['ticket_type'],
+                'price': reservation['price'],
+                'reservation_id': reservation['reservation_id']
+            }
+            for _, reservation in valid
+        ])
+        payments = []
+        try:
+            if payment_method:
+                payments = self.payment_controller.create_payments_bulk(
+                    user_id,
+                    payment_method,
+                    [{'amount': t['price'], 'ticket_id': t['ticket_id']} for t in tickets],
+                    cash_received=cash_received
+                )
+            for ticket, (_, reservation) in zip(tickets, valid):
+                reservation['status'] = 'inactivo'
+                reservation['converted_at'] = now.isoformat()
+                reservation['ticket_id'] = ticket['ticket_id']
+            if not self.db.save_data(self.reservations_file, reservations):
+                raise IOError("No se pudieron actualizar las reservas")
+        except IOError:
+            # Compensación: el lote no debe quedar a medias
+            self.ticket_controller.cancel_tickets([t['ticket_id'] for t in tickets])
+            if payments:
+                self.payment_controller.cancel_payments(
+                    [p['payment_id'] for p in payments], void=True)
+            raise
+
+        for index, (result, reservation) in enumerate(valid):
+            result['ok'] = True
+            result['ticket'] = tickets[index]
+            result['payment'] = payments[index] if payments else None
+            if synced:
+                self._track(reservation)
+        if synced:
+            self._mark_synced()
+        return results
+    
+    def convert_reservation_to_ticket(self, reservation_id: int) -> Optional[Dict]:
+        """Convierte una reserva activa y válida en ticket."""
+        result = self.convert_reservations([reservation_id])[0]
+        if result['code'] == 'expired':
+            raise ValueError(result['error'])
+        return result['ticket']
+    
+    def list_reservations(self, active_only: bool = True) -> List[Dict]:
+        """Lista todas las reservaciones."""
+        reservations = self.db.load_data(self.reservations_file)
+        if active_only:
+            return [r for r in reservations if r['status'] == 'activo']
+        return reservations
+    
+    def get_reservation_by_code(self, code: str) -> Optional[Dict]:
+        """Reserva con ese código (cualquier estado), sin recorrer el archivo."""
+        self._ensure_indexes()
+        reservation = self.codes.get(code)
+        return dict(reservation) if reservation else None
+    
+    def lookup_codes(self, codes: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Busca varios códigos a la vez (p. ej. la fila de la taquilla) con una
+        sola verificación del índice: código -> reserva activa o None.
+        """
+        self._ensure_indexes()
+        found = {}
+        for code in codes:
+            reservation = self.codes.get(code)
+            found[code] = (dict(reservation)
+                           if reservation and reservation['status'] == 'activo' else None)
+        return found
+    
     def validate_reservation_code(self, code: str) -> bool:
         """Valida que un código de reserva exista y esté activo."""
-        reservations = self.db.load_data(self.reservations_file)
-        return any(r['reservation_code'] == code and r['status'] == 'activo' 
-                    for r in reservations)
\ No newline at end of file
+        return self.lookup_codes([code])[code] is not None
@@ -2,6 +2,10 @@ from datetime import datetime, time
 from typing import Dict, List, Optional
 from models.showtime import Showtime
 from core.database import Database
+from core.calendar_index import ShowtimeCalendar
+from core.indexes import CollectionIndexes, UniqueIndex
+from core.interval_index import RoomIntervals
+from config import Config
 
 # importando la clase CinemaController para manejar cines
 from controllers.cinema_controller import CinemaController
@@ -9,10 +13,63 @@ from controllers.cinema_controller import CinemaController
 class ShowtimeController:
     """Controlador para manejar operaciones relacionadas con horarios."""
     
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, cinema_controller: Optional[CinemaController] = None):
         self.db = db
         self.showtimes_file = "showtimes.json"
-        self.cinema_controller = CinemaController(db)
+        self.cinema_controller = cinema_controller or CinemaController(db)
+        # Índices en memoria: por ID, calendario por fecha y ocupación por sala
+        self.indexes = CollectionIndexes(
+            db, self.showtimes_file,
+            showtime_id=UniqueIndex('showtime_id'),
+            calendar=ShowtimeCalendar(),
+            rooms=RoomIntervals(Config.SHOWTIME_CLEANING_MINUTES)
+        )
+    
+    def rebuild_indexes(self) -> None:
+        """Reconstruye los índices de funciones en bloque (se invoca al iniciar)."""
+        self.indexes.rebuild()
+    
+    @property
+    def calendar(self) -> ShowtimeCalendar:
+        """Calendario de funciones, al día con showtimes.json."""
+        return self.indexes['calendar']
+    
+    def _save_showtimes(self) -> bool:
+        """Guarda las funciones indexadas y deja los índices sincronizados."""
+        if self.db.save_data(self.showtimes_file, self.indexes.records):
+            self.indexes.mark_synced()
+            return True
+        self.indexes.rebuild()
+        return False
+    
+    def _check_slot(self, showtime: Dict, exclude: Optional[int] = None) -> None:
+        """Lanza ValueError si la función choca con otra de la misma sala."""
+        conflicts = self.indexes['rooms'].conflicts(
+            showtime['cinema_id'], showtime['date'],
+            showtime['start_time'], showtime['end_time'], exclude=exclude
+        )
+        if conflicts:
+            other = self.indexes['showtime_id'].get(conflicts[0])
+            raise ValueError(
+                f"La sala {showtime['cinema_id']} ya tiene la función {other['showtime_id']} "
+                f"el {other['date']} de {other['start_time']} a {other['end_time']} "
+                f"(se reservan {Config.SHOWTIME_CLEANING_MINUTES} min de limpieza)"
+            )
+    
+    def free_slots(self, cinema_id: int, day: datetime.date,
+                   min_minutes: int = 0) -> List[tuple]:
+        """Franjas libres [('HH:MM', 'HH:MM')] de una sala en el horario de atención."""
+        return self.indexes['rooms'].free_slots(
+            cinema_id, day, Config.CINEMA_OPENING_TIME, Config.CINEMA_CLOSING_TIME, min_minutes
+        )
+    
+    def _reindex(self, showtime: Dict, **changes) -> None:
+        """Aplica cambios a una función indexada manteniendo los índices."""
+        for index in self.indexes.indexes.values():
+            index.discard(showtime)
+        showtime.update(changes)
+        for index in self.indexes.indexes.values():
+            index.add(showtime)
     
     def load_data(self, filename: str) -> List[Dict]: 
         """Carga datos desde un archivo JSON."""
@@ -33,9 +90,13 @@ class ShowtimeController:
     def create_showtime(self, movie_id: int, cinema_id: int,  # Añade cinema_id
                         date: datetime.date, start_time: time, end_time: time, 
                         jornada: str, available_seats: Dict[str, int]) -> Dict:
-        """Crea un nuevo horario para una película."""
-        showtimes = self.db.load_data(self.showtimes_file)
-        showtime_id = self.db.get_next_id("showtimes.json", "showtime_id")
+        """
+        Crea un nuevo horario para una película.
+        Lanza ValueError si se cruza con otra función de la sala.
+        """
+        self.indexes.ensure()
+        showtimes = self.indexes.records
+        showtime_id = self.db.get_next_id("showtimes.json", "showtime_id", data=showtimes)
         
         new_showtime = Showtime(
             showtime_id=showtime_id,
@@ -48,60 +109,114 @@ class ShowtimeController:
             available_seats=available_seats
         )
         
-        showtimes.append(new_showtime.to_dict())
-        self.db.save_data(self.showtimes_file, showtimes)
-        return new_showtime.to_dict()
+        record = new_showtime.to_dict()
+        self._check_slot(record)
+        showtimes.append(record)
+        for index in self.indexes.indexes.values():
+            index.add(record)
+        self._save_showtimes()
+        return dict(record)
+    
+    def create_showtimes_bulk(self, showtimes_data: List[Dict]) -> List[Dict]:
+        """
+        Crea varias funciones con una sola escritura (mismos campos que
+        create_showtime, con fechas y horas como cadenas). Si alguna choca con
+        otra de la sala, existente o del mismo lote, no se crea ninguna (ValueError);
+        lanza IOError si no se pudieron guardar.
+        """
+        self.indexes.ensure()
+        showtimes = self.indexes.records
+        next_id = self.db.get_next_id(self.showtimes_file, "showtime_id", data=showtimes)
+        created = []
+        try:
+            for offset, data in enumerate(showtimes_data):
+                record = Showtime(
+                    showtime_id=next_id + offset,
+                    movie_id=data['movie_id'],
+                    cinema_id=data['cinema_id'],
+                    date=data['date'],
+                    start_time=data['start_time'],
+                    end_time=data['end_time'],
+                    jornada=data['jornada'],
+                    available_seats=data['available_seats']
+                ).to_dict()
+                self._check_slot(record)
+                showtimes.append(record)
+                for index in self.indexes.indexes.values():
+                    index.add(record)
+                created.append(record)
+        except ValueError:
+            for record in created:
+                for index in self.indexes.indexes.values():
+                    index.discard(record)
+            del showtimes[len(showtimes) - len(created):]
+            raise
+        if not self._save_showtimes():
+            raise IOError("No se pudieron guardar las funciones")
+        return [dict(record) for record in created]
     
     def get_showtime_by_id(self, showtime_id: int) -> Optional[Dict]:
         """Versión con parseo robusto de fechas"""
-        showtimes = self.db.load_data(self.showtimes_file)
-        for showtime in showtimes:
-            if showtime['showtime_id'] == showtime_id:
-                # Asegurar que las fechas sean strings
-                showtime['date'] = str(showtime.get('date', ''))
-                showtime['start_time'] = str(showtime.get('start_time', ''))
-                showtime['end_time'] = str(showtime.get('end_time', ''))
-                return showtime
-        return None
+        showtime = self.indexes['showtime_id'].get(showtime_id)
+        if showtime is None:
+            return None
+        showtime = dict(showtime)
+        # Asegurar que las fechas sean strings
+        showtime['date'] = str(showtime.get('date', ''))
+        showtime['start_time'] = str(showtime.get('start_time', ''))
+        showtime['end_time'] = str(showtime.get('end_time', ''))
+        return showtime
     
     def get_showtimes_by_movie(self, movie_id: int) -> List[Dict]:
         """Obtiene todos los horarios de una película."""
-        showtimes = self.db.load_data(self.showtimes_file)
-        return [st for st in showtimes if st['movie_id'] == movie_id]
+        self.indexes.ensure()
+        return [dict(st) for st in self.indexes.records if st['movie_id'] == movie_id]
+    
+    def get_showtimes_on(self, day: datetime.date) -> List[Dict]:
+        """Funciones de un día ordenadas por hora de inicio (vía calendario)."""
+        by_id = self.indexes['showtime_id']
+        return [dict(by_id.get(showtime_id)) for _, showtime_id, _ in self.calendar.on(day)]
+    
+    def get_showtimes_between(self, start: datetime, end: datetime) -> List[Dict]:
+        """Funciones que empiezan entre `start` y `end`, en orden cronológico."""
+        by_id = self.indexes['showtime_id']
+        return [dict(by_id.get(entry[1])) for _, entry in self.calendar.window(start, end)]
     
     def update_showtime(self, showtime_id: int, **kwargs) -> Optional[Dict]:
-        """Actualiza los datos de un horario."""
-        showtimes = self.db.load_data(self.showtimes_file)
-        for i, showtime in enumerate(showtimes):
-            if showtime['showtime_id'] == showtime_id:
-                for key, value in kwargs.items():
-                    if key in showtime and key != 'showtime_id':
-                        showtimes[i][key] = value
-                self.db.save_data(self.showtimes_file, showtimes)
-                return showtimes[i]
-        return None
+        """
+        Actualiza los datos de un horario.
+        Lanza ValueError si el nuevo horario o sala se cruza con otra función.
+        """
+        showtime = self.indexes['showtime_id'].get(showtime_id)
+        if showtime is None:
+            return None
+        changes = {k: v for k, v in kwargs.items() if k in showtime and k != 'showtime_id'}
+        if changes.keys() & {'cinema_id', 'date', 'start_time', 'end_time'}:
+            self._check_slot({**showtime, **changes}, exclude=showtime_id)
+        self._reindex(showtime, **changes)
+        self._save_showtimes()
+        return dict(showtime)
     
     def delete_showtime(self, showtime_id: int) -> bool:
         """Elimina un horario."""
-        showtimes = self.db.load_data(self.showtimes_file)
-        for i, showtime in enumerate(showtimes):
-            if showtime['showtime_id'] == showtime_id:
-                del showtimes[i]
-                self.db.save_data(self.showtimes_file, showtimes)
-                return True
-        return False
+        showtime = self.indexes['showtime_id'].get(showtime_id)
+        if showtime is None:
+            return False
+        for index in self.indexes.indexes.values():
+            index.discard(showtime)
+        self.indexes.records.remove(showtime)
+        self._save_showtimes()
+        return True
     
     def update_available_seats(self, showtime_id: int, seat_type: str, 
                                 quantity: int) -> bool:
         """Actualiza la cantidad de asientos disponibles para un horario."""
-        showtimes = self.db.load_data(self.showtimes_file)
-        for i, showtime in enumerate(showtimes):
-            if showtime['showtime_id'] == showtime_id:
-                if seat_type in showtimes[i]['available_seats']:
-                    showtimes[i]['available_seats'][seat_type] += quantity
-                    self.db.save_data(self.showtimes_file, showtimes)
-                    return True
-        return False
+        showtime = self.indexes['showtime_id'].get(showtime_id)
+        if showtime is None or seat_type not in showtime['available_seats']:
+            return False
+        showtime['available_seats'][seat_type] += quantity
+        self._save_showtimes()
+        return True
     
     def list_showtimes(self) -> List[Dict]:
         """Lista todos los horarios."""
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Dict, List, Optional
 from models.ticket import Ticket
 from core.database import Database
@@ -13,10 +13,8 @@ class TicketController:
     def create_ticket(self, user_id: int, movie_id: int, showtime: datetime, 
                         seat_number: str, ticket_type: str, price: float) -> Dict:
         """Crea un nuevo ticket."""
-        tickets = self.db.load_data(self.tickets_file)
         ticket_id = self.db.get_next_id("tickets.json", "ticket_id")
         
-        
         new_ticket = Ticket(
             ticket_id=ticket_id,
             user_id=user_id,
@@ -27,10 +25,28 @@ class TicketController:
             price=price
         )
         
-        tickets.append(new_ticket.to_dict())
-        self.db.save_data(self.tickets_file, tickets)
+        self.db.append_data(self.tickets_file, [new_ticket.to_dict()])
         return new_ticket.to_dict()
     
+    def create_tickets_bulk(self, tickets_data: List[Dict]) -> List[Dict]:
+        """
+        Crea varios tickets con una sola escritura (mismos campos que
+        create_ticket, más order_id/reservation_id opcionales). Los IDs se
+        toman en bloque, salvo que cada registro traiga su `ticket_id` (IDs
+        ya reservados, p. ej. por los pagos de una orden); lanza IOError si
+        no se pudieron guardar.
+        """
+        if not tickets_data:
+            return []
+        first_id = self.db.get_next_id(self.tickets_file, "ticket_id")
+        tickets = [
+            Ticket(**{'ticket_id': first_id + offset, **data}).to_dict()
+            for offset, data in enumerate(tickets_data)
+        ]
+        if not self.db.append_data(self.tickets_file, tickets):
+            raise IOError("No se pudieron guardar los tickets")
+        return tickets
+    
     def get_ticket_by_id(self, ticket_id: int) -> Optional[Dict]:
         """Obtiene un ticket por su ID."""
         tickets = self.db.load_data(self.tickets_file)
@@ -39,20 +55,30 @@ class TicketController:
                 return ticket
         return None
     
-    def get_tickets_by_user(self, user_id: int) -> List[Dict]:
-        """Obtiene todos los tickets de un usuario."""
-        tickets = self.db.load_data(self.tickets_file)
+    def get_tickets_by_user(self, user_id: int, since: Optional[date] = None) -> List[Dict]:
+        """
+        Obtiene los tickets activos de un usuario. Si se indica `since`, solo se
+        leen las particiones desde esa fecha (p. ej. funciones próximas).
+        """
+        tickets = self.db.load_range(self.tickets_file, start=since)
         return [t for t in tickets if t['user_id'] == user_id and t['status'] == 'activo']
     
     def cancel_ticket(self, ticket_id: int) -> bool:
         """Cancela un ticket (cambia su estado a inactivo)."""
+        return self.cancel_tickets([ticket_id]) == 1
+    
+    def cancel_tickets(self, ticket_ids: List[int]) -> int:
+        """Cancela varios tickets con una sola escritura; devuelve cuántos encontró."""
+        wanted = set(ticket_ids)
         tickets = self.db.load_data(self.tickets_file)
-        for i, ticket in enumerate(tickets):
-            if ticket['ticket_id'] == ticket_id:
-                tickets[i]['status'] = 'inactivo'
-                self.db.save_data(self.tickets_file, tickets)
-                return True
-        return False
+        found = 0
+        for ticket in tickets:
+            if ticket['ticket_id'] in wanted:
+                ticket['status'] = 'inactivo'
+                found += 1
+        if found:
+            self.db.save_data(self.tickets_file, tickets)
+        return found
     
     def list_tickets(self, active_only: bool = True) -> List[Dict]:
         """Lista todos los tickets."""
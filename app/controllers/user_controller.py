@@ -1,29 +1,67 @@
-import hashlib
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from models.user import User, Admin
 from core.database import Database
+from core.indexes import CollectionIndexes, UniqueIndex, normalize_email
+from core.search_index import PrefixSubstringIndex
+from services.password_hasher import PasswordHasher, get_hasher
 
 class UserController:
     """Controlador para manejar operaciones relacionadas con usuarios."""
     
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, hasher: Optional[PasswordHasher] = None):
         self.db = db
         self.users_file = "users.json"
+        self.hasher = hasher or get_hasher()
+        # Índices únicos en memoria sobre users.json (se reconstruyen si cambia el archivo)
+        self.indexes = CollectionIndexes(
+            db, self.users_file,
+            user_id=UniqueIndex('user_id'),
+            username=UniqueIndex('username'),
+            email=UniqueIndex('email', normalize_email),
+            search=PrefixSubstringIndex('user_id', ('username', 'name', 'email', 'identification'))
+        )
+        # Modificaciones por usuario, para que las sesiones sepan cuándo recargar
+        self._user_versions: Dict[int, int] = {}
+
+    def rebuild_indexes(self) -> None:
+        """Reconstruye los índices de usuarios en bloque (se invoca al iniciar)."""
+        self.indexes.rebuild()
+
+    def user_version(self, user_id: int) -> Tuple[int, int]:
+        """Versión del perfil de un usuario (cambia con update_user/delete_user)."""
+        return (self.indexes.generation, self._user_versions.get(user_id, 0))
+
+    def _touch(self, user_id: int) -> None:
+        self._user_versions[user_id] = self._user_versions.get(user_id, 0) + 1
+
+    def _save_users(self) -> bool:
+        """Guarda los usuarios indexados y deja los índices sincronizados con el archivo."""
+        if self.db.save_data(self.users_file, self.indexes.records):
+            self.indexes.mark_synced()
+            return True
+        self.indexes.rebuild()
+        return False
+
+    def _check_unique(self, username: Optional[str] = None, email: Optional[str] = None,
+                      user_id: Optional[int] = None) -> None:
+        """Lanza ValueError si el username o el email ya pertenecen a otro usuario."""
+        if username is not None:
+            other = self.indexes['username'].get(username)
+            if other is not None and other['user_id'] != user_id:
+                raise ValueError("El nombre de usuario ya existe")
+        if email is not None:
+            other = self.indexes['email'].get(email)
+            if other is not None and other['user_id'] != user_id:
+                raise ValueError("El correo electrónico ya está registrado")
         
     def create_user(self, username: str, identification: str, name: str, 
                     email: str, birth_date: datetime, password: str, 
                     is_admin: bool = False) -> Dict:
         """Crea un nuevo usuario."""
-        users = self.db.load_data(self.users_file)
-        user_id = self.db.get_next_id("users.json", "user_id")
-        
-        
-        if any(u['username'] == username for u in users):
-            raise ValueError("El nombre de usuario ya existe")
-        
-        if any(u['email'] == email for u in users):
-            raise ValueError("El correo electrónico ya está registrado")
+        self._check_unique(username=username, email=email)
+        users = self.indexes.records
+        user_id = self.db.get_next_id(self.users_file, "user_id", data=users)
         
         user_class = Admin if is_admin else User
         new_user = user_class(
@@ -36,78 +74,137 @@ class UserController:
             password=password
         )
         
-        users.append(new_user.to_dict())
-        self.db.save_data(self.users_file, users)
-        return new_user.to_dict()
+        record = new_user.to_dict()
+        users.append(record)
+        for index in self.indexes.indexes.values():
+            index.add(record)
+        self._save_users()
+        return dict(record)
+    
+    def create_users_bulk(self, users_data: List[Dict]) -> List[Dict]:
+        """
+        Crea varios usuarios con una sola escritura. Cada elemento trae los
+        campos de create_user (birth_date como 'YYYY-MM-DD' y password ya cifrada).
+        Si alguno duplica un username o email no se crea ninguno (ValueError).
+        """
+        username_index, email_index = self.indexes['username'], self.indexes['email']
+        usernames, emails = set(), set()
+        for data in users_data:
+            if data['username'] in username_index:
+                raise ValueError(f"El nombre de usuario ya existe: {data['username']}")
+            if data['email'] in email_index:
+                raise ValueError(f"El correo electrónico ya está registrado: {data['email']}")
+            email_key = normalize_email(data['email'])
+            if data['username'] in usernames or email_key in emails:
+                raise ValueError(f"Usuario duplicado en el lote: {data['username']}")
+            usernames.add(data['username'])
+            emails.add(email_key)
+
+        users = self.indexes.records
+        next_id = self.db.get_next_id(self.users_file, "user_id", data=users)
+        created = []
+        for offset, data in enumerate(users_data):
+            user_class = Admin if data.get('is_admin') else User
+            record = user_class(
+                user_id=next_id + offset,
+                username=data['username'],
+                identification=data['identification'],
+                name=data['name'],
+                email=data['email'],
+                birth_date=datetime.strptime(data['birth_date'], "%Y-%m-%d"),
+                password=data['password']
+            ).to_dict()
+            users.append(record)
+            for index in self.indexes.indexes.values():
+                index.add(record)
+            created.append(record)
+        self._save_users()
+        return [dict(record) for record in created]
     
     def get_user_by_id(self, user_id: int) -> Optional[Dict]:
         """Obtiene un usuario por su ID."""
-        users = self.db.load_data(self.users_file)
-        for user in users:
-            if user['user_id'] == user_id:
-                return user
-        return None
+        user = self.indexes['user_id'].get(user_id)
+        return dict(user) if user else None
     
     def get_user_by_username(self, username: str) -> Optional[Dict]:
         """Obtiene un usuario por su nombre de usuario."""
-        users = self.db.load_data(self.users_file)
-        for user in users:
-            if user['username'] == username:
-                return user
-        return None
+        user = self.indexes['username'].get(username)
+        return dict(user) if user else None
+    
+    def get_user_by_email(self, email: str) -> Optional[Dict]:
+        """Obtiene un usuario por su correo (sin distinguir mayúsculas)."""
+        user = self.indexes['email'].get(email)
+        return dict(user) if user else None
     
     def get_password_user(self, username: str) -> Optional[str]:
         """Obtiene la contraseña de un usuario."""
-        users = self.db.load_data(self.users_file)
-        for user in users:
-            if user['username'] == username:
-                return user['password']
-        return None
+        user = self.indexes['username'].get(username)
+        return user['password'] if user else None
     
     def update_user(self, user_id: int, **kwargs) -> Optional[Dict]:
         """Actualiza los datos de un usuario."""
-        users = self.db.load_data(self.users_file)
-        for i, user in enumerate(users):
-            if user['user_id'] == user_id:
-                for key, value in kwargs.items():
-                    if key in user and key != 'user_id':
-                        users[i][key] = value
-                self.db.save_data(self.users_file, users)
-                return users[i]
-        return None
+        user = self.indexes['user_id'].get(user_id)
+        if user is None:
+            return None
+        changes = {k: v for k, v in kwargs.items() if k in user and k != 'user_id'}
+        self._check_unique(changes.get('username'), changes.get('email'), user_id)
+        for index in self.indexes.indexes.values():
+            index.discard(user)
+        user.update(changes)
+        for index in self.indexes.indexes.values():
+            index.add(user)
+        self._touch(user_id)
+        self._save_users()
+        return dict(user)
     
     def delete_user(self, user_id: int) -> bool:
         """Elimina un usuario (cambia su estado a inactivo)."""
-        users = self.db.load_data(self.users_file)
-        for i, user in enumerate(users):
-            if user['user_id'] == user_id:
-                users[i]['status'] = 'inactivo'
-                self.db.save_data(self.users_file, users)
-                return True
-        return False
+        user = self.indexes['user_id'].get(user_id)
+        if user is None:
+            return False
+        user['status'] = 'inactivo'
+        self._touch(user_id)
+        self._save_users()
+        return True
+    
+    def search_users(self, query: str, field: Optional[str] = None,
+                     offset: int = 0, limit: int = 20) -> Tuple[List[Dict], int]:
+        """
+        Busca usuarios por prefijo o subcadena (sin distinguir mayúsculas ni
+        tildes) en username, nombre, email e identificación, o solo en `field`.
+        Devuelve (usuarios de la página, total de coincidencias).
+        """
+        users, total = self.indexes['search'].search(query, field, offset, limit)
+        return [dict(u) for u in users], total
     
-    def list_users(self, active_only: bool = True) -> List[Dict]:
-        """Lista todos los usuarios."""
-        users = self.db.load_data(self.users_file)
+    def list_users(self, active_only: bool = True, include_archived: bool = False) -> List[Dict]:
+        """Lista todos los usuarios (con include_archived, también los archivados)."""
+        users = self.db.load_range(self.users_file, include_archive=include_archived)
         if active_only:
             return [u for u in users if u['status'] == 'activo']
         return users
     
     def authenticate(self, username: str, password: str) -> Optional[Dict]:
-        """Autentica a un usuario."""
+        """
+        Autentica a un usuario con su contraseña en claro. Si el hash guardado es
+        heredado o usa otros parámetros, se recifra con los actuales.
+        """
         user = self.get_user_by_username(username)
-        if user and user['password'] == password and user['status'] == 'activo':
-            return user
-        return None
+        if not user or user['status'] != 'activo':
+            return None
+        if not self.hasher.verify(password, user.get('password')):
+            return None
+        if self.hasher.needs_rehash(user['password']):
+            user = self.update_user(user['user_id'], password=self.hasher.hash(password)) or user
+        return user
     
     def exists_user(self, username: str) -> bool:
         """Verifica si un usuario existe."""
-        return self.get_user_by_username(username) is not None
+        return username in self.indexes['username']
     
     def check_password_user(self, username: str, password: str) -> bool:
         """Verifica si la contraseña de un usuario es correcta."""
         user = self.get_user_by_username(username)
         if user is None or user.get('password') is None:
             return False
-        # Comparación segura incluso si password es None
-        return user['password'] == hashlib.sha256(password.encode()).hexdigest()
\ No newline at end of file
+        return self.hasher.verify(password, user['password'])
\ No newline at end of file
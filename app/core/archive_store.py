@@ -0,0 +1,135 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.partitioned_store import as_day, open_text, read_rows
+
+
+class ArchiveStore:
+    """
+    Archivo histórico comprimido de una colección.
+
+    Los registros archivados se escriben en segmentos inmutables
+    ``<data_dir>/archive/<nombre>/<timestamp>.json.gz`` (o ``.json.xz``) descritos
+    en ``catalog.json`` junto con su rango de fechas y los IDs máximos, para que
+    los reportes puedan consultarlos sin que vuelvan a los archivos activos.
+    """
+
+    CATALOG_FILE = "catalog.json"
+    EXTENSIONS = {'gzip': ".json.gz", 'lzma': ".json.xz"}
+
+    def __init__(self, data_dir: str, filename: str,
+                 date_field: Optional[str] = None, compression: str = 'gzip'):
+        if compression not in self.EXTENSIONS:
+            raise ValueError(f"Compresión no soportada: {compression}")
+        self.filename = filename
+        self.name = Path(filename).stem
+        self.date_field = date_field
+        self.compression = compression
+        self.dir = Path(data_dir) / "archive" / self.name
+        self._catalog: Optional[Dict[str, Any]] = None
+        self._cache: Dict[str, List[Dict[str, Any]]] = {}
+
+    @property
+    def catalog_path(self) -> Path:
+        return self.dir / self.CATALOG_FILE
+
+    def catalog(self) -> Dict[str, Any]:
+        """Devuelve el catálogo de segmentos archivados."""
+        if self._catalog is None:
+            self._catalog = {"segments": [], "max_ids": {}}
+            if self.catalog_path.exists():
+                self._catalog = read_rows(self.catalog_path) or self._catalog
+        return self._catalog
+
+    def max_id(self, id_field: str) -> int:
+        """Último ID archivado (0 si no hay registros)."""
+        return self.catalog()["max_ids"].get(id_field, 0)
+
+    def count(self) -> int:
+        """Cantidad total de registros archivados."""
+        return sum(seg["count"] for seg in self.catalog()["segments"])
+
+    def version(self) -> int:
+        """Marca de modificación del catálogo (cambia con cada segmento nuevo)."""
+        try:
+            return self.catalog_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def segment_paths(self, start: Optional[Any] = None,
+                      end: Optional[Any] = None) -> List[Path]:
+        """Rutas de los segmentos que pueden contener registros entre start y end."""
+        start_day, end_day = as_day(start), as_day(end)
+        paths = []
+        for seg in self.catalog()["segments"]:
+            if self.date_field and (start_day or end_day):
+                if seg["max_date"] is None:
+                    continue
+                if start_day and seg["max_date"] < start_day:
+                    continue
+                if end_day and seg["min_date"] > end_day:
+                    continue
+            paths.append(self.dir / seg["file"])
+        return paths
+
+    def write_segment(self, records: List[Dict[str, Any]]) -> bool:
+        """Escribe un segmento comprimido nuevo con los registros indicados."""
+        if not records:
+            return True
+        catalog = self.catalog()
+        os.makedirs(self.dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        path = self.dir / f"{stamp}{self.EXTENSIONS[self.compression]}"
+        try:
+            with open_text(path, 'w') as file:
+                json.dump(records, file, ensure_ascii=False)
+        except (IOError, TypeError):
+            return False
+        days = []
+        if self.date_field:
+            days = [d for d in (as_day(r.get(self.date_field)) for r in records) if d]
+        catalog["segments"].append({
+            "file": path.name,
+            "count": len(records),
+            "min_date": min(days) if days else None,
+            "max_date": max(days) if days else None,
+            "created_at": datetime.now().isoformat()
+        })
+        max_ids = catalog["max_ids"]
+        for row in records:
+            for field, value in row.items():
+                if field.endswith("_id") and isinstance(value, int):
+                    max_ids[field] = max(max_ids.get(field, 0), value)
+        self._cache[path.name] = records
+        with open(self.catalog_path, 'w', encoding='utf-8') as file:
+            json.dump(catalog, file, indent=2, ensure_ascii=False)
+        return True
+
+    def iter_range(self, start: Optional[Any] = None,
+                   end: Optional[Any] = None) -> Iterator[Dict[str, Any]]:
+        """Recorre los registros archivados entre start y end (inclusive)."""
+        start_day, end_day = as_day(start), as_day(end)
+        filter_dates = self.date_field and (start_day or end_day)
+        for path in self.segment_paths(start, end):
+            rows = self._cache.get(path.name)
+            if rows is None:
+                # Los segmentos son inmutables: basta con leerlos una vez
+                rows = self._cache[path.name] = read_rows(path)
+            for row in rows:
+                if filter_dates:
+                    day = as_day(row.get(self.date_field))
+                    if day is None:
+                        continue
+                    if start_day and day < start_day:
+                        continue
+                    if end_day and day > end_day:
+                        continue
+                yield dict(row)
+
+    def load_range(self, start: Optional[Any] = None,
+                   end: Optional[Any] = None) -> List[Dict[str, Any]]:
+        """Carga los registros archivados entre start y end."""
+        return list(self.iter_range(start, end))
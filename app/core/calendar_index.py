@@ -0,0 +1,109 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+# (hora de inicio 'HH:MM', showtime_id, movie_id)
+CalendarEntry = Tuple[str, int, int]
+DateLike = Union[date, datetime, str]
+
+
+def date_key(value: DateLike) -> str:
+    """Clave 'YYYY-MM-DD' de una fecha (las cadenas se usan tal cual)."""
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+
+class ShowtimeCalendar:
+    """
+    Índice de funciones por fecha: 'YYYY-MM-DD' -> [(inicio, showtime_id, movie_id)]
+    ordenado, más la lista ordenada de fechas con funciones.
+
+    Fechas y horas se guardan como cadenas ISO, que ordenan igual que los
+    valores que representan, así que las consultas por día o por ventana
+    usan bisect sin convertir cadenas con ``strptime``. Implementa
+    ``clear/add/discard`` para mantenerse con ``CollectionIndexes``.
+    """
+
+    def __init__(self):
+        self._days: Dict[str, List[CalendarEntry]] = {}
+        self._dates: List[str] = []
+        self._entries: Dict[int, Tuple[str, CalendarEntry]] = {}
+
+    def clear(self) -> None:
+        self._days.clear()
+        self._dates.clear()
+        self._entries.clear()
+
+    @staticmethod
+    def _entry(record: Dict[str, Any]) -> Tuple[str, CalendarEntry]:
+        return (str(record.get('date', '')),
+                (str(record.get('start_time', '')), record['showtime_id'], record.get('movie_id')))
+
+    def add(self, record: Dict[str, Any], replace: bool = True) -> None:
+        showtime_id = record['showtime_id']
+        if showtime_id in self._entries:
+            if not replace:
+                return
+            self.discard(record)
+        day, entry = self._entry(record)
+        entries = self._days.get(day)
+        if entries is None:
+            entries = self._days[day] = []
+            insort(self._dates, day)
+        insort(entries, entry)
+        self._entries[showtime_id] = (day, entry)
+
+    def discard(self, record: Dict[str, Any]) -> None:
+        located = self._entries.pop(record['showtime_id'], None)
+        if located is None:
+            return
+        day, entry = located
+        entries = self._days[day]
+        pos = bisect_left(entries, entry)
+        if pos < len(entries) and entries[pos] == entry:
+            del entries[pos]
+        if not entries:
+            del self._days[day]
+            del self._dates[bisect_left(self._dates, day)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------ #
+    # Consultas
+    # ------------------------------------------------------------------ #
+    def on(self, day: DateLike) -> List[CalendarEntry]:
+        """Funciones de un día ordenadas por hora de inicio."""
+        return list(self._days.get(date_key(day), ()))
+
+    def dates(self, start: Optional[DateLike] = None,
+              end: Optional[DateLike] = None) -> List[str]:
+        """Fechas con funciones en [start, end] (ambos incluidos)."""
+        lo = bisect_left(self._dates, date_key(start)) if start is not None else 0
+        hi = bisect_right(self._dates, date_key(end)) if end is not None else len(self._dates)
+        return self._dates[lo:hi]
+
+    def window(self, start: Optional[DateLike] = None,
+               end: Optional[DateLike] = None) -> Iterator[Tuple[str, CalendarEntry]]:
+        """
+        (fecha, entrada) de las funciones entre `start` y `end` en orden
+        cronológico. Con datetime también se recorta por la hora de inicio.
+        """
+        start_time = start.strftime("%H:%M") if isinstance(start, datetime) else None
+        end_time = end.strftime("%H:%M") if isinstance(end, datetime) else None
+        days = self.dates(start, end)
+        for i, day in enumerate(days):
+            entries = self._days[day]
+            lo, hi = 0, len(entries)
+            if i == 0 and start_time is not None and day == date_key(start):
+                lo = bisect_left(entries, (start_time,))
+            if i == len(days) - 1 and end_time is not None and day == date_key(end):
+                # Incluye las funciones que empiezan exactamente en `end`
+                hi = bisect_right(entries, (end_time, float('inf')))
+            for pos in range(lo, hi):
+                yield day, entries[pos]
+
+    def movies_on(self, day: DateLike) -> Set[int]:
+        """IDs de las películas con funciones en un día."""
+        return {movie_id for _, _, movie_id in self._days.get(date_key(day), ())}
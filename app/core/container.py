@@ -0,0 +1,170 @@
+from functools import cached_property
+from typing import Optional
+
+from config import Config
+from core.database import Database
+
+from services.auth_service import AuthService
+from services.archive_service import ArchiveService
+from services.reservation_expiry import ReservationExpiryScheduler
+from services.validation_service import ValidationService
+from services.user_import_service import UserImportService
+
+from controllers.user_controller import UserController
+from controllers.movie_controller import MovieController
+from controllers.cinema_controller import CinemaController
+from controllers.food_controller import FoodController
+from controllers.ticket_controller import TicketController
+from controllers.reservation_controller import ReservationController
+from controllers.payment_controller import PaymentController
+from controllers.order_controller import OrderController
+from controllers.showtime_controller import ShowtimeController
+from controllers.report_controller import ReportController
+
+from views.menu_view import MenuView
+from views.login_view import LoginView
+from views.user_view import UserView
+from views.movie_view import MovieView
+from views.ticket_view import TicketView
+from views.reservation_view import ReservationView
+from views.payment_view import PaymentView
+from views.food_view import FoodView
+from views.availability_view import AvailabilityView
+from views.report_view import ReportView
+
+
+class AppContainer:
+    """
+    Contenedor de dependencias de la aplicación.
+
+    Cada componente (base de datos, controladores, servicios y vistas) se
+    construye una sola vez, la primera vez que se pide, y recibe sus
+    dependencias del propio contenedor. Así hay un único ``Database`` y un
+    único controlador de cada tipo por proceso, y sus cachés e índices en
+    memoria se comparten entre vistas, servicios y handlers.
+    """
+
+    def __init__(self, data_dir: Optional[str] = None):
+        self.data_dir = str(data_dir or Config.DATA_DIR)
+
+    # ------------------------------------------------------------------ #
+    # Núcleo
+    # ------------------------------------------------------------------ #
+    @cached_property
+    def db(self) -> Database:
+        return Database(self.data_dir)
+
+    # ------------------------------------------------------------------ #
+    # Controladores
+    # ------------------------------------------------------------------ #
+    @cached_property
+    def user_controller(self) -> UserController:
+        return UserController(self.db)
+
+    @cached_property
+    def cinema_controller(self) -> CinemaController:
+        return CinemaController(self.db)
+
+    @cached_property
+    def showtime_controller(self) -> ShowtimeController:
+        return ShowtimeController(self.db, self.cinema_controller)
+
+    @cached_property
+    def movie_controller(self) -> MovieController:
+        return MovieController(self.db, self.showtime_controller)
+
+    @cached_property
+    def food_controller(self) -> FoodController:
+        return FoodController(self.db)
+
+    @cached_property
+    def ticket_controller(self) -> TicketController:
+        return TicketController(self.db)
+
+    @cached_property
+    def payment_controller(self) -> PaymentController:
+        return PaymentController(self.db)
+
+    @cached_property
+    def reservation_controller(self) -> ReservationController:
+        return ReservationController(self.db, self.payment_controller, self.ticket_controller)
+
+    @cached_property
+    def order_controller(self) -> OrderController:
+        return OrderController(self.db, self.payment_controller, self.ticket_controller)
+
+    @cached_property
+    def report_controller(self) -> ReportController:
+        return ReportController(
+            self.db,
+            movie_controller=self.movie_controller,
+            user_controller=self.user_controller
+        )
+
+    # ------------------------------------------------------------------ #
+    # Servicios
+    # ------------------------------------------------------------------ #
+    @cached_property
+    def archive_service(self) -> ArchiveService:
+        return ArchiveService(self.db)
+
+    @cached_property
+    def validation_service(self) -> ValidationService:
+        return ValidationService()
+
+    @cached_property
+    def auth_service(self) -> AuthService:
+        return AuthService(self.db, self.user_controller)
+
+    @cached_property
+    def user_import_service(self) -> UserImportService:
+        return UserImportService(self.user_controller, self.validation_service)
+
+    @cached_property
+    def reservation_expiry(self) -> ReservationExpiryScheduler:
+        return ReservationExpiryScheduler(
+            self.reservation_controller, self.cinema_controller, self.showtime_controller
+        )
+
+    # ------------------------------------------------------------------ #
+    # Vistas
+    # ------------------------------------------------------------------ #
+    @cached_property
+    def menu_view(self) -> MenuView:
+        return MenuView()
+
+    @cached_property
+    def login_view(self) -> LoginView:
+        return LoginView(self.user_controller, self.auth_service)
+
+    @cached_property
+    def user_view(self) -> UserView:
+        return UserView(self.db, self.user_controller)
+
+    @cached_property
+    def movie_view(self) -> MovieView:
+        return MovieView(self.db, self.cinema_controller)
+
+    @cached_property
+    def ticket_view(self) -> TicketView:
+        return TicketView(self.db, self.movie_view, self.showtime_controller)
+
+    @cached_property
+    def reservation_view(self) -> ReservationView:
+        return ReservationView(self.db, self.movie_view, self.showtime_controller)
+
+    @cached_property
+    def payment_view(self) -> PaymentView:
+        return PaymentView()
+
+    @cached_property
+    def food_view(self) -> FoodView:
+        return FoodView()
+
+    @cached_property
+    def availability_view(self) -> AvailabilityView:
+        return AvailabilityView(self.db, self.cinema_controller, self.showtime_controller)
+
+    @cached_property
+    def report_view(self) -> ReportView:
+        return ReportView()
@@ -0,0 +1,216 @@
+import atexit
+import itertools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config import Config
+
+
+class InsufficientCount(ValueError):
+    """No hay disponible suficiente para apartar una clave."""
+
+    def __init__(self, key: str, available: int, requested: int):
+        super().__init__(f"Disponible insuficiente para {key}: {available} de {requested}")
+        self.key = key
+        self.available = available
+        self.requested = requested
+
+
+class CounterStore:
+    """
+    Contadores enteros en memoria (p. ej. existencias por ítem) con reservas
+    y persistencia por lotes en un archivo JSON compacto.
+
+    - ``reserve`` aparta cantidades de varias claves a la vez (todas o
+      ninguna) sin bajar nunca de cero lo disponible (existencias - apartado).
+    - ``commit`` descuenta lo apartado y ``release`` lo devuelve.
+    - ``add`` repone (o ajusta) y ``set`` fija el valor de un contador.
+
+    Las operaciones son O(1) bajo un lock; el archivo se reescribe al llegar a
+    ``flush_every`` cambios pendientes, a más tardar ``flush_seconds`` después
+    del primer cambio sin guardar (un temporizador en segundo plano, aunque no
+    haya más actividad) y al salir. Las escrituras se serializan con un lock
+    propio, de modo que nunca se mezclan y la última deja el estado más
+    reciente. Las reservas pendientes no se guardan: si el proceso termina se
+    liberan.
+    Las claves sin contador se consideran sin control de existencias.
+    """
+
+    def __init__(self, path: Path, flush_every: int = Config.COUNTER_FLUSH_EVERY,
+                 flush_seconds: float = Config.COUNTER_FLUSH_SECONDS):
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._values: Dict[str, int] = {}
+        self._reserved: Dict[str, int] = {}
+        self._thresholds: Dict[str, int] = {}
+        self._reservations: Dict[int, Dict[str, int]] = {}
+        self._tokens = itertools.count(1)
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._load()
+        atexit.register(self.flush)
+
+    # ------------------------------------------------------------------ #
+    # Persistencia
+    # ------------------------------------------------------------------ #
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        self._values = {k: int(v) for k, v in data.get("values", {}).items()}
+        self._thresholds = {k: int(v) for k, v in data.get("thresholds", {}).items()}
+
+    def flush(self) -> bool:
+        """Escribe los contadores si hay cambios pendientes."""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._pending:
+                    return True
+                payload = {"values": dict(self._values), "thresholds": dict(self._thresholds)}
+                pending, self._pending = self._pending, 0
+                self._last_flush = time.monotonic()
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            try:
+                os.makedirs(self.path.parent, exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as file:
+                    json.dump(payload, file, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+                return True
+            except (IOError, TypeError):
+                with self._lock:
+                    # Los cambios siguen pendientes para el próximo intento
+                    self._pending += pending
+                return False
+
+    def _changed(self) -> bool:
+        """Registra un cambio (con el lock tomado); indica si toca escribir ya."""
+        self._pending += 1
+        if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_seconds:
+            return True
+        if self._timer is None:
+            # Plazo máximo para este cambio aunque no haya más actividad
+            self._timer = threading.Timer(self.flush_seconds, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+        return False
+
+    # ------------------------------------------------------------------ #
+    # Lectura
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _key(key: Any) -> str:
+        return str(key)
+
+    def get(self, key: Any) -> Optional[int]:
+        """Valor del contador (None si la clave no tiene contador)."""
+        return self._values.get(self._key(key))
+
+    def available(self, key: Any) -> Optional[int]:
+        """Valor menos lo apartado por reservas pendientes (None sin contador)."""
+        key = self._key(key)
+        with self._lock:
+            if key not in self._values:
+                return None
+            return self._values[key] - self._reserved.get(key, 0)
+
+    def threshold(self, key: Any) -> int:
+        return self._thresholds.get(self._key(key), Config.FOOD_LOW_STOCK_THRESHOLD)
+
+    def low(self) -> Dict[str, int]:
+        """Claves cuyo disponible está en su umbral o por debajo -> disponible."""
+        with self._lock:
+            return {
+                key: value - self._reserved.get(key, 0)
+                for key, value in self._values.items()
+                if value - self._reserved.get(key, 0) <= self._thresholds.get(key, Config.FOOD_LOW_STOCK_THRESHOLD)
+            }
+
+    # ------------------------------------------------------------------ #
+    # Escritura
+    # ------------------------------------------------------------------ #
+    def set(self, key: Any, value: int) -> None:
+        """Fija el contador (no puede quedar por debajo de lo apartado)."""
+        key = self._key(key)
+        with self._lock:
+            if value < self._reserved.get(key, 0):
+                raise ValueError(f"El valor de {key} no puede ser menor que lo apartado")
+            self._values[key] = value
+            flush = self._changed()
+        if flush:
+            self.flush()
+
+    def add(self, key: Any, amount: int) -> int:
+        """Suma `amount` (negativo para ajustes) sin bajar de lo apartado; devuelve el valor."""
+        key = self._key(key)
+        with self._lock:
+            value = self._values.get(key, 0) + amount
+            if value < self._reserved.get(key, 0):
+                raise ValueError(f"Existencias insuficientes para ajustar {key}")
+            self._values[key] = value
+            flush = self._changed()
+        if flush:
+            self.flush()
+        return value
+
+    def set_threshold(self, key: Any, threshold: int) -> None:
+        with self._lock:
+            self._thresholds[self._key(key)] = threshold
+            flush = self._changed()
+        if flush:
+            self.flush()
+
+    def reserve(self, amounts: Dict[Any, int]) -> int:
+        """
+        Aparta cantidades de varias claves; todas o ninguna. Devuelve el token
+        de la reserva o lanza InsufficientCount con la primera clave sin disponible.
+        Las claves sin contador no se apartan.
+        """
+        wanted: Dict[str, int] = {}
+        for key, amount in amounts.items():
+            if amount > 0:
+                wanted[self._key(key)] = wanted.get(self._key(key), 0) + amount
+        with self._lock:
+            for key, amount in wanted.items():
+                if key in self._values and self._values[key] - self._reserved.get(key, 0) < amount:
+                    raise InsufficientCount(key, self._values[key] - self._reserved.get(key, 0), amount)
+            held = {key: amount for key, amount in wanted.items() if key in self._values}
+            for key, amount in held.items():
+                self._reserved[key] = self._reserved.get(key, 0) + amount
+            token = next(self._tokens)
+            self._reservations[token] = held
+        return token
+
+    def _close(self, token: int, consume: bool) -> bool:
+        with self._lock:
+            held = self._reservations.pop(token, None)
+            if held is None:
+                return False
+            for key, amount in held.items():
+                self._reserved[key] -= amount
+                if consume:
+                    self._values[key] -= amount
+            flush = consume and held and self._changed()
+        if flush:
+            self.flush()
+        return True
+
+    def commit(self, token: int) -> bool:
+        """Descuenta definitivamente lo apartado por la reserva."""
+        return self._close(token, consume=True)
+
+    def release(self, token: int) -> bool:
+        """Devuelve lo apartado por la reserva."""
+        return self._close(token, consume=False)
@@ -1,25 +1,85 @@
 import json
 import os
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
+from config import Config
+from core.partitioned_store import PartitionedStore
+from core.archive_store import ArchiveStore
+
 class Database:
     """Clase para manejar la persistencia de datos en archivos JSON."""
-    
-    def __init__(self, data_dir: str = "data"):
+
+    def __init__(self, data_dir: str = "data", partitioned: Optional[Dict[str, str]] = None,
+                 archived: Optional[Dict[str, Optional[str]]] = None):
         """Inicializa la base de datos y crea el directorio si no existe."""
         self.data_dir = data_dir
         os.makedirs(self.data_dir, exist_ok=True)
-    
-    def get_next_id(self, filename: str, id_field: str = "id") -> int:
-        """Obtiene el próximo ID disponible para un archivo, basado en el campo de ID especificado."""
-        data = self.load_data(filename)
+        if partitioned is None:
+            partitioned = Config.PARTITIONED_FILES
+        if archived is None:
+            archived = Config.ARCHIVED_FILES
+        self.partitions: Dict[str, PartitionedStore] = {
+            filename: PartitionedStore(self.data_dir, filename, date_field)
+            for filename, date_field in partitioned.items()
+        }
+        self.archives: Dict[str, ArchiveStore] = {
+            filename: ArchiveStore(self.data_dir, filename, date_field, Config.ARCHIVE_COMPRESSION)
+            for filename, date_field in archived.items()
+        }
+        # Contador de escrituras por archivo y funciones a notificar en cada escritura
+        self._write_counts: Dict[str, int] = {}
+        self._listeners: List[Callable[[str], None]] = []
+
+    def is_partitioned(self, filename: str) -> bool:
+        """Indica si un archivo se guarda particionado por mes."""
+        return filename in self.partitions
+
+    def add_write_listener(self, listener: Callable[[str], None]) -> None:
+        """Registra una función que recibe el nombre de archivo tras cada escritura."""
+        self._listeners.append(listener)
+
+    def _notify_write(self, filename: str) -> None:
+        self._write_counts[filename] = self._write_counts.get(filename, 0) + 1
+        for listener in self._listeners:
+            listener(filename)
+
+    def data_version(self, filename: str) -> Tuple[int, int, int]:
+        """
+        Versión de un archivo: escrituras hechas en este proceso más la marca de
+        modificación en disco (del catálogo en colecciones particionadas y del
+        archivo histórico), de modo que también se detectan cambios externos.
+        """
+        if self.is_partitioned(filename):
+            disk = self.partitions[filename].version()
+        else:
+            try:
+                disk = (Path(self.data_dir) / filename).stat().st_mtime_ns
+            except FileNotFoundError:
+                disk = 0
+        archived = self.archives[filename].version() if filename in self.archives else 0
+        return (self._write_counts.get(filename, 0), disk, archived)
+
+    def get_next_id(self, filename: str, id_field: str = "id",
+                    data: Optional[List[Dict[str, Any]]] = None) -> int:
+        """
+        Obtiene el próximo ID disponible para un archivo, basado en el campo de ID especificado.
+        Si el llamador ya tiene los registros cargados puede pasarlos en `data`.
+        """
+        # Los IDs archivados tampoco se reutilizan
+        archived_max = self.archives[filename].max_id(id_field) if filename in self.archives else 0
+        if self.is_partitioned(filename):
+            return max(self.partitions[filename].max_id(id_field), archived_max) + 1
+        if data is None:
+            data = self.load_data(filename)
         if not data:
-            return 1
-        return max((item.get(id_field, 0) for item in data)) + 1
-    
+            return archived_max + 1
+        return max(max((item.get(id_field, 0) for item in data)), archived_max) + 1
+
     def load_data(self, filename: str) -> List[Dict[str, Any]]:
         """Carga datos desde un archivo JSON."""
+        if self.is_partitioned(filename):
+            return self.partitions[filename].load_all()
         filepath = Path(self.data_dir) / filename
         try:
             if filepath.exists():
@@ -28,17 +88,81 @@ class Database:
             return []
         except (json.JSONDecodeError, FileNotFoundError):
             return []
-    
+
+    def load_range(self, filename: str, start: Any = None, end: Any = None,
+                   include_archive: bool = False) -> List[Dict[str, Any]]:
+        """
+        Carga registros cuyo campo de fecha cae entre start y end (inclusive).
+        En colecciones particionadas solo se leen las particiones del rango.
+        Con include_archive también se leen los segmentos archivados del rango.
+        """
+        if self.is_partitioned(filename):
+            data = self.partitions[filename].load_range(start, end)
+        else:
+            data = self.load_data(filename)
+        if include_archive and filename in self.archives:
+            data.extend(self.archives[filename].iter_range(start, end))
+        return data
+
+    def source_paths(self, filename: str, start: Any = None, end: Any = None,
+                     include_archive: bool = False) -> List[str]:
+        """
+        Rutas de los archivos (particiones y segmentos archivados) que pueden
+        contener registros del rango, para procesarlos de forma independiente.
+        """
+        if self.is_partitioned(filename):
+            paths = self.partitions[filename].partition_paths(start, end)
+        else:
+            paths = [Path(self.data_dir) / filename]
+        if include_archive and filename in self.archives:
+            paths.extend(self.archives[filename].segment_paths(start, end))
+        return [str(p) for p in paths]
+
+    def date_field(self, filename: str) -> Optional[str]:
+        """Campo de fecha por el que se particiona/archiva un archivo (si existe)."""
+        if self.is_partitioned(filename):
+            return self.partitions[filename].date_field
+        if filename in self.archives:
+            return self.archives[filename].date_field
+        return None
+
     def save_data(self, filename: str, data: List[Dict[str, Any]]) -> bool:
         """Guarda datos en un archivo JSON."""
-        filepath = Path(self.data_dir) / filename
-        try:
-            with open(filepath, 'w', encoding='utf-8') as file:
-                json.dump(data, file, indent=2, ensure_ascii=False)
+        if self.is_partitioned(filename):
+            saved = self.partitions[filename].replace_all(data)
+        else:
+            filepath = Path(self.data_dir) / filename
+            try:
+                with open(filepath, 'w', encoding='utf-8') as file:
+                    json.dump(data, file, indent=2, ensure_ascii=False)
+                saved = True
+            except (IOError, TypeError):
+                saved = False
+        self._notify_write(filename)
+        return saved
+
+    def append_data(self, filename: str, records: List[Dict[str, Any]]) -> bool:
+        """Agrega registros al final; en colecciones particionadas solo toca la partición del mes."""
+        if self.is_partitioned(filename):
+            saved = self.partitions[filename].append(records)
+            self._notify_write(filename)
+            return saved
+        data = self.load_data(filename)
+        data.extend(records)
+        return self.save_data(filename, data)
+
+    def archive_records(self, filename: str, archived: List[Dict[str, Any]],
+                        remaining: List[Dict[str, Any]]) -> bool:
+        """Mueve registros al archivo comprimido y deja solo `remaining` en el archivo activo."""
+        if not archived:
             return True
-        except (IOError, TypeError):
+        if filename not in self.archives:
+            return False
+        # Primero el segmento: ante un fallo se duplica un registro, no se pierde
+        if not self.archives[filename].write_segment(archived):
             return False
-    
+        return self.save_data(filename, remaining)
+
     def initialize_database(self, initial_data: Dict[str, List[Dict[str, Any]]]) -> bool:
         """Inicializa la base de datos con datos iniciales."""
         try:
@@ -47,4 +171,4 @@ class Database:
                     return False
             return True
         except Exception:
-            return False
\ No newline at end of file
+            return False
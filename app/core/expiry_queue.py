@@ -0,0 +1,58 @@
+import heapq
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class ExpiryQueue:
+    """
+    Cola de vencimientos: montículo de (vence, clave) con borrado perezoso.
+
+    ``push`` y ``discard`` son O(log n) y O(1); las entradas descartadas o
+    reprogramadas se saltan al llegar a la cima. ``pop_due`` extrae en orden
+    todas las claves vencidas y ``next_due`` consulta el próximo vencimiento
+    sin recorrer la cola. Los vencimientos son cadenas ISO, que ordenan igual
+    que las fechas que representan.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[str, Any]] = []
+        self._due: Dict[Any, str] = {}
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._due.clear()
+
+    def push(self, key: Any, due: str) -> None:
+        """Programa (o reprograma) el vencimiento de una clave."""
+        self._due[key] = due
+        heapq.heappush(self._heap, (due, key))
+
+    def discard(self, key: Any) -> None:
+        """Quita la clave de la cola (si estaba)."""
+        self._due.pop(key, None)
+
+    def _prune(self) -> None:
+        """Saca de la cima las entradas descartadas o reprogramadas."""
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def next_due(self) -> Optional[str]:
+        """Próximo vencimiento (None si la cola está vacía)."""
+        self._prune()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: str, limit: Optional[int] = None) -> List[Any]:
+        """Extrae las claves con vencimiento <= now, de la más antigua a la más reciente."""
+        keys = []
+        self._prune()
+        while self._heap and self._heap[0][0] <= now and (limit is None or len(keys) < limit):
+            _, key = heapq.heappop(self._heap)
+            del self._due[key]
+            keys.append(key)
+            self._prune()
+        return keys
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._due
+
+    def __len__(self) -> int:
+        return len(self._due)
@@ -0,0 +1,104 @@
+from typing import Any, Callable, Dict, Optional
+
+from core.database import Database
+
+
+def normalize_email(email: Any) -> str:
+    """Normaliza un correo para comparar duplicados (sin espacios y en minúsculas)."""
+    return str(email or "").strip().lower()
+
+
+class UniqueIndex:
+    """Índice hash único: valor (normalizado) de un campo -> registro."""
+
+    def __init__(self, field: str, normalize: Optional[Callable[[Any], Any]] = None):
+        self.field = field
+        self.normalize = normalize or (lambda value: value)
+        self._map: Dict[Any, Dict[str, Any]] = {}
+
+    def key(self, value: Any) -> Any:
+        return self.normalize(value)
+
+    def clear(self) -> None:
+        self._map.clear()
+
+    def add(self, record: Dict[str, Any], replace: bool = True) -> None:
+        """Indexa un registro; sin replace se conserva el primero ya indexado."""
+        key = self.key(record.get(self.field))
+        if replace or key not in self._map:
+            self._map[key] = record
+
+    def discard(self, record: Dict[str, Any]) -> None:
+        """Quita del índice la entrada del registro (si apunta a ese mismo registro)."""
+        key = self.key(record.get(self.field))
+        current = self._map.get(key)
+        if current is not None and current is record:
+            del self._map[key]
+
+    def get(self, value: Any) -> Optional[Dict[str, Any]]:
+        return self._map.get(self.key(value))
+
+    def __contains__(self, value: Any) -> bool:
+        return self.key(value) in self._map
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+
+class CollectionIndexes:
+    """
+    Índices únicos de un archivo JSON construidos con una sola lectura.
+
+    Se guardan junto con la versión del archivo (``Database.data_version``):
+    si otro proceso o instancia lo modifica, el siguiente acceso los
+    reconstruye. Quien escribe a través del controlador dueño los actualiza en
+    el lugar y llama a ``mark_synced`` para no reconstruir tras su propia escritura.
+
+    Los índices con ``persistent`` (p. ej. ``TrigramIndex``) se guardan en disco
+    con la versión del archivo y al reconstruir se restauran si no cambió.
+    """
+
+    def __init__(self, db: Database, filename: str, **indexes: UniqueIndex):
+        self.db = db
+        self.filename = filename
+        self.indexes = indexes
+        self.records: list = []
+        self._version = None
+        # Cuenta las reconstrucciones: invalida lo que se haya derivado de los índices
+        self.generation = 0
+
+    def rebuild(self) -> None:
+        """Reconstrucción completa (p. ej. al iniciar la aplicación)."""
+        self.records = self.db.load_data(self.filename)
+        self._version = self.db.data_version(self.filename)
+        for index in self.indexes.values():
+            persistent = getattr(index, 'persistent', False)
+            if persistent and index.restore(self.records, self._disk_version()):
+                continue
+            index.clear()
+            for record in self.records:
+                # Con datos heredados duplicados gana el primero, como en la búsqueda lineal
+                index.add(record, replace=False)
+            if persistent:
+                index.persist(self._disk_version())
+        self.generation += 1
+
+    def _disk_version(self) -> Any:
+        """Versión en disco (sin el contador de escrituras de este proceso)."""
+        return self._version[1:]
+
+    def ensure(self) -> None:
+        """Reconstruye los índices si el archivo cambió desde la última lectura."""
+        if self._version != self.db.data_version(self.filename):
+            self.rebuild()
+
+    def mark_synced(self) -> None:
+        """Registra la versión actual tras una escritura ya reflejada en los índices."""
+        self._version = self.db.data_version(self.filename)
+        for index in self.indexes.values():
+            if getattr(index, 'persistent', False):
+                index.persist(self._disk_version())
+
+    def __getitem__(self, name: str) -> UniqueIndex:
+        self.ensure()
+        return self.indexes[name]
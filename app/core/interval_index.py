@@ -0,0 +1,129 @@
+from bisect import bisect_left, insort
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+MINUTES_PER_DAY = 24 * 60
+
+# (inicio, fin con limpieza, showtime_id) en minutos absolutos
+Interval = Tuple[int, int, int]
+DateLike = Union[date, datetime, str]
+TimeLike = Union[time, str]
+
+
+def day_number(value: DateLike) -> int:
+    """Número de día (ordinal) de una fecha o de una cadena 'YYYY-MM-DD'."""
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(str(value)).toordinal()
+
+
+def minutes(value: TimeLike) -> int:
+    """Minutos desde medianoche de una hora o de una cadena 'HH:MM' (admite '24:00')."""
+    if isinstance(value, time):
+        return value.hour * 60 + value.minute
+    hours, mins = str(value).split(":")[:2]
+    return int(hours) * 60 + int(mins)
+
+
+def format_minutes(value: int) -> str:
+    """'HH:MM' de los minutos desde medianoche."""
+    return f"{value // 60:02d}:{value % 60:02d}"
+
+
+class RoomIntervals:
+    """
+    Índice de ocupación de salas: por cinema_id, lista ordenada de intervalos
+    [inicio, fin + limpieza) en minutos absolutos (día ordinal * 1440 + minutos).
+
+    Una función cuyo fin es anterior o igual a su inicio termina al día
+    siguiente. Para encontrar choques se recorre con bisect solo la franja
+    [inicio - duración máxima, fin) de la sala: O(log n + k), también con
+    solapamientos heredados. Implementa ``clear/add/discard`` para
+    mantenerse con ``CollectionIndexes``.
+    """
+
+    def __init__(self, buffer_minutes: int = 0):
+        self.buffer_minutes = buffer_minutes
+        self._rooms: Dict[Any, List[Interval]] = {}
+        self._longest: Dict[Any, int] = {}
+        self._entries: Dict[int, Tuple[Any, Interval]] = {}
+
+    def clear(self) -> None:
+        self._rooms.clear()
+        self._longest.clear()
+        self._entries.clear()
+
+    def interval(self, day: DateLike, start: TimeLike, end: TimeLike) -> Tuple[int, int]:
+        """Intervalo ocupado (con limpieza) de una función."""
+        base = day_number(day) * MINUTES_PER_DAY
+        start_min, end_min = minutes(start), minutes(end)
+        if end_min <= start_min:
+            end_min += MINUTES_PER_DAY
+        return base + start_min, base + end_min + self.buffer_minutes
+
+    def add(self, record: Dict[str, Any], replace: bool = True) -> None:
+        showtime_id = record['showtime_id']
+        if showtime_id in self._entries:
+            if not replace:
+                return
+            self.discard(record)
+        try:
+            start, end = self.interval(record['date'], record['start_time'], record['end_time'])
+        except (KeyError, ValueError):
+            # Registros heredados sin fecha u hora válidas no ocupan la sala
+            return
+        cinema_id = record.get('cinema_id')
+        entry = (start, end, showtime_id)
+        insort(self._rooms.setdefault(cinema_id, []), entry)
+        self._longest[cinema_id] = max(self._longest.get(cinema_id, 0), end - start)
+        self._entries[showtime_id] = (cinema_id, entry)
+
+    def discard(self, record: Dict[str, Any]) -> None:
+        located = self._entries.pop(record['showtime_id'], None)
+        if located is None:
+            return
+        cinema_id, entry = located
+        intervals = self._rooms[cinema_id]
+        pos = bisect_left(intervals, entry)
+        if pos < len(intervals) and intervals[pos] == entry:
+            del intervals[pos]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------ #
+    # Consultas
+    # ------------------------------------------------------------------ #
+    def overlapping(self, cinema_id: Any, start: int, end: int) -> List[Interval]:
+        """Intervalos de la sala que se cruzan con [start, end)."""
+        intervals = self._rooms.get(cinema_id, [])
+        lo = bisect_left(intervals, (start - self._longest.get(cinema_id, 0),))
+        hi = bisect_left(intervals, (end,))
+        return [iv for iv in intervals[lo:hi] if iv[1] > start]
+
+    def conflicts(self, cinema_id: Any, day: DateLike, start: TimeLike, end: TimeLike,
+                  exclude: Optional[int] = None) -> List[int]:
+        """IDs de las funciones de la sala que chocan con la indicada (limpieza incluida)."""
+        new_start, new_end = self.interval(day, start, end)
+        return [showtime_id for _, _, showtime_id in self.overlapping(cinema_id, new_start, new_end)
+                if showtime_id != exclude]
+
+    def free_slots(self, cinema_id: Any, day: DateLike, opening: TimeLike, closing: TimeLike,
+                   min_minutes: int = 0) -> List[Tuple[str, str]]:
+        """
+        Franjas libres [('HH:MM', 'HH:MM')] de la sala entre `opening` y
+        `closing` del día. Una función cabe en una franja si su duración más
+        la limpieza no supera el largo de la franja.
+        """
+        base = day_number(day) * MINUTES_PER_DAY
+        day_start, day_end = base + minutes(opening), base + minutes(closing)
+        slots, cursor = [], day_start
+        for start, end, _ in self.overlapping(cinema_id, day_start, day_end):
+            if start - cursor >= max(min_minutes, 1):
+                slots.append((cursor, start))
+            cursor = max(cursor, end)
+        if day_end - cursor >= max(min_minutes, 1):
+            slots.append((cursor, day_end))
+        return [(format_minutes(s - base), format_minutes(e - base)) for s, e in slots]
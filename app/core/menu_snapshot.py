@@ -0,0 +1,55 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.search_index import fold
+
+# (ID, código, categoría, producto, tamaño, precio) ya formateados para las tablas
+MenuRow = Tuple[str, str, str, str, str, str]
+
+
+def format_price(price: Any) -> str:
+    """Precio con separador de miles y sin decimales ('$12,500')."""
+    return f"${price:,.0f}"
+
+
+class MenuSnapshot:
+    """
+    Foto inmutable del menú activo para mostrarlo sin leer el archivo.
+
+    Se construye una vez a partir de los registros indexados: ítems activos
+    ordenados por categoría y producto (sin distinguir tildes), filas de
+    tabla con el precio y el tamaño ya formateados, agrupación por categoría
+    y búsqueda por código. ``FoodController`` la descarta al crear, actualizar
+    o desactivar ítems y cuando sus índices se reconstruyen (``generation``).
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], generation: int = 0):
+        self.generation = generation
+        active = [dict(record) for record in records if record.get('status') == 'activo']
+        active.sort(key=lambda i: (fold(i['category']), fold(i['product']), i['item_id']))
+        self.items: List[Dict[str, Any]] = active
+        self.rows: List[MenuRow] = [self._row(item) for item in active]
+        # Categoría -> filas, en el orden del menú
+        self.categories: Dict[str, List[MenuRow]] = {}
+        for item, row in zip(active, self.rows):
+            self.categories.setdefault(item['category'], []).append(row)
+        self._by_code: Dict[str, Dict[str, Any]] = {}
+        for item in active:
+            self._by_code.setdefault(str(item['code']).lower(), item)
+
+    @staticmethod
+    def _row(item: Dict[str, Any]) -> MenuRow:
+        return (
+            str(item['item_id']),
+            str(item['code']),
+            str(item['category']),
+            str(item['product']),
+            item.get('size') or '-',
+            format_price(item['price'])
+        )
+
+    def by_code(self, code: str) -> Optional[Dict[str, Any]]:
+        """Ítem activo con ese código (sin distinguir mayúsculas)."""
+        return self._by_code.get(code.strip().lower())
+
+    def __len__(self) -> int:
+        return len(self.items)
@@ -0,0 +1,273 @@
+import gzip
+import json
+import lzma
+import os
+import shutil
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def open_text(path: Path, mode: str = 'r'):
+    """Abre un archivo de texto, comprimido o no, según su extensión (.gz, .xz)."""
+    suffix = Path(path).suffix
+    if suffix == ".gz":
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    if suffix == ".xz":
+        return lzma.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def read_rows(path: Path) -> List[Dict[str, Any]]:
+    """Lee una lista de registros desde un archivo JSON (opcionalmente comprimido)."""
+    try:
+        with open_text(path) as file:
+            return json.load(file)
+    except (json.JSONDecodeError, EOFError, OSError, lzma.LZMAError):
+        return []
+
+
+def as_day(value: Optional[Any]) -> Optional[str]:
+    """Normaliza una fecha/datetime a 'YYYY-MM-DD' para comparar como texto."""
+    if value is None:
+        return None
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10]
+
+
+class PartitionedStore:
+    """
+    Colección JSON particionada por mes según un campo de fecha.
+
+    Cada partición vive en ``<data_dir>/partitions/<nombre>/<YYYY-MM>.json`` y el
+    archivo ``catalog.json`` describe las particiones existentes (cantidad de
+    registros, rango de fechas e IDs máximos). Las lecturas filtradas por fecha
+    solo abren las particiones del rango; las inserciones solo reescriben la
+    partición del mes del registro. Las particiones de meses cerrados (anteriores
+    al mes en curso al momento de leer) se consideran inmutables y se mantienen
+    en caché sin volver a consultar el disco.
+    """
+
+    CATALOG_FILE = "catalog.json"
+    UNDATED_KEY = "sin-fecha"
+
+    def __init__(self, data_dir: str, filename: str, date_field: str):
+        self.filename = filename
+        self.name = Path(filename).stem
+        self.date_field = date_field
+        self.legacy_path = Path(data_dir) / filename
+        self.dir = Path(data_dir) / "partitions" / self.name
+        self._catalog: Optional[Dict[str, Any]] = None
+        self._cache: Dict[str, Tuple[int, List[Dict[str, Any]]]] = {}
+
+    # ------------------------------------------------------------------ #
+    # Catálogo
+    # ------------------------------------------------------------------ #
+    @property
+    def catalog_path(self) -> Path:
+        return self.dir / self.CATALOG_FILE
+
+    def catalog(self) -> Dict[str, Any]:
+        """Devuelve el catálogo de particiones, migrando el archivo plano si hace falta."""
+        if self._catalog is None:
+            if self.catalog_path.exists():
+                self._catalog = read_rows(self.catalog_path) or self._empty_catalog()
+            else:
+                self._catalog = self._empty_catalog()
+                self._migrate_legacy()
+        return self._catalog
+
+    @staticmethod
+    def _empty_catalog() -> Dict[str, Any]:
+        return {"partitions": {}, "max_ids": {}}
+
+    def _save_catalog(self) -> None:
+        os.makedirs(self.dir, exist_ok=True)
+        with open(self.catalog_path, 'w', encoding='utf-8') as file:
+            json.dump(self._catalog, file, indent=2, ensure_ascii=False)
+
+    def _migrate_legacy(self) -> None:
+        """
+        Reparte el archivo plano existente (p. ej. tickets.json) en particiones.
+        Antes de vaciarlo se guarda una copia en ``<archivo>.bak``.
+        """
+        legacy = read_rows(self.legacy_path) if self.legacy_path.exists() else []
+        if not legacy:
+            return
+        if not self.replace_all(legacy):
+            # Sin particiones completas el archivo plano sigue siendo la fuente
+            self._catalog = None
+            return
+        shutil.copy2(self.legacy_path, self.legacy_path.with_name(self.legacy_path.name + ".bak"))
+        # El archivo plano queda vacío para no duplicar registros
+        with open(self.legacy_path, 'w', encoding='utf-8') as file:
+            json.dump([], file)
+
+    def partition_keys(self) -> List[str]:
+        """Lista las claves de partición existentes en orden cronológico."""
+        return sorted(self.catalog()["partitions"])
+
+    def max_id(self, id_field: str) -> int:
+        """Último ID registrado en cualquier partición (0 si no hay registros)."""
+        return self.catalog()["max_ids"].get(id_field, 0)
+
+    def version(self) -> int:
+        """Marca de modificación del catálogo (cambia con cada escritura)."""
+        try:
+            return self.catalog_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    # ------------------------------------------------------------------ #
+    # Particiones
+    # ------------------------------------------------------------------ #
+    def partition_key(self, record: Dict[str, Any]) -> str:
+        """Clave 'YYYY-MM' del registro según su campo de fecha."""
+        value = record.get(self.date_field)
+        text = as_day(value) or ""
+        if len(text) >= 7 and text[4] == "-" and text[:4].isdigit() and text[5:7].isdigit():
+            return text[:7]
+        return self.UNDATED_KEY
+
+    def keys_for_range(self, start: Optional[Any] = None,
+                       end: Optional[Any] = None) -> List[str]:
+        """Claves de partición que pueden contener registros entre start y end."""
+        start_key = as_day(start)[:7] if start else None
+        end_key = as_day(end)[:7] if end else None
+        keys = []
+        for key in self.partition_keys():
+            if key == self.UNDATED_KEY:
+                if start_key is None and end_key is None:
+                    keys.append(key)
+                continue
+            if start_key and key < start_key:
+                continue
+            if end_key and key > end_key:
+                continue
+            keys.append(key)
+        return keys
+
+    def partition_path(self, key: str) -> Path:
+        return self.dir / f"{key}.json"
+
+    def partition_paths(self, start: Optional[Any] = None,
+                        end: Optional[Any] = None) -> List[Path]:
+        """Rutas de las particiones que cubren el rango indicado."""
+        return [self.partition_path(k) for k in self.keys_for_range(start, end)]
+
+    def _is_sealed(self, key: str) -> bool:
+        """Un mes anterior al actual no recibe nuevas inserciones."""
+        return key != self.UNDATED_KEY and key < datetime.now().strftime("%Y-%m")
+
+    def _read_partition(self, key: str) -> List[Dict[str, Any]]:
+        """Lee una partición usando la caché en memoria cuando es válida."""
+        cached = self._cache.get(key)
+        if cached is not None and self._is_sealed(key):
+            return cached[1]
+        path = self.partition_path(key)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        rows = read_rows(path)
+        self._cache[key] = (mtime, rows)
+        return rows
+
+    def _write_partition(self, key: str, rows: List[Dict[str, Any]]) -> None:
+        os.makedirs(self.dir, exist_ok=True)
+        path = self.partition_path(key)
+        if not rows:
+            if path.exists():
+                path.unlink()
+            self._cache.pop(key, None)
+            self._catalog["partitions"].pop(key, None)
+            return
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(rows, file, indent=2, ensure_ascii=False)
+        self._cache[key] = (path.stat().st_mtime_ns, rows)
+        days = [d for d in (as_day(r.get(self.date_field)) for r in rows) if d]
+        self._catalog["partitions"][key] = {
+            "file": path.name,
+            "count": len(rows),
+            "min_date": min(days) if days else None,
+            "max_date": max(days) if days else None
+        }
+
+    def _update_max_ids(self, rows: Iterable[Dict[str, Any]]) -> None:
+        max_ids = self._catalog["max_ids"]
+        for row in rows:
+            for field, value in row.items():
+                if field.endswith("_id") and isinstance(value, int):
+                    if value > max_ids.get(field, 0):
+                        max_ids[field] = value
+
+    # ------------------------------------------------------------------ #
+    # Lectura / escritura
+    # ------------------------------------------------------------------ #
+    def iter_range(self, start: Optional[Any] = None,
+                   end: Optional[Any] = None) -> Iterator[Dict[str, Any]]:
+        """Recorre los registros entre start y end (inclusive) partición por partición."""
+        start_day, end_day = as_day(start), as_day(end)
+        for key in self.keys_for_range(start, end):
+            for row in self._read_partition(key):
+                if start_day or end_day:
+                    day = as_day(row.get(self.date_field))
+                    if day is None:
+                        continue
+                    if start_day and day < start_day:
+                        continue
+                    if end_day and day > end_day:
+                        continue
+                yield dict(row)
+
+    def load_range(self, start: Optional[Any] = None,
+                   end: Optional[Any] = None) -> List[Dict[str, Any]]:
+        """Carga los registros cuyo campo de fecha cae entre start y end."""
+        return list(self.iter_range(start, end))
+
+    def load_all(self) -> List[Dict[str, Any]]:
+        """Carga todos los registros de todas las particiones."""
+        return self.load_range()
+
+    def append(self, records: List[Dict[str, Any]]) -> bool:
+        """Agrega registros reescribiendo solo las particiones de sus meses."""
+        if not records:
+            return True
+        catalog = self.catalog()
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            grouped.setdefault(self.partition_key(record), []).append(record)
+        try:
+            for key, new_rows in grouped.items():
+                rows = list(self._read_partition(key)) if key in catalog["partitions"] else []
+                rows.extend(new_rows)
+                self._write_partition(key, rows)
+            self._update_max_ids(records)
+            self._save_catalog()
+            return True
+        except (IOError, TypeError):
+            return False
+
+    def replace_all(self, records: List[Dict[str, Any]]) -> bool:
+        """
+        Sustituye la colección completa. Solo se reescriben las particiones cuyo
+        contenido cambió, de modo que los meses cerrados no se tocan.
+        """
+        catalog = self.catalog()
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            grouped.setdefault(self.partition_key(record), []).append(record)
+        try:
+            for key in set(catalog["partitions"]) | set(grouped):
+                rows = grouped.get(key, [])
+                if key in catalog["partitions"] and self._read_partition(key) == rows:
+                    continue
+                self._write_partition(key, rows)
+            self._update_max_ids(records)
+            self._save_catalog()
+            return True
+        except (IOError, TypeError):
+            return False
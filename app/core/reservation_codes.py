@@ -0,0 +1,74 @@
+import hashlib
+from typing import Any
+
+from config import Config
+
+# Base 32 de Crockford: sin I, L, O ni U para evitar confusiones al dictar el código
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def normalize_code(code: Any) -> str:
+    """Normaliza un código para compararlo (sin espacios ni guiones, en mayúsculas)."""
+    return str(code or "").strip().replace("-", "").upper()
+
+
+class FeistelCodec:
+    """
+    Biyección entre enteros de ``5 * length`` bits y códigos base 32.
+
+    Una red de Feistel balanceada (dos mitades, ``rounds`` rondas con BLAKE2b
+    con clave como función de ronda) permuta el número de secuencia, así que
+    secuencias distintas dan siempre códigos distintos: no hace falta buscar
+    colisiones ni reintentar. Sin la clave los códigos no revelan el orden
+    ni cuántas reservas hay, y ``decode`` recupera la secuencia.
+    """
+
+    def __init__(self, key: str = Config.RESERVATION_CODE_KEY,
+                 length: int = Config.RESERVATION_CODE_LENGTH, rounds: int = 4):
+        if length % 2:
+            raise ValueError("La longitud del código debe ser par")
+        self.length = length
+        self.bits = 5 * length
+        self.half_bits = self.bits // 2
+        self.mask = (1 << self.half_bits) - 1
+        self.rounds = rounds
+        self.key = key.encode('utf-8')
+
+    def _round(self, value: int, round_number: int) -> int:
+        digest = hashlib.blake2b(
+            value.to_bytes(8, 'big') + bytes([round_number]), key=self.key, digest_size=8
+        ).digest()
+        return int.from_bytes(digest, 'big') & self.mask
+
+    def permute(self, number: int) -> int:
+        if not 0 <= number < 1 << self.bits:
+            raise ValueError(f"Secuencia fuera de rango: {number}")
+        left, right = number >> self.half_bits, number & self.mask
+        for round_number in range(self.rounds):
+            left, right = right, left ^ self._round(right, round_number)
+        return (left << self.half_bits) | right
+
+    def unpermute(self, number: int) -> int:
+        left, right = number >> self.half_bits, number & self.mask
+        for round_number in reversed(range(self.rounds)):
+            left, right = right ^ self._round(left, round_number), left
+        return (left << self.half_bits) | right
+
+    def encode(self, number: int) -> str:
+        """Código de `length` caracteres de la secuencia `number`."""
+        value = self.permute(number)
+        chars = []
+        for _ in range(self.length):
+            value, digit = divmod(value, 32)
+            chars.append(ALPHABET[digit])
+        return "".join(reversed(chars))
+
+    def decode(self, code: str) -> int:
+        """Secuencia de un código generado por ``encode`` (ValueError si no es válido)."""
+        code = normalize_code(code)
+        if len(code) != self.length or any(c not in ALPHABET for c in code):
+            raise ValueError(f"Código inválido: {code}")
+        value = 0
+        for char in code:
+            value = value * 32 + ALPHABET.index(char)
+        return self.unpermute(value)
@@ -0,0 +1,150 @@
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+def fold(text: Any) -> str:
+    """Minúsculas y sin tildes ni diéresis ('José Núñez' -> 'jose nunez')."""
+    text = unicodedata.normalize("NFKD", str(text or "").lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigramas de un texto ya normalizado."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class PrefixSubstringIndex:
+    """
+    Índice de búsqueda por prefijo y por subcadena sobre varios campos.
+
+    - Prefijo: arreglo ordenado de (término, campo, id) recorrido con bisect.
+      Los términos son el valor completo y cada palabra del campo.
+    - Subcadena: postings de trigramas -> ids; los candidatos de la
+      intersección se confirman contra el valor normalizado.
+
+    Implementa la interfaz ``clear/add/discard`` de ``UniqueIndex`` para que
+    ``CollectionIndexes`` lo mantenga al día con las escrituras.
+    """
+
+    def __init__(self, id_field: str, fields: Tuple[str, ...]):
+        self.id_field = id_field
+        self.fields = fields
+        self._terms: List[Tuple[str, str, Any]] = []
+        self._sorted = True
+        self._trigrams: Dict[str, Set[Any]] = {}
+        self._values: Dict[Any, Dict[str, str]] = {}
+        self._records: Dict[Any, Dict[str, Any]] = {}
+
+    def clear(self) -> None:
+        self._terms.clear()
+        self._sorted = True
+        self._trigrams.clear()
+        self._values.clear()
+        self._records.clear()
+
+    def _entries(self, values: Dict[str, str], record_id: Any) -> Set[Tuple[str, str, Any]]:
+        entries = set()
+        for field, value in values.items():
+            if not value:
+                continue
+            entries.add((value, field, record_id))
+            for token in _TOKEN_SPLIT.split(value):
+                if token:
+                    entries.add((token, field, record_id))
+        return entries
+
+    def add(self, record: Dict[str, Any], replace: bool = True) -> None:
+        record_id = record.get(self.id_field)
+        if record_id in self._records:
+            if not replace:
+                return
+            self.discard(self._records[record_id])
+        values = {field: fold(record.get(field)) for field in self.fields}
+        self._records[record_id] = record
+        self._values[record_id] = values
+        entries = self._entries(values, record_id)
+        if self._sorted and self._terms:
+            # Alta individual sobre un arreglo ya ordenado: inserción en su lugar
+            for entry in entries:
+                insort(self._terms, entry)
+        else:
+            # Carga en bloque: se agrega al final y se ordena en la próxima consulta
+            self._terms.extend(entries)
+            self._sorted = False
+        for value in values.values():
+            for gram in trigrams(value):
+                self._trigrams.setdefault(gram, set()).add(record_id)
+
+    def discard(self, record: Dict[str, Any]) -> None:
+        record_id = record.get(self.id_field)
+        values = self._values.pop(record_id, None)
+        if values is None:
+            return
+        self._records.pop(record_id, None)
+        self._ensure_sorted()
+        for entry in self._entries(values, record_id):
+            pos = bisect_left(self._terms, entry)
+            if pos < len(self._terms) and self._terms[pos] == entry:
+                del self._terms[pos]
+        for value in values.values():
+            for gram in trigrams(value):
+                ids = self._trigrams.get(gram)
+                if ids is not None:
+                    ids.discard(record_id)
+                    if not ids:
+                        del self._trigrams[gram]
+
+    def _ensure_sorted(self) -> None:
+        if not self._sorted:
+            self._terms.sort()
+            self._sorted = True
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    # ------------------------------------------------------------------ #
+    # Consultas
+    # ------------------------------------------------------------------ #
+    def prefix_ids(self, prefix: str, field: Optional[str] = None) -> List[Any]:
+        """Ids cuyos términos empiezan por `prefix`, en orden de término."""
+        prefix = fold(prefix).strip()
+        if not prefix:
+            return []
+        self._ensure_sorted()
+        seen, result = set(), []
+        terms = self._terms
+        for pos in range(bisect_left(terms, (prefix,)), len(terms)):
+            term, term_field, record_id = terms[pos]
+            if not term.startswith(prefix):
+                break
+            if (field is None or term_field == field) and record_id not in seen:
+                seen.add(record_id)
+                result.append(record_id)
+        return result
+
+    def substring_ids(self, text: str, field: Optional[str] = None) -> List[Any]:
+        """Ids cuyo valor contiene `text` (mínimo 3 caracteres), ordenados."""
+        text = fold(text).strip()
+        grams = trigrams(text)
+        if not grams:
+            return []
+        postings = sorted((self._trigrams.get(g, set()) for g in grams), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        fields = (field,) if field else self.fields
+        return sorted(rid for rid in candidates if any(text in self._values[rid][f] for f in fields))
+
+    def search(self, query: str, field: Optional[str] = None,
+               offset: int = 0, limit: int = 20) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Coincidencias por prefijo primero y luego por subcadena, paginadas.
+        Devuelve (registros de la página, total de coincidencias).
+        """
+        ids = self.prefix_ids(query, field)
+        seen = set(ids)
+        ids.extend(rid for rid in self.substring_ids(query, field) if rid not in seen)
+        page = ids[offset:offset + limit]
+        return [self._records[rid] for rid in page], len(ids)
@@ -0,0 +1,146 @@
+import math
+import re
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from core.search_index import fold
+
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+
+# Palabras vacías del español que no aportan a la búsqueda
+STOPWORDS = {
+    "a", "al", "con", "de", "del", "el", "en", "es", "la", "las", "lo", "los",
+    "para", "por", "se", "su", "sus", "un", "una", "unos", "unas", "y", "o", "que"
+}
+
+
+def tokenize(text: Any) -> List[str]:
+    """Tokens normalizados (sin tildes, en minúsculas, sin palabras vacías)."""
+    return [t for t in _TOKEN_SPLIT.split(fold(text)) if t and t not in STOPWORDS]
+
+
+class InvertedIndex:
+    """
+    Índice invertido de texto completo con resultados ordenados por relevancia.
+
+    Cada campo tiene un peso; un documento puntúa por cada término de la
+    consulta según frecuencia ponderada por campo e IDF (log(1 + N/df)), y
+    se favorecen los documentos que contienen más términos de la consulta.
+    El último término se busca también como prefijo ("ficc" -> "ficcion")
+    sobre el vocabulario ordenado.
+
+    Implementa ``clear/add/discard`` como ``UniqueIndex`` para mantenerse al
+    día a través de ``CollectionIndexes``.
+    """
+
+    def __init__(self, id_field: str, fields: Dict[str, float]):
+        self.id_field = id_field
+        self.fields = fields
+        self._postings: Dict[str, Dict[Any, float]] = {}
+        self._doc_terms: Dict[Any, Dict[str, float]] = {}
+        self._field_terms: Dict[Any, Dict[str, Set[str]]] = {}
+        self._records: Dict[Any, Dict[str, Any]] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._doc_terms.clear()
+        self._field_terms.clear()
+        self._records.clear()
+        self._vocabulary = []
+        self._vocabulary_dirty = False
+
+    def _weights(self, record: Dict[str, Any]) -> Tuple[Dict[str, float], Dict[str, Set[str]]]:
+        weights: Dict[str, float] = {}
+        field_terms: Dict[str, Set[str]] = {}
+        for field, weight in self.fields.items():
+            tokens = tokenize(record.get(field))
+            field_terms[field] = set(tokens)
+            for token in tokens:
+                weights[token] = weights.get(token, 0.0) + weight
+        return weights, field_terms
+
+    def add(self, record: Dict[str, Any], replace: bool = True) -> None:
+        record_id = record.get(self.id_field)
+        if record_id in self._records:
+            if not replace:
+                return
+            self.discard(self._records[record_id])
+        weights, field_terms = self._weights(record)
+        self._records[record_id] = record
+        self._doc_terms[record_id] = weights
+        self._field_terms[record_id] = field_terms
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._vocabulary_dirty = True
+            postings[record_id] = weight
+
+    def discard(self, record: Dict[str, Any]) -> None:
+        record_id = record.get(self.id_field)
+        weights = self._doc_terms.pop(record_id, None)
+        if weights is None:
+            return
+        self._records.pop(record_id, None)
+        self._field_terms.pop(record_id, None)
+        for term in weights:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(record_id, None)
+                if not postings:
+                    del self._postings[term]
+                    self._vocabulary_dirty = True
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _expand_prefix(self, prefix: str) -> Set[str]:
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        terms = set()
+        for pos in range(bisect_left(self._vocabulary, prefix), len(self._vocabulary)):
+            term = self._vocabulary[pos]
+            if not term.startswith(prefix):
+                break
+            terms.add(term)
+        return terms
+
+    def search(self, query: str, fields: Optional[Tuple[str, ...]] = None,
+               limit: Optional[int] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Devuelve [(registro, puntaje)] de mayor a menor relevancia.
+        Con `fields` solo cuentan los términos que aparecen en esos campos.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        total = len(self._records) or 1
+        scores: Dict[Any, float] = {}
+        matched: Dict[Any, int] = {}
+        for i, token in enumerate(tokens):
+            terms = {token}
+            if i == len(tokens) - 1:
+                terms |= self._expand_prefix(token)
+            best: Dict[Any, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + total / len(postings))
+                for record_id, weight in postings.items():
+                    if fields and not any(term in self._field_terms[record_id].get(f, ()) for f in fields):
+                        continue
+                    best[record_id] = max(best.get(record_id, 0.0), weight * idf)
+            for record_id, score in best.items():
+                scores[record_id] = scores.get(record_id, 0.0) + score
+                matched[record_id] = matched.get(record_id, 0) + 1
+        ranked = sorted(
+            scores,
+            key=lambda rid: (-matched[rid], -scores[rid], str(self._records[rid].get(self.id_field)))
+        )
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(self._records[rid], scores[rid] * matched[rid] / len(tokens)) for rid in ranked]
@@ -0,0 +1,226 @@
+import json
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from config import Config
+from core.search_index import fold
+
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+def word_trigrams(word: str) -> Set[str]:
+    """Trigramas de una palabra normalizada con relleno ('  a', ' av', ..., 'rs ')."""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def words(text: Any) -> List[str]:
+    """Palabras normalizadas (sin tildes y en minúsculas) de un texto."""
+    return [w for w in _TOKEN_SPLIT.split(fold(text)) if w]
+
+
+class TrigramIndex:
+    """
+    Índice de similitud por trigramas para búsquedas tolerantes a errores
+    de escritura ("Avnegers" -> "Avengers", "Rey Leon" -> "El Rey León").
+
+    El vocabulario (palabras de los campos indexados) se comparte entre
+    registros; los postings trigrama -> palabras dan los candidatos de cada
+    palabra de la consulta y su similitud (Jaccard de trigramas) sale del
+    conteo de trigramas comunes, sin recorrer todo el catálogo ni calcular
+    distancias de edición. El puntaje de un registro es el promedio, sobre las
+    palabras de la consulta, de la mejor similitud entre sus palabras.
+
+    Con `path` el índice se guarda en disco junto con la versión del archivo
+    de datos y ``restore`` lo recupera al iniciar si esa versión no cambió.
+    Implementa ``clear/add/discard`` para mantenerse con ``CollectionIndexes``.
+    """
+
+    def __init__(self, id_field: str, fields: Tuple[str, ...],
+                 threshold: float = Config.FUZZY_THRESHOLD, path: Optional[Path] = None):
+        self.id_field = id_field
+        self.fields = fields
+        self.threshold = threshold
+        self.path = Path(path) if path else None
+        # palabra -> {id: campos donde aparece}
+        self._words: Dict[str, Dict[Any, Set[str]]] = {}
+        # trigrama -> palabras; cantidad de trigramas de cada palabra
+        self._grams: Dict[str, Set[str]] = {}
+        self._gram_counts: Dict[str, int] = {}
+        self._record_words: Dict[Any, Set[str]] = {}
+        self._records: Dict[Any, Dict[str, Any]] = {}
+
+    @property
+    def persistent(self) -> bool:
+        return self.path is not None
+
+    def clear(self) -> None:
+        self._words.clear()
+        self._grams.clear()
+        self._gram_counts.clear()
+        self._record_words.clear()
+        self._records.clear()
+
+    def _add_word(self, word: str, record_id: Any, field: str) -> None:
+        owners = self._words.get(word)
+        if owners is None:
+            owners = self._words[word] = {}
+            grams = word_trigrams(word)
+            self._gram_counts[word] = len(grams)
+            for gram in grams:
+                self._grams.setdefault(gram, set()).add(word)
+        owners.setdefault(record_id, set()).add(field)
+
+    def _drop_word(self, word: str, record_id: Any) -> None:
+        owners = self._words.get(word)
+        if owners is None:
+            return
+        owners.pop(record_id, None)
+        if owners:
+            return
+        del self._words[word]
+        del self._gram_counts[word]
+        for gram in word_trigrams(word):
+            vocabulary = self._grams.get(gram)
+            if vocabulary is not None:
+                vocabulary.discard(word)
+                if not vocabulary:
+                    del self._grams[gram]
+
+    def add(self, record: Dict[str, Any], replace: bool = True) -> None:
+        record_id = record.get(self.id_field)
+        if record_id in self._records:
+            if not replace:
+                return
+            self.discard(self._records[record_id])
+        self._records[record_id] = record
+        record_words = self._record_words[record_id] = set()
+        for field in self.fields:
+            for word in words(record.get(field)):
+                self._add_word(word, record_id, field)
+                record_words.add(word)
+
+    def discard(self, record: Dict[str, Any]) -> None:
+        record_id = record.get(self.id_field)
+        record_words = self._record_words.pop(record_id, None)
+        if record_words is None:
+            return
+        self._records.pop(record_id, None)
+        for word in record_words:
+            self._drop_word(word, record_id)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    # ------------------------------------------------------------------ #
+    # Consultas
+    # ------------------------------------------------------------------ #
+    def similar_words(self, word: str) -> Dict[str, float]:
+        """Palabras del vocabulario con su similitud de trigramas respecto a `word`."""
+        grams = word_trigrams(word)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._grams.get(gram, ()))
+        return {
+            candidate: common / (len(grams) + self._gram_counts[candidate] - common)
+            for candidate, common in shared.items()
+        }
+
+    def search(self, query: str, fields: Optional[Tuple[str, ...]] = None,
+               threshold: Optional[float] = None,
+               limit: Optional[int] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Devuelve [(registro, similitud)] con similitud >= `threshold`
+        (por defecto el del índice), de la más a la menos parecida.
+        Con `fields` solo cuentan las palabras de esos campos.
+        """
+        query_words = words(query)
+        if not query_words:
+            return []
+        threshold = self.threshold if threshold is None else threshold
+        totals: Dict[Any, float] = {}
+        for word in query_words:
+            best: Dict[Any, float] = {}
+            for candidate, similarity in self.similar_words(word).items():
+                for record_id, found_in in self._words[candidate].items():
+                    if fields and found_in.isdisjoint(fields):
+                        continue
+                    if similarity > best.get(record_id, 0.0):
+                        best[record_id] = similarity
+            for record_id, similarity in best.items():
+                totals[record_id] = totals.get(record_id, 0.0) + similarity
+        scored = [
+            (record_id, total / len(query_words))
+            for record_id, total in totals.items()
+            if total / len(query_words) >= threshold
+        ]
+        scored.sort(key=lambda item: (-item[1], str(item[0])))
+        if limit is not None:
+            scored = scored[:limit]
+        return [(self._records[record_id], score) for record_id, score in scored]
+
+    # ------------------------------------------------------------------ #
+    # Persistencia
+    # ------------------------------------------------------------------ #
+    def persist(self, version: Any) -> bool:
+        """Guarda el índice precalculado junto con la versión de los datos."""
+        if self.path is None:
+            return False
+        payload = {
+            "version": list(version),
+            "fields": list(self.fields),
+            "words": {
+                word: [[record_id, sorted(found_in)] for record_id, found_in in owners.items()]
+                for word, owners in self._words.items()
+            },
+            "grams": {gram: sorted(vocabulary) for gram, vocabulary in self._grams.items()}
+        }
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            os.makedirs(self.path.parent, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump(payload, file, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            return True
+        except (IOError, TypeError):
+            return False
+
+    def restore(self, records: List[Dict[str, Any]], version: Any) -> bool:
+        """
+        Carga el índice guardado si corresponde a `version` y a los mismos
+        campos; devuelve False (índice vacío) si hay que reconstruirlo.
+        """
+        self.clear()
+        if self.path is None:
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                payload = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        if payload.get("version") != list(version) or payload.get("fields") != list(self.fields):
+            return False
+        by_id: Dict[Any, Dict[str, Any]] = {}
+        for record in records:
+            # Con IDs heredados duplicados gana el primero, como en ``add``
+            by_id.setdefault(record.get(self.id_field), record)
+        for word, owners in payload["words"].items():
+            self._words[word] = {}
+            for record_id, found_in in owners:
+                if record_id not in by_id:
+                    self.clear()
+                    return False
+                self._words[word][record_id] = set(found_in)
+                self._record_words.setdefault(record_id, set()).add(word)
+        for gram, vocabulary in payload["grams"].items():
+            self._grams[gram] = set(vocabulary)
+            for word in vocabulary:
+                self._gram_counts[word] = self._gram_counts.get(word, 0) + 1
+        for record_id in by_id:
+            # Registros sin palabras indexadas (campos vacíos) también cuentan
+            self._record_words.setdefault(record_id, set())
+            self._records[record_id] = by_id[record_id]
+        return True
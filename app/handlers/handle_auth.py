@@ -26,11 +26,11 @@ def handle_auth(app):
         app.console.print("[red]Opción inválida[/]")
 
     if choice == "1":
-        username, password = app.login_view.show_login()
-        if username in (None, "volver") or password in (None, "volver"):
+        # La vista verifica la contraseña e inicia la sesión (una sola verificación)
+        user = app.login_view.show_login()
+        if user in (None, "volver"):
             app.menu_view.show_message("Acción cancelada.")
             return
-        user = app.auth_service.login(username, password)
         if user:
             msg = f"Bienvenido, {'Administrador ' if user['is_admin'] else ''}{user['name']}!"
             app.console.print(f"[green]{msg}[/]")
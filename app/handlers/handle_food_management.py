@@ -4,7 +4,7 @@ def handle_food_management(self):
         # Asegurémonos de que la opción sea válida, incluso si el usuario presiona Enter sin ingresar nada
         choice = self.food_view.show_food_menu(is_admin=True).strip()
         # Verificamos que la opción no esté vacía y que sea válida
-        if choice in ["1", "2", "3", "4", "5", "0"]:
+        if choice in ["1", "2", "3", "4", "5", "6", "0"]:
             if choice == "1":  # Listar items
                 items = self.food_controller.list_food_items()
                 self.food_view.show_food_items(items)
@@ -73,6 +73,22 @@ def handle_food_management(self):
                 else:
                     self.menu_view.show_message("Error al desactivar el ítem", is_error=True)
                 self.menu_view.press_enter_to_continue()
+            elif choice == "6":  # Inventario y reposición
+                self.food_view.show_inventory(self.food_controller.inventory())
+                item_id_input = self.console.input(
+                    "Ingrese ID del ítem a reponer (Enter para volver): "
+                ).strip()
+                if item_id_input:
+                    quantity_input = self.console.input("Cantidad a reponer: ").strip()
+                    if not item_id_input.isdigit() or not quantity_input.isdigit():
+                        self.menu_view.show_message("ID y cantidad deben ser números.", is_error=True)
+                    else:
+                        try:
+                            total = self.food_controller.restock(int(item_id_input), int(quantity_input))
+                            self.menu_view.show_message(f"Existencias actualizadas: {total}")
+                        except ValueError as e:
+                            self.menu_view.show_message(str(e), is_error=True)
+                self.menu_view.press_enter_to_continue()
             elif choice == "0":  # Volver al menú principal
                 break  # Salir del ciclo y volver al menú principal
             
@@ -1,3 +1,5 @@
+from services.schedule_generator import ScheduleGenerator
+
 def handle_movie_management(self):
     """Maneja la gestión de películas (admin)."""
     while True:
@@ -65,5 +67,27 @@ def handle_movie_management(self):
                 self.menu_view.show_message("Error al desactivar la película", is_error=True)
             self.menu_view.press_enter_to_continue()
         
+        elif choice == "6":  # Generar programación
+            params = self.movie_view.ask_schedule_params()
+            if params is None:
+                continue
+            movies = self.movie_controller.list_movies()
+            generator = ScheduleGenerator(self.showtime_controller)
+            schedule = generator.generate(
+                movies, self.cinema_controller.list_cinemas(),
+                params["start_date"], params["days"]
+            )
+            if not schedule:
+                self.menu_view.show_message("No hay franjas libres para programar", is_error=True)
+            else:
+                self.movie_view.show_schedule_summary(schedule, movies)
+                if self.menu_view.confirm_action("¿Guardar la programación?"):
+                    try:
+                        created = self.showtime_controller.create_showtimes_bulk(schedule)
+                        self.menu_view.show_message(f"{len(created)} funciones creadas con éxito!")
+                    except (ValueError, IOError) as e:
+                        self.menu_view.show_message(str(e), is_error=True)
+            self.menu_view.press_enter_to_continue()
+        
         elif choice == "0": #Volver al menu principal
             return
\ No newline at end of file
@@ -11,6 +11,26 @@ def handle_reports(app):
         if choice == "0":
             return
 
+        if choice == "6":
+            # Cierre de caja: un solo día, por defecto hoy
+            day = rv.ask_date("Día a cerrar") or datetime.now().date()
+            if rc.closes.get_close(day) and not mv.confirm_action(
+                    "El día ya está cerrado. ¿Volver a cerrarlo?"):
+                continue
+            try:
+                close = rc.close_day(day, rv.ask_counted_cash(), force=True)
+            except ValueError as e:
+                mv.show_message(str(e), is_error=True)
+                continue
+            rv.show_cash_close(close)
+            mv.press_enter_to_continue()
+            continue
+
+        # Rankings: se elige qué ordenar antes del rango de fechas
+        leaderboard = rv.ask_leaderboard() if choice == "5" else None
+        if choice == "5" and not leaderboard:
+            continue
+
         # Pedimos rango de fechas
         start = rv.ask_date("Fecha inicial")
         end   = rv.ask_date("Fecha final")
@@ -27,4 +47,22 @@ def handle_reports(app):
             data = rc.sales_by_user(start, end)
             rv.show_sales_by_user(data)
 
+        elif choice == "4":
+            data = rc.occupancy_by_showtime(start, end)
+            rv.show_occupancy(data)
+            showtime_id = rv.ask_showtime_detail()
+            row = next((r for r in data if r["showtime_id"] == showtime_id), None)
+            if row:
+                rv.show_occupancy_detail(row)
+
+        elif choice == "5":
+            top = {
+                "movies": rc.top_movies,
+                "users": rc.top_users,
+                "showtimes": rc.top_showtimes,
+                "food": rc.top_food_items
+            }[leaderboard["kind"]]
+            data = top(leaderboard["n"], start, end, bottom=leaderboard["bottom"])
+            rv.show_leaderboard(leaderboard["kind"], data, leaderboard["bottom"])
+
         mv.press_enter_to_continue()
\ No newline at end of file
@@ -1,3 +1,8 @@
+from datetime import datetime, timedelta
+
+from services.ticket_service import TicketService
+from utils.date_utils import safe_parse_datetime
+
 def handle_reservation(self):
     """Maneja el proceso completo de reservación, incluyendo selección de varios asientos."""
     choice = self.reservation_view.show_reservation_menu()
@@ -49,7 +54,7 @@ def handle_reservation(self):
             
             try:
                 # 5. Calcular precio y generar resumen
-                user = self.user_controller.get_user_by_id(self.current_user['user_id'])
+                user = self.auth_service.session.user
                 birth_date = datetime.strptime(user['birth_date'], "%Y-%m-%d").date()
                 dt = safe_parse_datetime(
                     selected_showtime['date'],
@@ -153,19 +158,39 @@ def handle_reservation(self):
             self.menu_view.press_enter_to_continue()
             return
         
-        reservation_id = self.reservation_view.select_reservation_to_convert([
+        reservation_ids = self.reservation_view.select_reservation_to_convert([
             {**r, 'movie_title': self.movie_controller.get_movie_by_id(r['movie_id'])['title']} 
             for r in active_reservations
         ])
         
-        if reservation_id:
+        if reservation_ids:
+            # Un solo cobro para todo el lote
+            by_id = {r['reservation_id']: r for r in active_reservations}
+            total = sum(by_id[i]['price'] for i in set(reservation_ids) if i in by_id)
+            payment_method = self.ticket_view.get_payment_method()
+            cash_received = None
+            if payment_method == "1" and total > 0:
+                cash_received = self.ticket_view.get_cash_amount(total)
             try:
-                ticket = self.reservation_controller.convert_reservation_to_ticket(reservation_id)
-                if ticket:
-                    self.menu_view.show_message("✅ Reserva convertida a ticket con éxito!")
+                results = self.reservation_controller.convert_reservations(
+                    reservation_ids,
+                    payment_method=payment_method,
+                    user_id=self.current_user['user_id'],
+                    cash_received=cash_received
+                )
+                self.reservation_view.show_conversion_results(results)
+                converted = [r for r in results if r['ok']]
+                if converted:
+                    if cash_received is not None:
+                        self.ticket_view.show_change(
+                            sum(r['ticket']['price'] for r in converted), cash_received
+                        )
+                    self.menu_view.show_message(
+                        f"✅ {len(converted)} reserva(s) convertida(s) a ticket con éxito!"
+                    )
                 else:
-                    self.menu_view.show_message("Error al convertir la reserva", is_error=True)
+                    self.menu_view.show_message("No se pudo convertir ninguna reserva", is_error=True)
             except Exception as e:
                 self.menu_view.show_message(f"Error: {str(e)}", is_error=True)
         
-        self.menu_view.press_enter_to_continue() 
\ No newline at end of file
+        self.menu_view.press_enter_to_continue()
@@ -1,3 +1,12 @@
+import uuid
+from datetime import datetime
+
+from services.ticket_service import TicketService
+from utils.date_utils import safe_parse_datetime
+
+# Intentos de registrar la orden (misma clave de cobro) antes de anularla
+CHECKOUT_ATTEMPTS = 2
+
 def handle_ticket_purchase(self):
     """Maneja el proceso de compra de tickets con múltiples asientos."""
     choice = self.ticket_view.show_ticket_menu()
@@ -46,9 +55,10 @@ def handle_ticket_purchase(self):
                 ):
                     self.menu_view.show_message("Error al reservar el asiento", is_error=True)
                     return
+            stock_token = None
             try:
                 # 8. Calcular precio
-                user = self.user_controller.get_user_by_id(self.current_user['user_id'])
+                user = self.auth_service.session.user
                 birth_date = datetime.strptime(user['birth_date'], "%Y-%m-%d").date()
                 dt = safe_parse_datetime(
                     selected_showtime['date'],
@@ -60,46 +70,76 @@ def handle_ticket_purchase(self):
                     birth_date=birth_date,
                     showtime=dt
                 )
-                total_price = price_per_ticket * qty
+                base_price = max(TicketService.get_base_price(movie['room_type'], purchase_data['seat_type']),
+                                 price_per_ticket)
+                ticket_lines = [
+                    {
+                        'movie_id': purchase_data['movie_id'],
+                        'showtime': dt,
+                        'seat_number': seat,
+                        'ticket_type': purchase_data['seat_type'],
+                        'base_price': base_price,
+                        'price': price_per_ticket
+                    }
+                    for seat in seats
+                ]
                 # 9. Mostrar resumen
                 ticket_summary = {
                     'movie_title': movie['title'],
                     'showtime': dt.strftime("%Y-%m-%d %H:%M"),
                     'seat_number': ", ".join(seats),
                     'ticket_type': purchase_data['seat_type'],
-                    'price': total_price
+                    'price': price_per_ticket * qty
                 }
                 self.ticket_view.show_ticket_summary(ticket_summary)
-                # 10. Confirmación
+                # 10. Comida opcional en la misma orden
+                food_items = []
+                if self.menu_view.confirm_action("¿Desea agregar comida a su compra?"):
+                    food_items = self.food_view.select_food_items(self.food_controller.menu_snapshot())
+                    # Aparta las existencias mientras se confirma la compra
+                    stock_token = self.food_controller.reserve_stock(food_items)
+                quote = self.order_controller.quote(ticket_lines, food_items)
+                if food_items:
+                    self.food_view.show_order_summary(food_items, quote['food_total'])
+                total_price = quote['total']
+                self.menu_view.show_message(
+                    f"Total de la compra: ${total_price:,.0f}"
+                    + (f" (descuento ${quote['discount']:,.0f})" if quote['discount'] else "")
+                )
+                # 11. Confirmación
                 if not self.menu_view.confirm_action("Confirmar compra?"):
                     raise Exception("Compra cancelada por el usuario")
-                # 11. Procesar pago
+                # 12. Procesar pago
                 payment_method = self.ticket_view.get_payment_method()
+                cash = None
                 if payment_method == "1":  # Efectivo
                     cash = self.ticket_view.get_cash_amount(total_price)
                     self.ticket_view.show_change(total_price, cash)
-                # 12. Crear tickets y pagos
-                created_tickets = []
-                for seat in seats:
-                    ticket_data = {
-                        'user_id': self.current_user['user_id'],
-                        'movie_id': purchase_data['movie_id'],
-                        'showtime': dt,
-                        'seat_number': seat,
-                        'ticket_type': purchase_data['seat_type'],
-                        'price': price_per_ticket
-                    }
-                    new_ticket = self.ticket_controller.create_ticket(**ticket_data)
-                    created_tickets.append(new_ticket)
-                    # Un pago POR CADA ticket
-                    pay = self.payment_controller.create_payment(
-                        user_id=self.current_user['user_id'],
-                        amount=price_per_ticket,
-                        payment_method=payment_method,
-                        ticket_id=new_ticket['ticket_id']
-                    )
+                # 13. Registrar la orden (tickets, comida y pagos en un solo registro).
+                # Un reintento con la misma clave de cobro no vuelve a cobrar.
+                checkout_key = uuid.uuid4().hex
+                for attempt in range(1, CHECKOUT_ATTEMPTS + 1):
+                    try:
+                        order = self.order_controller.create_order(
+                            user_id=self.current_user['user_id'],
+                            tickets=ticket_lines,
+                            payment_method=payment_method,
+                            food_items=food_items,
+                            idempotency_key=checkout_key,
+                            cash_received=cash
+                        )
+                        break
+                    except IOError:
+                        if attempt == CHECKOUT_ATTEMPTS:
+                            # Sin orden no hay compra: se anulan los pagos y tickets escritos
+                            self.order_controller.cancel_checkout(checkout_key)
+                            raise
+                if stock_token is not None:
+                    self.food_controller.commit_stock(stock_token)
+                    stock_token = None
+                for pay in order['payment_records']:
                     self.payment_view.show_payment_summary(pay)
-                # 13. Confirmar asiento definitivo
+                # 14. Confirmar asiento definitivo
                 for seat in seats:
                     self.cinema_controller.confirm_reservation(
                         selected_showtime['cinema_id'],
@@ -108,6 +148,8 @@ def handle_ticket_purchase(self):
                     )
                 self.menu_view.show_message("✅ Compra realizada con éxito!")
             except Exception as e:
+                if stock_token is not None:
+                    self.food_controller.release_stock(stock_token)
                 # Liberar todos los asientos temporales
                 for seat in seats:
                     self.cinema_controller.release_seat(
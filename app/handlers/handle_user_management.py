@@ -26,12 +26,20 @@ def handle_user_management(self):
                 else:
                     self.menu_view.show_message("Usuario no encontrado", is_error=True)
             else:
-                users = [u for u in self.user_controller.list_users(active_only=False) 
-                        if criteria['name'].lower() in u['name'].lower()]
-                if users:
-                    self.user_view.show_users(users)
-                else:
-                    self.menu_view.show_message("No se encontraron usuarios", is_error=True)
+                # Búsqueda indexada por prefijo/subcadena, paginada
+                query = criteria.get('name') or criteria.get('text')
+                field = 'name' if 'name' in criteria else None
+                page, page_size = 0, 20
+                while True:
+                    users, total = self.user_controller.search_users(
+                        query, field, offset=page * page_size, limit=page_size
+                    )
+                    if not total:
+                        self.menu_view.show_message("No se encontraron usuarios", is_error=True)
+                        break
+                    if not self.user_view.show_users_page(users, page, total, page_size):
+                        break
+                    page += 1
             self.menu_view.press_enter_to_continue()
         
         elif choice == "3":  # Crear usuario
@@ -49,7 +57,7 @@ def handle_user_management(self):
                     name=user_data['name'],
                     email=user_data['email'],
                     birth_date=user_data['birth_date'],
-                    password=user_data['password'],
+                    password=self.auth_service.hash_password(user_data['password']),
                     is_admin=user_data['is_admin']
                 )
                 self.menu_view.show_message("Usuario creado con éxito!")
@@ -87,7 +95,12 @@ def handle_user_management(self):
                 # usuario canceló
                 continue
 
-            updated = self.user_controller.update_user(user_id, **user_data)
+            try:
+                updated = self.user_controller.update_user(user_id, **user_data)
+            except ValueError as e:
+                self.menu_view.show_message(str(e), is_error=True)
+                self.menu_view.press_enter_to_continue()
+                continue
             if updated:
                 self.menu_view.show_message("Usuario actualizado con éxito!")
             else:
@@ -116,5 +129,27 @@ def handle_user_management(self):
                 
             self.menu_view.press_enter_to_continue()
         
+        elif choice == "6":  # Importar usuarios
+            path = self.user_view.ask_file_path("Archivo a importar")
+            if not path:
+                continue
+            try:
+                result = self.user_import_service.import_users(path)
+                self.user_view.show_import_result(result)
+            except (OSError, ValueError) as e:
+                self.menu_view.show_message(f"Error al importar: {e}", is_error=True)
+            self.menu_view.press_enter_to_continue()
+        
+        elif choice == "7":  # Exportar usuarios
+            path = self.user_view.ask_file_path("Archivo de destino")
+            if not path:
+                continue
+            try:
+                count = self.user_import_service.export_users(path)
+                self.menu_view.show_message(f"{count} usuarios exportados a {path}")
+            except (OSError, ValueError) as e:
+                self.menu_view.show_message(f"Error al exportar: {e}", is_error=True)
+            self.menu_view.press_enter_to_continue()
+        
         elif choice == "0": #Volver al menu principal
             return
\ No newline at end of file
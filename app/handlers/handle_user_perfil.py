@@ -1,5 +1,4 @@
 import pwinput
-import hashlib
 def handle_user_perfil(self):
     """Maneja la gestión de perfil de usuario."""
     while True:
@@ -10,7 +9,7 @@ def handle_user_perfil(self):
             return
         
         user_id = self.current_user['user_id']
-        current = self.user_controller.get_user_by_id(user_id)
+        current = self.auth_service.session.user
         if not current:
             self.menu_view.show_message("No se encontró su perfil", is_error=True)
             return
@@ -31,11 +30,16 @@ def handle_user_perfil(self):
                 # Usuario canceló con 'volver'
                 continue
 
-            updated = self.user_controller.update_user(user_id, **user_data)
+            try:
+                updated = self.user_controller.update_user(user_id, **user_data)
+            except ValueError as e:
+                self.menu_view.show_message(f"❌ {e}", is_error=True)
+                self.menu_view.press_enter_to_continue()
+                continue
             if updated:
                 self.menu_view.show_message("✅ Perfil actualizado con éxito!")
-                # Refrescar current_user en memoria
-                self.current_user = self.user_controller.get_user_by_id(user_id)
+                # La sesión detecta la modificación y recarga el perfil
+                self.current_user = self.auth_service.session.user
             else:
                 self.menu_view.show_message("❌ Error al actualizar el perfil", is_error=True)
             self.menu_view.press_enter_to_continue()
@@ -61,7 +65,7 @@ def handle_user_perfil(self):
                 continue
 
             # 3.3 Actualizar la contraseña (almacenamos el hash)
-            hashed = hashlib.sha256(new_pw.encode()).hexdigest()
+            hashed = self.auth_service.hash_password(new_pw)
             updated = self.user_controller.update_user(user_id, password=hashed)
             if updated:
                 self.menu_view.show_message("✅ Contraseña cambiada con éxito")
@@ -5,43 +5,23 @@ from rich.console import Console
 from config import Config
 
 # Core
-from core.database import Database
+from core.container import AppContainer
 from core.initial_data import create_initial_data
 
-# Servicios
-from services.auth_service import AuthService
-from services.validation_service import ValidationService
-
-# Controladores
-from controllers.user_controller import UserController
-from controllers.movie_controller import MovieController
-from controllers.cinema_controller import CinemaController
-from controllers.food_controller import FoodController
-from controllers.ticket_controller import TicketController
-from controllers.reservation_controller import ReservationController
-from controllers.payment_controller import PaymentController
-from controllers.showtime_controller import ShowtimeController
-from controllers.report_controller import ReportController
-
-# Vistas
-from views.menu_view import MenuView
-from views.login_view import LoginView
-from views.user_view import UserView
-from views.movie_view import MovieView
-from views.ticket_view import TicketView
-from views.reservation_view import ReservationView
-from views.payment_view import PaymentView
-from views.food_view import FoodView
-from views.availability_view import AvailabilityView
-from views.report_view import ReportView
-
 # Handlers
 from handlers.handle_auth import handle_auth
 from handlers.handle_main_menu import handle_main_menu
 
 
 class DDSMovieApp:
-    """Clase principal de la aplicación."""
+    """
+    Clase principal de la aplicación.
+
+    Los controladores, servicios y vistas salen de un ``AppContainer``: se
+    construyen una sola vez, al primer uso, y comparten la misma base de
+    datos. ``app.<componente>`` (p. ej. ``app.ticket_view``) se resuelve en
+    el contenedor, así que los handlers no cambian.
+    """
     
     def __init__(self):
         # Consola y estado
@@ -52,40 +32,39 @@ class DDSMovieApp:
         
         # Setup inicial: directorios y base de datos
         Config.initialize_directories()
-        self.db = Database(str(Config.DATA_DIR))
+        self.container = AppContainer(Config.DATA_DIR)
         if not any(Config.get_data_file_path(k).exists() for k in Config.DATA_FILES):
             self.db.initialize_database(create_initial_data())
         
-        # Servicios
-        self.auth_service = AuthService(self.db)
-        self.validation_service = ValidationService()
-        
-        # Controladores
-        self.user_controller        = UserController(self.db)
-        self.movie_controller       = MovieController(self.db)
-        self.cinema_controller      = CinemaController(self.db)
-        self.food_controller        = FoodController(self.db)
-        self.ticket_controller      = TicketController(self.db)
-        self.reservation_controller = ReservationController(self.db)
-        self.payment_controller     = PaymentController(self.db)
-        self.showtime_controller    = ShowtimeController(self.db)
-        self.report_controller      = ReportController(self.db)
+        # Compactación programada
+        self.archive_service.run_if_due()
         
-        # Vistas
-        self.menu_view        = MenuView()
-        self.login_view       = LoginView()
-        self.user_view        = UserView()
-        self.movie_view       = MovieView()
-        self.ticket_view      = TicketView()
-        self.reservation_view = ReservationView()
-        self.payment_view     = PaymentView()
-        self.food_view        = FoodView()
-        self.availability_view= AvailabilityView()
-        self.report_view      = ReportView()
+        # Índices únicos de usuarios (username, email) construidos en bloque
+        self.user_controller.rebuild_indexes()
+        # Índices de búsqueda de la cartelera y del menú (los de trigramas se
+        # restauran desde data/indexes si los datos no cambiaron)
+        self.movie_controller.rebuild_indexes()
+        self.food_controller.rebuild_indexes()
+        # Calendario de funciones por fecha
+        self.showtime_controller.rebuild_indexes()
+        # Reservas: cola de vencimientos e índice de códigos armados con una lectura;
+        # el programador libera los asientos de las vencidas
+        self.reservation_controller.rebuild_indexes()
+        self.reservation_expiry.run()
+    
+    def __getattr__(self, name: str):
+        # Solo se llama si el atributo no existe en la instancia
+        if name == "container":
+            raise AttributeError(name)
+        return getattr(self.container, name)
     
     def run(self):
         """Método principal que inicia la aplicación."""
         while self.running:
+            # Compactación programada: solo actúa cuando vence el intervalo
+            self.archive_service.run_if_due()
+            # Reservas vencidas: solo actúa si la más próxima ya venció
+            self.reservation_expiry.run_if_due()
             # Si no está autenticado → handler de auth
             if not self.auth_service.is_authenticated():
                 handle_auth(self)
@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class Order:
+    """
+    Clase que representa una compra completa: entradas, comida y pagos.
+
+    Attributes:
+        order_id (int): Identificador único de la orden.
+        user_id (int): ID del usuario que compró.
+        items (List[Dict]): Líneas de la compra. Las de tipo 'ticket' traen
+            ticket_id, movie_id, showtime, seat_number, ticket_type,
+            base_price y price; las de tipo 'food' traen item_id, code,
+            product, quantity, unit_price y subtotal.
+        subtotal (float): Suma de las líneas antes de descuentos.
+        discount (float): Descuento total aplicado.
+        total (float): Monto pagado (subtotal - discount).
+        payments (List[Dict]): Pagos de la orden (payment_id, ticket_id, amount, payment_method).
+        status (str): Estado de la orden (activo/inactivo).
+        created_at (str): Fecha de la compra en formato ISO.
+    """
+
+    def __init__(self, order_id: int, user_id: int, items: List[Dict],
+                    subtotal: float, discount: float, total: float,
+                    payments: List[Dict], status: str = "activo",
+                    created_at: Optional[str] = None):
+        self.order_id = order_id
+        self.user_id = user_id
+        self.items = items
+        self.subtotal = subtotal
+        self.discount = discount
+        self.total = total
+        self.payments = payments
+        self.status = status
+        self.created_at = created_at or datetime.now().isoformat()
+
+    def to_dict(self) -> dict:
+        """Convierte el objeto Order a un diccionario."""
+        return {
+            "order_id": self.order_id,
+            "user_id": self.user_id,
+            "items": self.items,
+            "subtotal": self.subtotal,
+            "discount": self.discount,
+            "total": self.total,
+            "payments": self.payments,
+            "status": self.status,
+            "created_at": self.created_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Order':
+        """Crea un objeto Order desde un diccionario."""
+        return cls(
+            order_id=data["order_id"],
+            user_id=data["user_id"],
+            items=data.get("items", []),
+            subtotal=data["subtotal"],
+            discount=data.get("discount", 0),
+            total=data["total"],
+            payments=data.get("payments", []),
+            status=data.get("status", "activo"),
+            created_at=data.get("created_at")
+        )
@@ -13,11 +13,27 @@ class Payment:
         payment_method (str): Método de pago (efectivo, tarjeta, transferencia).
         status (str): Estado del pago (activo/inactivo).
         payment_date (str): Fecha del pago en formato ISO.
+        order_id (Optional[int]): ID de la orden pagada (si aplica).
+        idempotency_key (Optional[str]): Clave del cobro; reintentarlo con la
+            misma clave no genera pagos nuevos.
+        operator_id (Optional[int]): ID de quien registró el cobro (la caja).
+        cash_received (Optional[float]): Efectivo recibido por este pago.
+        change_given (Optional[float]): Cambio devuelto por este pago.
+        cancelled_at (Optional[str]): Fecha ISO de la cancelación (día de la devolución).
+        voided_at (Optional[str]): Fecha ISO de la anulación de un cobro que no
+            llegó a completarse (no es venta ni devolución).
     """
     
     def __init__(self, payment_id: int, user_id: int, amount: float, 
                 payment_method: str, ticket_id: Optional[int] = None, 
-                status: str = "activo", payment_date: Optional[str] = None):
+                status: str = "activo", payment_date: Optional[str] = None,
+                order_id: Optional[int] = None,
+                idempotency_key: Optional[str] = None,
+                operator_id: Optional[int] = None,
+                cash_received: Optional[float] = None,
+                change_given: Optional[float] = None,
+                cancelled_at: Optional[str] = None,
+                voided_at: Optional[str] = None):
         self.payment_id = payment_id
         self.user_id = user_id
         self.ticket_id = ticket_id
@@ -25,6 +41,13 @@ class Payment:
         self.payment_method = payment_method
         self.status = status
         self.payment_date = payment_date or datetime.now().isoformat()
+        self.order_id = order_id
+        self.idempotency_key = idempotency_key
+        self.operator_id = operator_id
+        self.cash_received = cash_received
+        self.change_given = change_given
+        self.cancelled_at = cancelled_at
+        self.voided_at = voided_at
     
     def to_dict(self) -> dict:
         """Convierte el objeto Payment a un diccionario."""
@@ -35,7 +58,14 @@ class Payment:
             "amount": self.amount,
             "payment_method": self.payment_method,
             "status": self.status,
-            "payment_date": self.payment_date
+            "payment_date": self.payment_date,
+            "order_id": self.order_id,
+            "idempotency_key": self.idempotency_key,
+            "operator_id": self.operator_id,
+            "cash_received": self.cash_received,
+            "change_given": self.change_given,
+            "cancelled_at": self.cancelled_at,
+            "voided_at": self.voided_at
         }
     
     @classmethod
@@ -48,5 +78,12 @@ class Payment:
             amount=data["amount"],
             payment_method=data["payment_method"],
             status=data.get("status", "activo"),
-            payment_date=data.get("payment_date")
+            payment_date=data.get("payment_date"),
+            order_id=data.get("order_id"),
+            idempotency_key=data.get("idempotency_key"),
+            operator_id=data.get("operator_id"),
+            cash_received=data.get("cash_received"),
+            change_given=data.get("change_given"),
+            cancelled_at=data.get("cancelled_at"),
+            voided_at=data.get("voided_at")
         )
\ No newline at end of file
@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import Optional
+
+class Refund:
+    """
+    Clase que representa la devolución de un pago cancelado.
+
+    Se guarda en refunds.json, particionado por el día de la devolución, para
+    que el cierre de caja de un día lea solo las devoluciones de ese día
+    aunque los pagos sean de días anteriores (o ya estén archivados).
+
+    Attributes:
+        refund_id (int): Identificador único de la devolución.
+        payment_id (int): ID del pago devuelto.
+        user_id (int): ID del usuario del pago.
+        operator_id (Optional[int]): ID de la caja que registró el pago.
+        amount (float): Monto devuelto.
+        payment_method (str): Método del pago devuelto.
+        payment_date (str): Fecha ISO del pago devuelto.
+        refunded_at (str): Fecha ISO de la devolución.
+    """
+
+    def __init__(self, refund_id: int, payment_id: int, user_id: int, amount: float,
+                 payment_method: str, payment_date: str,
+                 operator_id: Optional[int] = None, refunded_at: Optional[str] = None):
+        self.refund_id = refund_id
+        self.payment_id = payment_id
+        self.user_id = user_id
+        self.operator_id = operator_id
+        self.amount = amount
+        self.payment_method = payment_method
+        self.payment_date = payment_date
+        self.refunded_at = refunded_at or datetime.now().isoformat()
+
+    def to_dict(self) -> dict:
+        """Convierte el objeto Refund a un diccionario."""
+        return {
+            "refund_id": self.refund_id,
+            "payment_id": self.payment_id,
+            "user_id": self.user_id,
+            "operator_id": self.operator_id,
+            "amount": self.amount,
+            "payment_method": self.payment_method,
+            "payment_date": self.payment_date,
+            "refunded_at": self.refunded_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Refund':
+        """Crea un objeto Refund desde un diccionario."""
+        return cls(
+            refund_id=data["refund_id"],
+            payment_id=data["payment_id"],
+            user_id=data["user_id"],
+            amount=data["amount"],
+            payment_method=data["payment_method"],
+            payment_date=data["payment_date"],
+            operator_id=data.get("operator_id"),
+            refunded_at=data.get("refunded_at")
+        )
@@ -1,4 +1,6 @@
-from datetime import datetime
+import random
+import string
+from datetime import datetime, timedelta
 from typing import Optional
 
 class Reservation:
@@ -23,7 +25,7 @@ class Reservation:
         self.status = status
         self.reservation_code = reservation_code or self._generate_code()
         self.created_at = created_at or datetime.now().isoformat()
-        self.expiration_date = expiration_date or (datetime.now() + datetime.timedelta(hours=24)).isoformat()
+        self.expiration_date = expiration_date or (datetime.now() + timedelta(hours=24)).isoformat()
         self.cancelled_at = cancelled_at
         
         # Maneja cualquier parámetro adicional (como showtime_id)
@@ -31,9 +33,7 @@ class Reservation:
             setattr(self, key, value)
 
     def _generate_code(self) -> str:
-        """Genera un código de reserva único."""
-        import random
-        import string
+        """Código aleatorio para reservas creadas sin código (el controlador asigna uno único)."""
         return ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
 
     def to_dict(self) -> dict:
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 
 class Ticket:
     """
@@ -13,11 +14,14 @@ class Ticket:
         ticket_type (str): Tipo de ticket (general/preferencial).
         price (float): Precio pagado.
         status (str): Estado del ticket (activo/inactivo).
+        order_id (Optional[int]): ID de la orden que lo incluye (si aplica).
+        reservation_id (Optional[int]): ID de la reserva convertida en el ticket (si aplica).
     """
     
     def __init__(self, ticket_id: int, user_id: int, movie_id: int, 
                     showtime: datetime, seat_number: str, ticket_type: str, 
-                    price: float, status: str = "activo"):
+                    price: float, status: str = "activo", order_id: Optional[int] = None,
+                    reservation_id: Optional[int] = None):
         self.ticket_id = ticket_id
         self.user_id = user_id
         self.movie_id = movie_id
@@ -26,6 +30,8 @@ class Ticket:
         self.ticket_type = ticket_type
         self.price = price
         self.status = status
+        self.order_id = order_id
+        self.reservation_id = reservation_id
     
     def to_dict(self) -> dict:
         """Convierte el objeto Ticket a un diccionario."""
@@ -37,7 +43,9 @@ class Ticket:
             "seat_number": self.seat_number,
             "ticket_type": self.ticket_type,
             "price": self.price,
-            "status": self.status
+            "status": self.status,
+            "order_id": self.order_id,
+            "reservation_id": self.reservation_id
         }
     
     @classmethod
@@ -51,5 +59,7 @@ class Ticket:
             seat_number=data["seat_number"],
             ticket_type=data["ticket_type"],
             price=data["price"],
-            status=data.get("status", "activo")
+            status=data.get("status", "activo"),
+            order_id=data.get("order_id"),
+            reservation_id=data.get("reservation_id")
         )
\ No newline at end of file
@@ -0,0 +1,113 @@
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from core.archive_store import ArchiveStore
+from core.database import Database
+from core.partitioned_store import as_day, read_rows
+
+class ArchiveService:
+    """
+    Compacta los archivos activos moviendo registros muertos al archivo histórico.
+
+    Se archivan los registros con estado distinto de 'activo' (tickets, pagos,
+    reservas y órdenes canceladas) y los registros cuya función o pago es más
+    antiguo que ``Config.ARCHIVE_RETENTION_DAYS``. Los reportes los siguen
+    consultando con ``Database.load_range(..., include_archive=True)``.
+
+    Las colecciones maestras (``Config.MASTER_FILES``: películas, menú y
+    usuarios) nunca se archivan: un usuario o película desactivados siguen
+    reservando su nombre de usuario, correo e ID. Si una versión anterior los
+    archivó, ``restore_masters`` los devuelve al archivo activo.
+    """
+
+    STATE_FILE = "state.json"
+
+    def __init__(self, db: Database, retention_days: int = Config.ARCHIVE_RETENTION_DAYS,
+                 interval_hours: int = Config.ARCHIVE_INTERVAL_HOURS):
+        self.db = db
+        self.retention_days = retention_days
+        self.interval_hours = interval_hours
+        self.state_path = Path(db.data_dir) / "archive" / self.STATE_FILE
+        self._last_run: Optional[datetime] = None
+        self._state_loaded = False
+
+    def split(self, filename: str, records: List[Dict],
+              now: Optional[datetime] = None) -> Tuple[List[Dict], List[Dict]]:
+        """Separa los registros en (archivables, activos) según las reglas de la colección."""
+        date_field = self.db.archives[filename].date_field
+        cutoff = as_day((now or datetime.now()) - timedelta(days=self.retention_days))
+        archived, remaining = [], []
+        for record in records:
+            if record.get('status', 'activo') != 'activo':
+                archived.append(record)
+            elif date_field and (as_day(record.get(date_field)) or cutoff) < cutoff:
+                archived.append(record)
+            else:
+                remaining.append(record)
+        return archived, remaining
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Ejecuta la compactación de todas las colecciones y devuelve lo archivado por archivo."""
+        now = now or datetime.now()
+        self.restore_masters()
+        summary = {}
+        for filename in self.db.archives:
+            archived, remaining = self.split(filename, self.db.load_data(filename), now)
+            if archived and self.db.archive_records(filename, archived, remaining):
+                summary[filename] = len(archived)
+        self._save_state(now)
+        return summary
+
+    def restore_masters(self) -> Dict[str, int]:
+        """
+        Devuelve al archivo activo los registros maestros archivados por versiones
+        anteriores (los que no estén ya por ID) y renombra su carpeta a
+        ``<nombre>.restored-<fecha>``. Devuelve lo restaurado por archivo.
+        """
+        restored = {}
+        for filename, id_field in Config.MASTER_FILES.items():
+            store = ArchiveStore(self.db.data_dir, filename)
+            if not store.catalog_path.exists():
+                continue
+            live = self.db.load_data(filename)
+            known = {record.get(id_field) for record in live}
+            missing = [r for r in store.load_range() if r.get(id_field) not in known]
+            if missing:
+                live.extend(missing)
+                live.sort(key=lambda r: r.get(id_field) or 0)
+                if not self.db.save_data(filename, live):
+                    continue
+            stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+            store.dir.rename(store.dir.with_name(f"{store.dir.name}.restored-{stamp}"))
+            restored[filename] = len(missing)
+        return restored
+
+    def last_run(self) -> Optional[datetime]:
+        """Fecha de la última compactación registrada (se lee del disco una sola vez)."""
+        if not self._state_loaded:
+            state = read_rows(self.state_path) if self.state_path.exists() else None
+            if state and state.get('last_run'):
+                self._last_run = datetime.fromisoformat(state['last_run'])
+            self._state_loaded = True
+        return self._last_run
+
+    def is_due(self, now: Optional[datetime] = None) -> bool:
+        """Indica si ya pasó el intervalo configurado desde la última compactación."""
+        last = self.last_run()
+        now = now or datetime.now()
+        return last is None or now - last >= timedelta(hours=self.interval_hours)
+
+    def run_if_due(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Ejecuta la compactación solo si corresponde según la programación."""
+        if not self.is_due(now):
+            return {}
+        return self.run(now)
+
+    def _save_state(self, now: datetime) -> None:
+        self._last_run, self._state_loaded = now, True
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path, 'w', encoding='utf-8') as file:
+            json.dump({'last_run': now.isoformat()}, file, indent=2)
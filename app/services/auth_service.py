@@ -1,20 +1,26 @@
-import hashlib
 from datetime import datetime
 from typing import Optional, Dict
 from core.database import Database
 from models.user import Admin
 from controllers.user_controller import UserController
+from services.session import Session
 
 class AuthService:
     """Servicio para manejar autenticación y autorización de usuarios."""
     
-    def __init__(self, db: Database):
-        self.user_controller = UserController(db)
-        self.current_user = None
+    def __init__(self, db: Database, user_controller: Optional[UserController] = None):
+        # Se comparte el controlador de la aplicación para no duplicar sus índices
+        self.user_controller = user_controller or UserController(db)
+        self.session = Session(self.user_controller)
+    
+    @property
+    def current_user(self) -> Optional[Dict]:
+        """Perfil del usuario autenticado (en caché en la sesión)."""
+        return self.session.user
     
     def hash_password(self, password: str) -> str:
-        """Encripta una contraseña usando SHA-256."""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Cifra una contraseña con sal y el algoritmo configurado."""
+        return self.user_controller.hasher.hash(password)
     
     def register_user(self, username: str, identification: str, name: str, 
                         email: str, birth_date: datetime, password: str, 
@@ -33,28 +39,23 @@ class AuthService:
     
     def login(self, username: str, password: str) -> Optional[Dict]:
         """Autentica a un usuario y establece la sesión actual."""
-        hashed_password = self.hash_password(password)
-        user = self.user_controller.authenticate(username, hashed_password)
+        user = self.user_controller.authenticate(username, password)
         if user:
-            self.current_user = user
+            self.session.start(user)
             return user
         return None
     
     def logout(self) -> None:
         """Cierra la sesión del usuario actual."""
-        self.current_user = None
+        self.session.end()
     
     def is_authenticated(self) -> bool:
         """Verifica si hay un usuario autenticado."""
-        return self.current_user is not None
+        return self.session.is_authenticated
     
     def is_admin(self) -> bool:
         """Verifica si el usuario actual es administrador."""
-        if not self.is_authenticated():
-            return False
-        
-        user_data = self.user_controller.get_user_by_id(self.current_user['user_id'])
-        return user_data.get('is_admin', False) if user_data else False
+        return self.session.is_admin
     
     def get_current_user(self) -> Optional[Dict]:
         """Obtiene los datos del usuario actual."""
@@ -0,0 +1,134 @@
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from controllers.payment_controller import PAYMENT_METHODS
+from core.database import Database
+from core.partitioned_store import as_day
+from services.report_aggregation import (
+    PartitionAggregator, close_partial, merge_nested, range_tasks
+)
+
+CASH_METHOD = PAYMENT_METHODS['1']
+
+
+class CashCloseService:
+    """
+    Cierre de caja diario.
+
+    Recorre una sola vez los pagos y las devoluciones del día (solo las
+    particiones o segmentos archivados que contienen ese día) y guarda en
+    cash_closes.json un registro compacto: bruto (pagos del día),
+    devoluciones (refunds.json, particionado por el día de la devolución,
+    aunque los pagos sean anteriores) y neto, por método y por operador,
+    con el efectivo esperado, el que indica el flujo recibido/cambio y la
+    diferencia. Los reportes usan estos registros en lugar de volver a leer
+    los pagos de los días cerrados.
+
+    Como cada devolución pertenece al día en que se hizo, una cancelación
+    posterior no cambia el cierre de un día anterior aunque se vuelva a
+    cerrar con ``force=True``; aparece en el cierre del día de la cancelación.
+    Los cobros anulados porque la operación no se completó (``voided_at``)
+    no cuentan ni como venta ni como devolución.
+    """
+
+    def __init__(self, db: Database, aggregator: Optional[PartitionAggregator] = None):
+        self.db = db
+        self.aggregator = aggregator or PartitionAggregator()
+        self.closes_file = "cash_closes.json"
+        self.payments_file = "payments.json"
+        self.refunds_file = "refunds.json"
+
+    def close_day(self, day: date, counted_cash: Optional[float] = None,
+                  force: bool = False) -> Dict:
+        """
+        Cierra el día y devuelve su registro. `counted_cash` es el efectivo
+        contado en caja (opcional). Lanza ValueError si el día es futuro o ya
+        está cerrado (salvo con `force`).
+        """
+        day_key = as_day(day)
+        if day_key > as_day(date.today()):
+            raise ValueError(f"No se puede cerrar un día futuro: {day_key}")
+        closes = self.db.load_data(self.closes_file)
+        if not force and any(c['day'] == day_key for c in closes):
+            raise ValueError(f"El día {day_key} ya está cerrado")
+
+        # Las devoluciones se guardan por día de devolución: basta con leer el día
+        tasks = [
+            task
+            for filename in (self.payments_file, self.refunds_file)
+            for task in range_tasks(self.db, filename, day, day, (CASH_METHOD, day_key))
+        ]
+        totals = merge_nested(self.aggregator.map(close_partial, tasks))
+        record = self._close_record(day_key, totals, counted_cash)
+
+        closes = [c for c in closes if c['day'] != day_key] + [record]
+        closes.sort(key=lambda c: c['day'])
+        if not self.db.save_data(self.closes_file, closes):
+            raise IOError("No se pudo guardar el cierre de caja")
+        return record
+
+    @staticmethod
+    def _close_record(day_key: str, totals: Dict[str, Any],
+                      counted_cash: Optional[float]) -> Dict:
+        def money(value: float) -> float:
+            return round(value, 2)
+
+        methods = {
+            name: {
+                'count': m['count'],
+                'gross': money(m['gross']),
+                'refunds': money(m['refunds']),
+                'net': money(m['gross'] - m['refunds'])
+            }
+            for name, m in sorted(totals.get('methods', {}).items())
+        }
+        operators = {}
+        for operator_id, o in sorted(totals.get('operators', {}).items()):
+            operators[operator_id] = {
+                'count': o['count'],
+                'gross': money(o['gross']),
+                'refunds': money(o['refunds']),
+                'net': money(o['gross'] - o['refunds']),
+                # Efectivo que debería quedar en caja por las ventas del día
+                'cash_expected': money(o['cash_sales'] - o['cash_refunds']),
+                # Recibido - cambio según el flujo de cobro (pagos con efectivo registrado)
+                'cash_in': money(o['cash_in']),
+                'cash_untracked': money(o['cash_untracked']),
+                'discrepancy': money(o['cash_in'] - o['cash_tracked'])
+            }
+        gross = totals.get('gross', 0.0)
+        refunds = totals.get('refunds', 0.0)
+        cash_expected = money(sum(o['cash_expected'] for o in operators.values()))
+        return {
+            'day': day_key,
+            'closed_at': datetime.now().isoformat(),
+            'payments': totals.get('count', 0),
+            'gross': money(gross),
+            'refunds': money(refunds),
+            'net': money(gross - refunds),
+            'methods': methods,
+            'operators': operators,
+            'cash_expected': cash_expected,
+            'discrepancy': money(sum(o['discrepancy'] for o in operators.values())),
+            'counted_cash': counted_cash,
+            'counted_difference': (money(counted_cash - cash_expected)
+                                   if counted_cash is not None else None)
+        }
+
+    def get_close(self, day: date) -> Optional[Dict]:
+        """Registro de cierre del día (None si no se ha cerrado)."""
+        day_key = as_day(day)
+        return next((c for c in self.db.load_data(self.closes_file) if c['day'] == day_key), None)
+
+    def closes_between(self, start: Optional[date] = None,
+                       end: Optional[date] = None) -> Dict[str, Dict]:
+        """Cierres entre start y end (inclusive): 'YYYY-MM-DD' -> registro."""
+        start_key, end_key = as_day(start), as_day(end)
+        return {
+            c['day']: c for c in self.db.load_data(self.closes_file)
+            if (not start_key or c['day'] >= start_key) and (not end_key or c['day'] <= end_key)
+        }
+
+    def list_closes(self) -> List[Dict]:
+        """Todos los cierres, del más antiguo al más reciente."""
+        return self.db.load_data(self.closes_file)
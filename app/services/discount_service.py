@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import List, Dict
 
 # importando el servicio de precios de entradas
-from app.services.ticket_service import TicketService
+from services.ticket_service import TicketService
 
 class DiscountService:
     """Servicio para aplicar descuentos y promociones."""
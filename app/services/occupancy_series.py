@@ -0,0 +1,126 @@
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Tipos de evento y su efecto sobre (vendidos, reservados, retenidos)
+SALE = (1, 0, 0)
+RESERVE = (0, 1, 1)
+RELEASE = (0, 0, -1)
+
+ShowtimeKey = Tuple[int, str]
+
+
+def _stamp(value: Any) -> Optional[str]:
+    """Normaliza una marca de tiempo a 'YYYY-MM-DD HH:MM:SS' para ordenar como texto."""
+    if not value:
+        return None
+    return str(value).replace("T", " ")[:19]
+
+
+def showtime_key(movie_id: Any, showtime: Any) -> ShowtimeKey:
+    """Clave (película, 'YYYY-MM-DD HH:MM') con la que tickets y reservas apuntan a una función."""
+    return (movie_id, (_stamp(showtime) or "")[:16])
+
+
+def _events(tickets: Iterable[Dict], reservations: Iterable[Dict],
+            payments: Iterable[Dict], now: str) -> Tuple[List[Tuple], Dict[ShowtimeKey, int]]:
+    """
+    Eventos (clave, instante, efecto) de todas las funciones. La venta de un
+    ticket activo se fecha con su pago (los tickets cancelados no cuentan como
+    vendidos); las reservas suman al crearse y liberan la
+    retención al cancelarse, al convertirse en ticket (``converted_at``) o al
+    vencer antes de la función (con ``expired_at`` si el vencimiento ya se
+    procesó).
+    """
+    paid_at = {}
+    for p in payments:
+        if p.get("ticket_id") is not None and p.get("status", "activo") == "activo":
+            stamp = _stamp(p.get("payment_date"))
+            if stamp and (p["ticket_id"] not in paid_at or stamp < paid_at[p["ticket_id"]]):
+                paid_at[p["ticket_id"]] = stamp
+
+    events, untimed = [], {}
+    for t in tickets:
+        if t.get("status", "activo") != "activo":
+            continue
+        key = showtime_key(t.get("movie_id"), t.get("showtime"))
+        stamp = paid_at.get(t.get("ticket_id"))
+        if stamp is None:
+            untimed[key] = untimed.get(key, 0) + 1
+        else:
+            events.append((key, stamp, SALE))
+
+    for r in reservations:
+        key = showtime_key(r.get("movie_id"), r.get("showtime"))
+        created = _stamp(r.get("created_at"))
+        if created is None:
+            continue
+        events.append((key, created, RESERVE))
+        released = _stamp(r.get("cancelled_at") or r.get("converted_at") or r.get("expired_at"))
+        if released is None and r.get("status", "activo") == "activo":
+            expires = _stamp(r.get("expiration_date"))
+            if expires and expires < min(now, key[1] + ":00"):
+                released = expires
+        if released:
+            events.append((key, max(released, created), RELEASE))
+    return events, untimed
+
+
+def build_occupancy_series(showtimes: List[Dict], tickets: Iterable[Dict],
+                           reservations: Iterable[Dict], payments: Iterable[Dict],
+                           now: str) -> List[Dict]:
+    """
+    Serie temporal acumulada de vendidos, reservados y retenidos por función.
+
+    Todos los eventos se ordenan una sola vez por (función, instante) y se
+    recorren en una pasada, acumulando los contadores de cada función.
+    """
+    by_key = {
+        showtime_key(st["movie_id"], f"{st['date']} {st['start_time']}"): st
+        for st in showtimes
+    }
+    events, untimed = _events(tickets, reservations, payments, _stamp(now))
+    events = [e for e in events if e[0] in by_key]
+    events.sort(key=lambda e: (e[0], e[1]))
+
+    series: Dict[ShowtimeKey, List[Dict]] = {}
+    for key, group in groupby(events, key=lambda e: e[0]):
+        sold, reserved, holds = untimed.get(key, 0), 0, 0
+        points = []
+        for _, stamp, (d_sold, d_reserved, d_holds) in group:
+            sold += d_sold
+            reserved += d_reserved
+            holds += d_holds
+            if points and points[-1]["time"] == stamp:
+                points[-1].update(sold=sold, reserved=reserved, holds=holds)
+            else:
+                points.append({"time": stamp, "sold": sold, "reserved": reserved, "holds": holds})
+        series[key] = points
+
+    result = []
+    for key, st in sorted(by_key.items(), key=lambda item: (item[0][1], item[0][0])):
+        points = series.get(key, [])
+        last = points[-1] if points else {"sold": untimed.get(key, 0), "reserved": 0, "holds": 0}
+        result.append({
+            "showtime_id": st["showtime_id"],
+            "movie_id": st["movie_id"],
+            "cinema_id": st.get("cinema_id"),
+            "showtime": key[1],
+            "capacity": sum(st.get("available_seats", {}).values()),
+            "sold": last["sold"],
+            "reserved": last["reserved"],
+            "holds": last["holds"],
+            "untimed_sales": untimed.get(key, 0),
+            "points": points
+        })
+    return result
+
+
+def downsample(points: List[Dict], max_points: int) -> List[Dict]:
+    """
+    Reduce una serie acumulada a como máximo `max_points` puntos tomando el
+    último de cada tramo (en una serie acumulada es el valor representativo).
+    """
+    if max_points <= 0 or len(points) <= max_points:
+        return list(points)
+    step = len(points) / max_points
+    return [points[min(len(points) - 1, int((i + 1) * step) - 1)] for i in range(max_points)]
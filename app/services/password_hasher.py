@@ -0,0 +1,211 @@
+import base64
+import hashlib
+import hmac
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from config import Config
+
+LEGACY_SHA256_LENGTH = 64
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+
+class PasswordHasher:
+    """
+    Cifrado de contraseñas con sal por usuario y costo configurable.
+
+    El resultado guarda algoritmo, parámetros y sal junto al hash, así que cada
+    usuario conserva los parámetros con los que se cifró su contraseña:
+
+        scrypt$n=16384,r=8,p=1$<sal>$<hash>
+        pbkdf2_sha256$i=600000$<sal>$<hash>
+
+    Los hashes heredados (SHA-256 sin sal, 64 caracteres hex) se siguen
+    aceptando y ``needs_rehash`` indica que deben recifrarse al iniciar sesión.
+    Las derivaciones de hashlib liberan el GIL, por lo que ``hash_many`` (la
+    importación masiva) las reparte en un pool de hilos.
+    """
+
+    ALGORITHMS = ('scrypt', 'pbkdf2_sha256')
+    SALT_BYTES = 16
+    KEY_BYTES = 32
+
+    def __init__(self, algorithm: str = Config.PASSWORD_HASH_ALGORITHM,
+                 params: Optional[Dict[str, int]] = None,
+                 workers: int = Config.PASSWORD_HASH_WORKERS):
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Algoritmo de contraseña no soportado: {algorithm}")
+        if algorithm == 'scrypt' and not hasattr(hashlib, 'scrypt'):
+            # OpenSSL sin scrypt: se usa PBKDF2, disponible siempre
+            algorithm = 'pbkdf2_sha256'
+            params = None
+        self.algorithm = algorithm
+        self.params = dict(params or Config.PASSWORD_HASH_PARAMS[algorithm])
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # ------------------------------------------------------------------ #
+    # Derivación
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _encode_params(params: Dict[str, int]) -> str:
+        return ",".join(f"{k}={v}" for k, v in params.items())
+
+    @staticmethod
+    def _decode_params(text: str) -> Dict[str, int]:
+        return {k: int(v) for k, v in (item.split("=") for item in text.split(","))}
+
+    def _derive(self, algorithm: str, params: Dict[str, int], password: str, salt: bytes) -> bytes:
+        data = password.encode('utf-8')
+        if algorithm == 'scrypt':
+            n, r, p = params['n'], params['r'], params['p']
+            return hashlib.scrypt(data, salt=salt, n=n, r=r, p=p,
+                                  maxmem=256 * r * n * p + 1024 * 1024, dklen=self.KEY_BYTES)
+        return hashlib.pbkdf2_hmac('sha256', data, salt, params['i'], dklen=self.KEY_BYTES)
+
+    def hash(self, password: str) -> str:
+        """Cifra una contraseña con sal nueva y los parámetros actuales."""
+        salt = os.urandom(self.SALT_BYTES)
+        key = self._derive(self.algorithm, self.params, password, salt)
+        return f"{self.algorithm}${self._encode_params(self.params)}${_b64(salt)}${_b64(key)}"
+
+    @staticmethod
+    def is_legacy(encoded: str) -> bool:
+        """Hash SHA-256 sin sal del esquema anterior (64 caracteres hexadecimales)."""
+        return (len(encoded) == LEGACY_SHA256_LENGTH
+                and all(c in "0123456789abcdefABCDEF" for c in encoded))
+
+    @staticmethod
+    def _params_in_bounds(algorithm: str, params: Dict[str, int]) -> bool:
+        """Parámetros completos, positivos y sin superar ``Config.PASSWORD_HASH_MAX_PARAMS``."""
+        limits = Config.PASSWORD_HASH_MAX_PARAMS[algorithm]
+        if set(params) != set(limits):
+            return False
+        if any(not 1 <= params[name] <= limit for name, limit in limits.items()):
+            return False
+        # scrypt exige que n sea una potencia de 2 mayor que 1
+        return algorithm != 'scrypt' or (params['n'] > 1 and params['n'] & (params['n'] - 1) == 0)
+
+    def is_valid_hash(self, encoded: Optional[str]) -> bool:
+        """
+        Indica si el texto tiene el formato de un hash reconocido (nuevo o
+        heredado en minúsculas) con parámetros dentro de los límites.
+        """
+        if not encoded:
+            return False
+        if self.is_legacy(encoded):
+            return encoded == encoded.lower()
+        parts = encoded.split("$")
+        if len(parts) != 4 or parts[0] not in self.ALGORITHMS:
+            return False
+        algorithm, params, salt, key = parts
+        try:
+            decoded = self._decode_params(params)
+            salt_bytes, key_bytes = _unb64(salt), _unb64(key)
+        except (ValueError, TypeError):
+            return False
+        return (self._params_in_bounds(algorithm, decoded) and bool(salt_bytes)
+                and len(key_bytes) == self.KEY_BYTES)
+
+    def verify(self, password: str, encoded: Optional[str]) -> bool:
+        """Comprueba una contraseña contra su hash (nuevo o heredado) en tiempo constante."""
+        if not encoded or password is None:
+            return False
+        if self.is_legacy(encoded):
+            candidate = hashlib.sha256(password.encode()).hexdigest()
+            return hmac.compare_digest(candidate, encoded)
+        try:
+            algorithm, params, salt, key = encoded.split("$")
+            if algorithm not in self.ALGORITHMS:
+                return False
+            derived = self._derive(algorithm, self._decode_params(params), password, _unb64(salt))
+        except (ValueError, KeyError):
+            return False
+        return hmac.compare_digest(derived, _unb64(key))
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """Indica si el hash es heredado o usa parámetros distintos de los actuales."""
+        if self.is_legacy(encoded):
+            return True
+        parts = encoded.split("$")
+        if len(parts) != 4:
+            return True
+        try:
+            return parts[0] != self.algorithm or self._decode_params(parts[1]) != self.params
+        except ValueError:
+            return True
+
+    # ------------------------------------------------------------------ #
+    # Pool de trabajo
+    # ------------------------------------------------------------------ #
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max(1, self.workers),
+                                                thread_name_prefix="password-hasher")
+        return self._executor
+
+    def hash_many(self, passwords: Iterable[str]) -> List[str]:
+        """Cifra varias contraseñas en paralelo conservando el orden."""
+        passwords = list(passwords)
+        if self.workers <= 1 or len(passwords) < 2:
+            return [self.hash(p) for p in passwords]
+        return list(self.executor.map(self.hash, passwords))
+
+    # ------------------------------------------------------------------ #
+    # Calibración
+    # ------------------------------------------------------------------ #
+    def benchmark(self, params: Dict[str, int], rounds: int = 3) -> float:
+        """Milisegundos promedio de una derivación con los parámetros dados."""
+        salt = os.urandom(self.SALT_BYTES)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            self._derive(self.algorithm, params, "benchmark-password", salt)
+        return (time.perf_counter() - start) * 1000 / rounds
+
+    def calibrate(self, target_ms: float = Config.PASSWORD_HASH_TARGET_MS) -> Dict[str, int]:
+        """
+        Duplica el costo (n en scrypt, iteraciones en PBKDF2) mientras una
+        derivación tarde menos que `target_ms`, y devuelve los mayores parámetros
+        que respetan el objetivo (como mínimo los más bajos probados).
+        """
+        if self.algorithm == 'scrypt':
+            params, field, cap = {'n': 2 ** 12, 'r': 8, 'p': 1}, 'n', 2 ** 20
+        else:
+            params, field, cap = {'i': 50000}, 'i', 10 ** 7
+        best = dict(params)
+        while params[field] <= cap:
+            if self.benchmark(params) > target_ms:
+                return best
+            best = dict(params)
+            params[field] *= 2
+        return best
+
+
+_default_hasher: Optional[PasswordHasher] = None
+
+
+def get_hasher() -> PasswordHasher:
+    """Hasher compartido por la aplicación (un único pool de hilos)."""
+    global _default_hasher
+    if _default_hasher is None:
+        _default_hasher = PasswordHasher()
+    return _default_hasher
+
+
+if __name__ == "__main__":
+    # Uso: python -m services.password_hasher  → sugiere parámetros para Config
+    for name in PasswordHasher.ALGORITHMS:
+        hasher = PasswordHasher(name)
+        best = hasher.calibrate()
+        print(f"{hasher.algorithm}: {best} -> {hasher.benchmark(best):.0f} ms "
+              f"(objetivo {Config.PASSWORD_HASH_TARGET_MS} ms)")
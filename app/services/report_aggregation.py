@@ -0,0 +1,291 @@
+import atexit
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from config import Config
+from core.database import Database
+from core.partitioned_store import as_day, read_rows
+
+# Mapa de unión (p. ej. ticket_id -> movie_id) disponible en cada proceso trabajador
+_JOIN: Dict[Any, Any] = {}
+
+
+def _init_worker(join: Optional[Dict[Any, Any]]) -> None:
+    """Fija el mapa de unión compartido del proceso actual."""
+    global _JOIN
+    _JOIN = join or {}
+
+
+def _run_chunk(func: Callable[..., Any], tasks: List[Tuple],
+               join: Optional[Dict[Any, Any]]) -> List[Any]:
+    """Ejecuta un bloque de tareas con el mapa de unión indicado y restaura el anterior."""
+    previous = dict(_JOIN)
+    _init_worker(join)
+    try:
+        return [func(*task) for task in tasks]
+    finally:
+        _init_worker(previous)
+
+
+def _rows_in_range(path: str, date_field: Optional[str],
+                   start: Optional[str], end: Optional[str]) -> Iterable[Dict]:
+    """Lee una partición/segmento y filtra por rango de fechas (inclusive)."""
+    for row in read_rows(Path(path)):
+        if date_field and (start or end):
+            day = as_day(row.get(date_field))
+            if day is None or (start and day < start) or (end and day > end):
+                continue
+        yield row
+
+
+def range_tasks(db: Database, filename: str, start: Any, end: Any,
+                args: Tuple = ()) -> List[Tuple]:
+    """Una tarea (ruta, campo_fecha, inicio, fin, *args) por partición o segmento del rango."""
+    date_field = db.date_field(filename)
+    return [
+        (path, date_field, as_day(start), as_day(end), *args)
+        for path in db.source_paths(filename, start, end, include_archive=True)
+    ]
+
+
+# ---------------------------------------------------------------------- #
+# Agregaciones parciales (se ejecutan en los procesos trabajadores)
+# ---------------------------------------------------------------------- #
+def sum_partial(path: str, date_field: Optional[str], start: Optional[str],
+                end: Optional[str], amount_field: str,
+                status: Optional[str] = None,
+                skip_days: Optional[FrozenSet[str]] = None) -> Dict[str, float]:
+    """
+    Suma y conteo de `amount_field` en una partición (opcionalmente por estado),
+    sin los registros de los días de `skip_days` (p. ej. días ya cerrados) ni
+    los anulados (``voided_at``).
+    """
+    total, count = 0.0, 0
+    for row in _rows_in_range(path, date_field, start, end):
+        if status and row.get("status") != status:
+            continue
+        if row.get("voided_at"):
+            continue
+        if skip_days and as_day(row.get(date_field)) in skip_days:
+            continue
+        total += row.get(amount_field, 0) or 0
+        count += 1
+    return {"total": total, "count": count}
+
+
+def map_partial(path: str, key_field: str, *value_fields: str) -> Dict[Any, Any]:
+    """
+    Mapa key_field -> value_field de una partición (p. ej. ticket_id -> movie_id).
+    Con varios campos de valor el mapa devuelve tuplas.
+    """
+    if len(value_fields) == 1:
+        field = value_fields[0]
+        return {row[key_field]: row.get(field) for row in read_rows(Path(path)) if key_field in row}
+    return {
+        row[key_field]: tuple(row.get(field) for field in value_fields)
+        for row in read_rows(Path(path)) if key_field in row
+    }
+
+
+def grouped_sum_partial(path: str, date_field: Optional[str], start: Optional[str],
+                        end: Optional[str], join_field: str,
+                        amount_field: str) -> Dict[Any, float]:
+    """Suma `amount_field` agrupando por el valor del mapa de unión para `join_field`."""
+    sums: Dict[Any, float] = {}
+    for row in _rows_in_range(path, date_field, start, end):
+        group = _JOIN.get(row.get(join_field))
+        if group:
+            sums[group] = sums.get(group, 0.0) + (row.get(amount_field, 0) or 0)
+    return sums
+
+
+def close_partial(path: str, date_field: Optional[str], start: Optional[str],
+                  end: Optional[str], cash_method: str, day: str) -> Dict[str, Any]:
+    """
+    Totales de cierre de caja del día `day` en una sola pasada por una
+    partición de pagos o de devoluciones (refunds.json): bruto (pagos con
+    fecha de pago ese día, en cualquier estado), devoluciones (filas de
+    refunds.json del día, sin importar cuándo se hizo el pago), por método y
+    por operador, con el flujo de efectivo (recibido - cambio) de los pagos
+    del día en `cash_method`. Los pagos cancelados sin ``cancelled_at``
+    (anteriores al registro de devoluciones) se devuelven el día del pago.
+    Los pagos anulados (``voided_at``) no cuentan.
+    """
+    totals: Dict[str, Any] = {"count": 0, "gross": 0.0, "refunds": 0.0,
+                              "methods": {}, "operators": {}}
+    for row in _rows_in_range(path, date_field, start, end):
+        if row.get("voided_at"):
+            continue
+        if "refund_id" in row:
+            sold, refunded = False, as_day(row.get(date_field)) == day
+        else:
+            sold = as_day(row.get(date_field)) == day
+            refunded = (sold and row.get("status", "activo") != "activo"
+                        and not row.get("cancelled_at"))
+        if not sold and not refunded:
+            continue
+        amount = row.get("amount", 0) or 0
+        sale = amount if sold else 0.0
+        refund = amount if refunded else 0.0
+        totals["count"] += sold
+        totals["gross"] += sale
+        totals["refunds"] += refund
+        method = totals["methods"].setdefault(
+            row.get("payment_method", "Desconocido"), {"count": 0, "gross": 0.0, "refunds": 0.0})
+        method["count"] += sold
+        method["gross"] += sale
+        method["refunds"] += refund
+        operator_id = row.get("operator_id")
+        operator = totals["operators"].setdefault(
+            str(operator_id if operator_id is not None else row.get("user_id")),
+            {"count": 0, "gross": 0.0, "refunds": 0.0, "cash_sales": 0.0,
+             "cash_refunds": 0.0, "cash_tracked": 0.0, "cash_untracked": 0.0, "cash_in": 0.0})
+        operator["count"] += sold
+        operator["gross"] += sale
+        operator["refunds"] += refund
+        if row.get("payment_method") == cash_method:
+            operator["cash_sales"] += sale
+            operator["cash_refunds"] += refund
+            if not sold:
+                continue
+            if row.get("cash_received") is None:
+                operator["cash_untracked"] += amount
+            else:
+                operator["cash_tracked"] += amount
+                operator["cash_in"] += row["cash_received"] - (row.get("change_given") or 0)
+    return totals
+
+
+def food_sales_partial(path: str, date_field: Optional[str], start: Optional[str],
+                       end: Optional[str]) -> Dict[Any, Dict[str, float]]:
+    """
+    Unidades y ventas (subtotal de la línea) por item_id de las líneas de
+    comida de las órdenes activas del rango.
+    """
+    items: Dict[Any, Dict[str, float]] = {}
+    for order in _rows_in_range(path, date_field, start, end):
+        if order.get("status", "activo") != "activo":
+            continue
+        for line in order.get("items", []):
+            if line.get("type") != "food":
+                continue
+            item = items.setdefault(line.get("item_id"), {"quantity": 0, "sales": 0.0})
+            item["quantity"] += line.get("quantity", 0) or 0
+            item["sales"] += line.get("subtotal", 0) or 0
+    return items
+
+
+# ---------------------------------------------------------------------- #
+# Combinación de resultados parciales
+# ---------------------------------------------------------------------- #
+def merge_totals(partials: Iterable[Dict[str, float]]) -> Dict[str, float]:
+    """Combina resultados de `sum_partial`."""
+    merged = {"total": 0.0, "count": 0}
+    for part in partials:
+        merged["total"] += part["total"]
+        merged["count"] += part["count"]
+    return merged
+
+
+def merge_sums(partials: Iterable[Dict[Any, float]]) -> Dict[Any, float]:
+    """Combina diccionarios de sumas por clave."""
+    merged: Dict[Any, float] = {}
+    for part in partials:
+        for key, value in part.items():
+            merged[key] = merged.get(key, 0.0) + value
+    return merged
+
+
+def merge_nested(partials: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combina diccionarios anidados sumando sus valores numéricos (p. ej. `close_partial`)."""
+    merged: Dict[str, Any] = {}
+    for part in partials:
+        _add_nested(merged, part)
+    return merged
+
+
+def _add_nested(target: Dict[str, Any], part: Dict[str, Any]) -> None:
+    for key, value in part.items():
+        if isinstance(value, dict):
+            _add_nested(target.setdefault(key, {}), value)
+        else:
+            target[key] = target.get(key, 0) + value
+
+
+def merge_maps(partials: Iterable[Dict[Any, Any]]) -> Dict[Any, Any]:
+    """Combina mapas parciales en uno solo."""
+    merged: Dict[Any, Any] = {}
+    for part in partials:
+        merged.update(part)
+    return merged
+
+
+def select_top(rows: Iterable[Dict], n: int, key: str = "sales",
+               bottom: bool = False) -> List[Dict]:
+    """
+    Los `n` registros con mayor (o menor) `key` de un flujo, con un montículo
+    de tamaño n: O(m log n) en tiempo y O(n) en memoria adicional.
+    """
+    select = heapq.nsmallest if bottom else heapq.nlargest
+    return select(n, rows, key=lambda row: row[key])
+
+
+class PartitionAggregator:
+    """
+    Ejecuta una agregación por partición en un ProcessPoolExecutor.
+
+    El pool se crea la primera vez que hace falta y se reutiliza durante toda
+    la vida del proceso (se cierra con ``atexit``), así que el arranque de
+    los trabajadores se paga una sola vez. Las tareas se reparten en un bloque
+    por trabajador, de modo que el mapa de unión viaja una vez por bloque.
+
+    Con ``workers <= 1``, con menos tareas que ``min_tasks`` o si la plataforma
+    no permite crear procesos, la agregación se ejecuta en serie en el proceso
+    actual con exactamente las mismas funciones.
+    """
+
+    _pool: Optional[ProcessPoolExecutor] = None
+    _pool_workers = 0
+
+    def __init__(self, workers: int = Config.REPORT_WORKERS,
+                 min_tasks: int = Config.REPORT_PARALLEL_MIN_PARTITIONS):
+        self.workers = workers
+        self.min_tasks = min_tasks
+
+    @classmethod
+    def _shared_pool(cls, workers: int) -> ProcessPoolExecutor:
+        """Pool compartido del proceso (se recrea solo si se pide más trabajadores)."""
+        if cls._pool is None or cls._pool_workers < workers:
+            cls.shutdown()
+            cls._pool = ProcessPoolExecutor(max_workers=workers)
+            cls._pool_workers = workers
+        return cls._pool
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Cierra el pool compartido (si existe)."""
+        if cls._pool is not None:
+            cls._pool.shutdown(wait=True, cancel_futures=True)
+            cls._pool, cls._pool_workers = None, 0
+
+    def map(self, func: Callable[..., Any], tasks: List[Tuple],
+            join: Optional[Dict[Any, Any]] = None) -> List[Any]:
+        """Aplica func(*task) a cada tarea y devuelve los resultados parciales."""
+        if self.workers > 1 and len(tasks) >= self.min_tasks:
+            workers = min(self.workers, len(tasks))
+            size = -(-len(tasks) // workers)
+            chunks = [tasks[i:i + size] for i in range(0, len(tasks), size)]
+            try:
+                pool = self._shared_pool(self.workers)
+                futures = [pool.submit(_run_chunk, func, chunk, join) for chunk in chunks]
+                return [result for future in futures for result in future.result()]
+            except (OSError, NotImplementedError, BrokenProcessPool):
+                # Sin procesos disponibles: se descarta el pool y se continúa en serie
+                type(self).shutdown()
+        return _run_chunk(func, tasks, join)
+
+
+atexit.register(PartitionAggregator.shutdown)
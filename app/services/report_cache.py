@@ -0,0 +1,59 @@
+import copy
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+
+from config import Config
+from core.database import Database
+
+
+class ReportCache:
+    """
+    Caché LRU de resultados de reportes.
+
+    Cada entrada se identifica por (tipo de reporte, parámetros) y guarda las
+    versiones de los archivos de los que depende. Una escritura en cualquiera
+    de esos archivos la descarta (se escucha a ``Database``) y, si el cambio
+    vino de otro proceso, la comparación de versiones la invalida al leerla.
+    """
+
+    def __init__(self, db: Database, max_entries: int = Config.REPORT_CACHE_SIZE):
+        self.db = db
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[Tuple[str, ...], Tuple, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        db.add_write_listener(self.invalidate)
+
+    def _versions(self, depends: Iterable[str]) -> Tuple:
+        return tuple(self.db.data_version(filename) for filename in depends)
+
+    def get_or_compute(self, report: str, params: Tuple[Hashable, ...],
+                       depends: Tuple[str, ...], compute: Callable[[], Any]) -> Any:
+        """Devuelve el resultado en caché o lo calcula con `compute` y lo guarda."""
+        key = (report, params)
+        versions = self._versions(depends)
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] == versions:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[2])
+        self.misses += 1
+        result = compute()
+        self._entries[key] = (depends, versions, copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return result
+
+    def invalidate(self, filename: str) -> None:
+        """Descarta las entradas que dependen del archivo modificado."""
+        for key in [k for k, (depends, _, _) in self._entries.items() if filename in depends]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Vacía la caché."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Aciertos, fallos y cantidad de entradas en caché."""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
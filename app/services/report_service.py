@@ -1,18 +1,21 @@
-from typing import Dict
+from typing import Dict, Optional
 from datetime import datetime
-from controllers import (
-    TicketController, 
-    ReservationController,
-    PaymentController,
-    MovieController,
-    UserController
-)
+from controllers.ticket_controller import TicketController
+from controllers.reservation_controller import ReservationController
+from controllers.payment_controller import PaymentController
+from controllers.movie_controller import MovieController
+from controllers.user_controller import UserController
 from core.database import Database
+from services.report_aggregation import (
+    PartitionAggregator, merge_totals, range_tasks, sum_partial
+)
 
 class ReportService:
     """Servicio para generar reportes y estadísticas."""
     
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, aggregator: Optional[PartitionAggregator] = None):
+        self.db = db
+        self.aggregator = aggregator or PartitionAggregator()
         self.ticket_controller = TicketController(db)
         self.reservation_controller = ReservationController(db)
         self.payment_controller = PaymentController(db)
@@ -47,6 +50,26 @@ class ReportService:
             'payments': payments
         }
     
+    def generate_sales_summary(self, start_date: datetime = None,
+                                end_date: datetime = None) -> Dict:
+        """
+        Totales del reporte de ventas sin cargar los registros: cada partición
+        se agrega por separado (en paralelo si hay varias) y luego se combinan.
+        """
+        def totals(filename: str, amount_field: str) -> Dict[str, float]:
+            tasks = range_tasks(self.db, filename, start_date, end_date, (amount_field, 'activo'))
+            return merge_totals(self.aggregator.map(sum_partial, tasks))
+
+        tickets = totals('tickets.json', 'price')
+        reservations = totals('reservations.json', 'price')
+        payments = totals('payments.json', 'amount')
+        return {
+            'total_tickets': tickets['count'],
+            'total_reservations': reservations['count'],
+            'total_sales': tickets['total'] + reservations['total'],
+            'total_payments': payments['total']
+        }
+    
     def generate_movie_report(self, movie_id: int = None) -> Dict:
         """Genera un reporte de ventas por película."""
         tickets = self.ticket_controller.list_tickets()
@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config import Config
+from controllers.cinema_controller import CinemaController
+from controllers.reservation_controller import ReservationController
+from controllers.showtime_controller import ShowtimeController
+
+
+class ReservationExpiryScheduler:
+    """
+    Vence las reservas cuyo ``expiration_date`` ya pasó y libera sus asientos.
+
+    Usa la cola de vencimientos de ``ReservationController``: consultar si hay
+    algo vencido es O(1) y no lee archivos, así que ``run_if_due`` puede
+    llamarse en cada vuelta del menú. Las reservas vencidas se procesan en
+    lotes de ``batch_size``: una escritura de reservations.json para
+    marcarlas 'expirado' y una de cinemas.json para liberar los asientos.
+    """
+
+    def __init__(self, reservation_controller: ReservationController,
+                 cinema_controller: CinemaController,
+                 showtime_controller: ShowtimeController,
+                 batch_size: int = Config.RESERVATION_EXPIRY_BATCH_SIZE):
+        self.reservation_controller = reservation_controller
+        self.cinema_controller = cinema_controller
+        self.showtime_controller = showtime_controller
+        self.batch_size = batch_size
+
+    def _seats(self, reservations: List[Dict]) -> List[tuple]:
+        """(cinema_id, tipo, asiento) de cada reserva; se omiten las que no tienen función."""
+        seats = []
+        for reservation in reservations:
+            showtime = (self.showtime_controller.get_showtime_by_id(reservation['showtime_id'])
+                        if reservation.get('showtime_id') is not None else None)
+            if showtime is not None:
+                seats.append((showtime['cinema_id'], reservation['ticket_type'],
+                              reservation['seat_number']))
+        return seats
+
+    def _is_due(self, now: datetime) -> bool:
+        next_due = self.reservation_controller.next_expiration()
+        return next_due is not None and next_due <= now.isoformat()
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Procesa todas las reservas vencidas; devuelve cuántas venció y cuántos
+        asientos liberó. Sigue mientras la cola tenga vencimientos pasados (un
+        lote puede no vencer nada si sus reservas ya no estaban activas). Si
+        una escritura falla, se detiene: las reservas quedan en la cola para
+        la próxima ejecución.
+        """
+        now = now or datetime.now()
+        summary = {'expired': 0, 'seats_released': 0}
+        while self._is_due(now):
+            try:
+                expired = self.reservation_controller.expire_due(now, limit=self.batch_size)
+            except IOError:
+                break
+            summary['expired'] += len(expired)
+            if expired:
+                summary['seats_released'] += self.cinema_controller.release_seats_bulk(
+                    self._seats(expired))
+        return summary
+
+    def run_if_due(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Ejecuta ``run`` solo si la próxima reserva ya venció."""
+        now = now or datetime.now()
+        if not self._is_due(now):
+            return {}
+        return self.run(now)
@@ -0,0 +1,214 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+
+from config import Config
+from controllers.showtime_controller import ShowtimeController
+from core.interval_index import format_minutes, minutes
+
+DateLike = Union[date, datetime]
+
+
+def jornada_for(start_minute: int) -> str:
+    """Jornada de una función según su hora de inicio."""
+    if start_minute < 12 * 60:
+        return 'mañana'
+    if start_minute < 18 * 60:
+        return 'tarde'
+    return 'noche'
+
+
+class _Lane:
+    """Franja libre de una sala en un día, llenada con una secuencia de películas."""
+
+    def __init__(self, cinema_id: int, room_type: str, start: int, end: int):
+        self.cinema_id = cinema_id
+        self.room_type = room_type
+        self.start = start
+        self.end = end
+        self.sequence: List[int] = []
+
+
+class ScheduleGenerator:
+    """
+    Genera la programación de varias semanas empaquetando funciones en las
+    franjas libres de cada sala.
+
+    Objetivo: maximizar el tiempo en pantalla ponderado, donde cada función
+    vale ``peso * duración`` y las repeticiones de una película en el mismo día
+    valen ``SCHEDULE_REPEAT_DECAY`` veces menos que la anterior (así no se llena
+    el día con un solo título). Solo se programa una película en salas de su
+    mismo ``room_type``.
+
+    1. Voraz: cada franja se llena desde su inicio con la película de mayor
+       valor marginal por minuto ocupado (duración + limpieza).
+    2. Búsqueda local: en cada franja se prueba cambiar la película de una
+       función o insertar una nueva (las siguientes se corren si hay espacio)
+       y se aplica el mejor cambio que aumente el valor del día, hasta que
+       ninguno mejora o se agotan las pasadas.
+
+    Las funciones empiezan en múltiplos de ``SCHEDULE_SLOT_MINUTES`` y respetan
+    las funciones ya existentes (franjas de ``ShowtimeController.free_slots``).
+    """
+
+    def __init__(self, showtime_controller: ShowtimeController,
+                 cleaning_minutes: int = Config.SHOWTIME_CLEANING_MINUTES,
+                 slot_minutes: int = Config.SCHEDULE_SLOT_MINUTES,
+                 repeat_decay: float = Config.SCHEDULE_REPEAT_DECAY,
+                 max_passes: int = Config.SCHEDULE_LOCAL_SEARCH_PASSES):
+        self.showtime_controller = showtime_controller
+        self.cleaning_minutes = cleaning_minutes
+        self.slot_minutes = slot_minutes
+        self.repeat_decay = repeat_decay
+        self.max_passes = max_passes
+
+    # ------------------------------------------------------------------ #
+    # Valor y factibilidad
+    # ------------------------------------------------------------------ #
+    def _align(self, minute: int) -> int:
+        return -(-minute // self.slot_minutes) * self.slot_minutes
+
+    def _pack(self, lane: _Lane, sequence: List[int],
+              durations: Dict[int, int]) -> Optional[List[Tuple[int, int, int]]]:
+        """(película, inicio, fin) de la secuencia compactada, o None si no cabe."""
+        placed, cursor = [], self._align(lane.start)
+        for movie_id in sequence:
+            end = cursor + durations[movie_id]
+            if end + self.cleaning_minutes > lane.end:
+                return None
+            placed.append((movie_id, cursor, end))
+            cursor = self._align(end + self.cleaning_minutes)
+        return placed
+
+    def _show_value(self, movie_id: int, repetition: int,
+                    weights: Dict[int, float], durations: Dict[int, int]) -> float:
+        """Valor de la `repetition`-ésima función del día de una película (desde 0)."""
+        return weights[movie_id] * durations[movie_id] * self.repeat_decay ** repetition
+
+    def _count_delta(self, counts: Counter, removed: List[int], added: List[int],
+                     weights: Dict[int, float], durations: Dict[int, int]) -> float:
+        """Cambio del valor del día al quitar `removed` y agregar `added`."""
+        change = Counter(added)
+        change.subtract(removed)
+        delta = 0.0
+        for movie_id, diff in change.items():
+            current = counts[movie_id]
+            if diff > 0:
+                delta += sum(self._show_value(movie_id, current + k, weights, durations)
+                             for k in range(diff))
+            elif diff < 0:
+                delta -= sum(self._show_value(movie_id, current - 1 - k, weights, durations)
+                             for k in range(-diff))
+        return delta
+
+    # ------------------------------------------------------------------ #
+    # Fases
+    # ------------------------------------------------------------------ #
+    def _greedy(self, lane: _Lane, candidates: List[int], counts: Counter,
+                weights: Dict[int, float], durations: Dict[int, int]) -> None:
+        cursor = self._align(lane.start)
+        while True:
+            best, best_density = None, 0.0
+            for movie_id in candidates:
+                end = cursor + durations[movie_id]
+                if end + self.cleaning_minutes > lane.end:
+                    continue
+                occupied = self._align(end + self.cleaning_minutes) - cursor
+                density = self._show_value(movie_id, counts[movie_id], weights, durations) / occupied
+                if density > best_density:
+                    best, best_density = movie_id, density
+            if best is None:
+                return
+            lane.sequence.append(best)
+            counts[best] += 1
+            cursor = self._align(cursor + durations[best] + self.cleaning_minutes)
+
+    def _local_search(self, lanes: List[_Lane], candidates: Dict[str, List[int]],
+                      counts: Counter, weights: Dict[int, float],
+                      durations: Dict[int, int]) -> None:
+        for _ in range(self.max_passes):
+            improved = False
+            for lane in lanes:
+                options = candidates.get(lane.room_type, [])
+                sequence = lane.sequence
+                moves: List[Tuple[List[int], List[int], List[int]]] = []
+                for i, current in enumerate(sequence):
+                    for movie_id in options:
+                        if movie_id != current:
+                            # Cambiar la película de la función i
+                            moves.append((sequence[:i] + [movie_id] + sequence[i + 1:],
+                                          [current], [movie_id]))
+                for i in range(len(sequence) + 1):
+                    for movie_id in options:
+                        # Insertar una función en la posición i
+                        moves.append((sequence[:i] + [movie_id] + sequence[i:], [], [movie_id]))
+                best_move, best_delta = None, 1e-9
+                for new_sequence, removed, added in moves:
+                    delta = self._count_delta(counts, removed, added, weights, durations)
+                    if delta > best_delta and self._pack(lane, new_sequence, durations) is not None:
+                        best_move, best_delta = (new_sequence, removed, added), delta
+                if best_move is not None:
+                    new_sequence, removed, added = best_move
+                    counts.subtract(removed)
+                    counts.update(added)
+                    lane.sequence = new_sequence
+                    improved = True
+            if not improved:
+                return
+
+    # ------------------------------------------------------------------ #
+    # API pública
+    # ------------------------------------------------------------------ #
+    def generate(self, movies: List[Dict], rooms: List[Dict], start_date: DateLike,
+                 days: int, weights: Optional[Dict[int, float]] = None) -> List[Dict]:
+        """
+        Devuelve las funciones a crear (sin showtime_id) para `days` días desde
+        `start_date`. El peso de cada película sale de `weights`, de su campo
+        ``weight`` o vale 1.
+        """
+        if isinstance(start_date, datetime):
+            start_date = start_date.date()
+        weights = {
+            m['movie_id']: float((weights or {}).get(m['movie_id'], m.get('weight', 1)))
+            for m in movies
+        }
+        durations = {m['movie_id']: int(m['duration']) for m in movies}
+        candidates: Dict[str, List[int]] = {}
+        for movie in movies:
+            if weights[movie['movie_id']] > 0 and durations[movie['movie_id']] > 0:
+                candidates.setdefault(movie.get('room_type'), []).append(movie['movie_id'])
+
+        schedule = []
+        for offset in range(days):
+            day = start_date + timedelta(days=offset)
+            counts: Counter = Counter()
+            lanes = []
+            for room in rooms:
+                if room.get('room_type') not in candidates:
+                    continue
+                for slot_start, slot_end in self.showtime_controller.free_slots(room['cinema_id'], day):
+                    lane = _Lane(room['cinema_id'], room['room_type'],
+                                 minutes(slot_start), minutes(slot_end))
+                    self._greedy(lane, candidates[room['room_type']], counts, weights, durations)
+                    lanes.append(lane)
+            self._local_search(lanes, candidates, counts, weights, durations)
+            seats = {room['cinema_id']: dict(room.get('capacity', {})) for room in rooms}
+            for lane in lanes:
+                for movie_id, start, end in self._pack(lane, lane.sequence, durations):
+                    schedule.append({
+                        'movie_id': movie_id,
+                        'cinema_id': lane.cinema_id,
+                        'date': day.strftime("%Y-%m-%d"),
+                        'start_time': format_minutes(start),
+                        'end_time': format_minutes(end % (24 * 60)),
+                        'jornada': jornada_for(start),
+                        'available_seats': dict(seats[lane.cinema_id])
+                    })
+        schedule.sort(key=lambda st: (st['date'], st['cinema_id'], st['start_time']))
+        return schedule
+
+    def generate_and_save(self, movies: List[Dict], rooms: List[Dict], start_date: DateLike,
+                          days: int, weights: Optional[Dict[int, float]] = None) -> List[Dict]:
+        """Genera la programación y la guarda en showtimes.json con una sola escritura."""
+        schedule = self.generate(movies, rooms, start_date, days, weights)
+        return self.showtime_controller.create_showtimes_bulk(schedule)
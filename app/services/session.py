@@ -0,0 +1,53 @@
+from typing import Dict, Optional, Tuple
+
+from controllers.user_controller import UserController
+
+
+class Session:
+    """
+    Sesión del usuario autenticado con su perfil en caché.
+
+    El perfil se guarda junto con la versión que ``UserController`` lleva de
+    ese usuario; solo se vuelve a consultar cuando ``update_user`` o
+    ``delete_user`` lo modificaron (o cuando los índices se reconstruyeron por
+    un cambio externo en users.json). Si al recargarlo el usuario ya no existe
+    o no está activo, la sesión se cierra.
+    """
+
+    def __init__(self, user_controller: UserController):
+        self.user_controller = user_controller
+        self._user: Optional[Dict] = None
+        self._version: Optional[Tuple[int, int]] = None
+
+    def start(self, user: Dict) -> None:
+        """Inicia la sesión con el perfil recién autenticado."""
+        self._user = dict(user)
+        self._version = self.user_controller.user_version(user['user_id'])
+
+    def end(self) -> None:
+        """Cierra la sesión."""
+        self._user = None
+        self._version = None
+
+    @property
+    def is_authenticated(self) -> bool:
+        return self._user is not None
+
+    @property
+    def user(self) -> Optional[Dict]:
+        """Perfil del usuario actual, recargado solo si cambió."""
+        if self._user is None:
+            return None
+        version = self.user_controller.user_version(self._user['user_id'])
+        if version != self._version:
+            fresh = self.user_controller.get_user_by_id(self._user['user_id'])
+            if fresh is None or fresh.get('status', 'activo') != 'activo':
+                self.end()
+                return None
+            self._user, self._version = fresh, version
+        return self._user
+
+    @property
+    def is_admin(self) -> bool:
+        user = self.user
+        return bool(user and user.get('is_admin', False))
@@ -0,0 +1,184 @@
+import csv
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config import Config
+from controllers.user_controller import UserController
+from core.indexes import normalize_email
+from services.validation_service import ValidationService
+
+REQUIRED_FIELDS = ("username", "identification", "name", "email", "birth_date")
+EXPORT_FIELDS = ("user_id", "username", "identification", "name", "email",
+                 "birth_date", "password_hash", "status", "is_admin")
+TRUE_VALUES = {"1", "true", "si", "sí", "yes", "x"}
+
+
+class UserImportService:
+    """
+    Importación y exportación masiva de usuarios en CSV o JSONL.
+
+    La importación lee el archivo fila a fila, valida por lotes con
+    ``ValidationService``, cifra las contraseñas, descarta duplicados contra los
+    índices de ``UserController`` y guarda todos los aceptados en una sola
+    escritura. La exportación escribe fila a fila con el mismo formato
+    (``password_hash`` permite reimportar sin conocer las contraseñas).
+    """
+
+    def __init__(self, user_controller: UserController,
+                 validator: Optional[ValidationService] = None,
+                 batch_size: int = Config.USER_IMPORT_BATCH_SIZE):
+        self.user_controller = user_controller
+        self.validator = validator or ValidationService()
+        self.batch_size = batch_size
+
+    # ------------------------------------------------------------------ #
+    # Lectura / escritura por formato
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _format(path: Path) -> str:
+        suffix = path.suffix.lower()
+        if suffix == ".csv":
+            return "csv"
+        if suffix in (".jsonl", ".ndjson"):
+            return "jsonl"
+        raise ValueError("Formato no soportado: use .csv o .jsonl")
+
+    def _read_rows(self, path: Path) -> Iterator[Tuple[int, Optional[Dict], str]]:
+        """Genera (línea, fila, error) sin cargar el archivo completo."""
+        with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+            if self._format(path) == "csv":
+                reader = csv.DictReader(file)
+                for row in reader:
+                    yield reader.line_num, row, ""
+            else:
+                for line_num, line in enumerate(file, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        yield line_num, None, "JSON inválido"
+                        continue
+                    if not isinstance(row, dict):
+                        yield line_num, None, "Se esperaba un objeto JSON"
+                        continue
+                    yield line_num, row, ""
+
+    # ------------------------------------------------------------------ #
+    # Validación
+    # ------------------------------------------------------------------ #
+    def _validate(self, row: Dict) -> Tuple[Optional[Dict], str]:
+        """Valida y normaliza una fila; devuelve (usuario, '') o (None, motivo)."""
+        data = {k: str(row.get(k) or "").strip() for k in REQUIRED_FIELDS}
+        missing = [k for k in REQUIRED_FIELDS if not data[k]]
+        if missing:
+            return None, f"Faltan campos: {', '.join(missing)}"
+        valid, msg = self.validator.validate_email(data["email"])
+        if not valid:
+            return None, msg
+        valid, msg = self.validator.validate_identification(data["identification"])
+        if not valid:
+            return None, msg
+        valid, msg, birth_date = self.validator.validate_date(data["birth_date"])
+        if not valid:
+            return None, msg
+        valid, msg = self.validator.validate_age(birth_date)
+        if not valid:
+            return None, msg
+        password_hash = str(row.get("password_hash") or "").strip()
+        password = str(row.get("password") or "")
+        hasher = self.user_controller.hasher
+        if hasher.is_legacy(password_hash):
+            # Los SHA-256 heredados se comparan en hexadecimal en minúsculas
+            password_hash = password_hash.lower()
+        if password_hash and not hasher.is_valid_hash(password_hash):
+            return None, "password_hash con formato o parámetros no admitidos"
+        if not password_hash:
+            if not password:
+                return None, "Falta la contraseña"
+            valid, msg = self.validator.validate_password(password)
+            if not valid:
+                return None, msg
+        data["birth_date"] = birth_date.strftime("%Y-%m-%d")
+        data["password"] = password_hash or None
+        data["plain_password"] = password if not password_hash else None
+        data["is_admin"] = str(row.get("is_admin") or "").strip().lower() in TRUE_VALUES
+        return data, ""
+
+    def _hash_batch(self, users: List[Dict]) -> None:
+        """Cifra las contraseñas del lote en paralelo con el hasher del controlador."""
+        pending = [user for user in users if user["plain_password"] is not None]
+        hashes = self.user_controller.hasher.hash_many(u["plain_password"] for u in pending)
+        for user, hashed in zip(pending, hashes):
+            user["password"] = hashed
+        for user in users:
+            user.pop("plain_password")
+
+    # ------------------------------------------------------------------ #
+    # API pública
+    # ------------------------------------------------------------------ #
+    def import_users(self, path: str) -> Dict:
+        """
+        Importa usuarios desde un CSV o JSONL.
+        Devuelve {'imported': n, 'rejected': [{'line': l, 'username': u, 'reason': r}, ...]}.
+        """
+        path = Path(path)
+        self._format(path)
+        usernames = self.user_controller.indexes['username']
+        emails = self.user_controller.indexes['email']
+        seen_usernames, seen_emails = set(), set()
+        accepted: List[Dict] = []
+        rejected: List[Dict] = []
+
+        rows = self._read_rows(path)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            valid_batch = []
+            for line, row, error in batch:
+                user = None
+                if not error:
+                    user, error = self._validate(row)
+                if not error:
+                    email_key = normalize_email(user["email"])
+                    if user["username"] in usernames or user["username"] in seen_usernames:
+                        error = "El nombre de usuario ya existe"
+                    elif email_key in emails or email_key in seen_emails:
+                        error = "El correo electrónico ya está registrado"
+                if error:
+                    rejected.append({
+                        "line": line,
+                        "username": (row or {}).get("username", ""),
+                        "reason": error
+                    })
+                    continue
+                seen_usernames.add(user["username"])
+                seen_emails.add(normalize_email(user["email"]))
+                valid_batch.append(user)
+            self._hash_batch(valid_batch)
+            accepted.extend(valid_batch)
+
+        created = self.user_controller.create_users_bulk(accepted) if accepted else []
+        return {"imported": len(created), "rejected": rejected}
+
+    def export_users(self, path: str, active_only: bool = False) -> int:
+        """Exporta los usuarios a CSV o JSONL fila a fila; devuelve la cantidad escrita."""
+        path = Path(path)
+        fmt = self._format(path)
+        count = 0
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=EXPORT_FIELDS) if fmt == "csv" else None
+            if writer:
+                writer.writeheader()
+            for user in self.user_controller.list_users(active_only=active_only):
+                row = {field: user.get(field) for field in EXPORT_FIELDS}
+                row["password_hash"] = user.get("password")
+                if writer:
+                    writer.writerow(row)
+                else:
+                    file.write(json.dumps(row, ensure_ascii=False) + "\n")
+                count += 1
+        return count
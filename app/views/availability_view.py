@@ -3,6 +3,7 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt
 from rich import box
+from typing import Optional
 
 # Importando recursos necesarios
 from core.database import Database
@@ -15,11 +16,14 @@ from config import Config
 class AvailabilityView:
     """Vista para consultar disponibilidad de asientos."""
     
-    def __init__(self):
-        self.db = Database(str(Config.DATA_DIR))
+    def __init__(self, db: Optional[Database] = None,
+                 cinema_controller: Optional[CinemaController] = None,
+                 showtime_controller: Optional[ShowtimeController] = None):
+        self.db = db or Database(str(Config.DATA_DIR))
         self.console = Console()
-        self.cinema_controller = CinemaController(self.db)
-        self.showtime_controller = ShowtimeController(self.db)
+        self.cinema_controller = cinema_controller or CinemaController(self.db)
+        self.showtime_controller = (showtime_controller
+                                    or ShowtimeController(self.db, self.cinema_controller))
     
     def show_availability(self, showtime_id: int, cinema_id: int,
                             cinema_name: str, movie_title: str,
@@ -40,9 +44,11 @@ class AvailabilityView:
             self.console.print("[red]Error: Horario no encontrado[/]")
             return
 
-        tickets = self.db.load_data("tickets.json")
-        reservations = self.db.load_data("reservations.json")
         dt_str = showtime_str  # "YYYY-MM-DD HH:MM"
+        # Solo los tickets y reservas del día de la función (poda de particiones)
+        day = dt_str[:10]
+        tickets = self.db.load_range("tickets.json", day, day)
+        reservations = self.db.load_range("reservations.json", day, day)
 
         table = Table(box=box.ROUNDED, header_style="bold cyan")
         table.add_column("Tipo", style="cyan", min_width=12)
@@ -4,6 +4,7 @@ from rich.panel import Panel
 from rich.prompt import Prompt
 from rich import box
 from typing import Optional, Dict
+from core.menu_snapshot import MenuSnapshot
 
 class FoodView:
     """Vista para el menú de comida."""
@@ -30,9 +31,10 @@ class FoodView:
                 ("3", "Agregar item"),
                 ("4", "Actualizar item"),
                 ("5", "Desactivar item"),
+                ("6", "Inventario y reposición"),
                 ("0", "Volver al menú principal"),
             ]
-            valid_choices = ["1", "2", "3", "4", "5", "0"]
+            valid_choices = ["1", "2", "3", "4", "5", "6", "0"]
         else:
             opciones = [
                 ("1", "Ver menú completo"),
@@ -69,6 +71,7 @@ class FoodView:
                 
                 for item in [i for i in items if i['category'] == category]:
                     table.add_row(
+                        str(item['item_id']),
                         item['code'],
                         item['product'],
                         item.get('size', '-'),
@@ -97,6 +100,62 @@ class FoodView:
             
             self.console.print(table)
     
+    def show_menu(self, menu: MenuSnapshot, by_category: bool = False):
+        """Muestra el menú precalculado: las filas ya vienen agrupadas y formateadas."""
+        if by_category:
+            for category, rows in menu.categories.items():
+                self.console.print(f"\n[bold]{category}[/]")
+                table = Table(box=box.SIMPLE)
+                table.add_column("ID", style="cyan")
+                table.add_column("Código", style="yellow")
+                table.add_column("Producto", style="magenta")
+                table.add_column("Tamaño", style="white")
+                table.add_column("Precio", style="green")
+                
+                for item_id, code, _, product, size, price in rows:
+                    table.add_row(item_id, code, product, size, price)
+                
+                self.console.print(table)
+        else:
+            table = Table(title="[bold]Menú de Comida[/]", box=box.ROUNDED)
+            table.add_column("ID", style="cyan")
+            table.add_column("Código", style="yellow")
+            table.add_column("Categoría", style="blue")
+            table.add_column("Producto", style="magenta")
+            table.add_column("Tamaño", style="white")
+            table.add_column("Precio", style="green")
+            
+            for row in menu.rows:
+                table.add_row(*row)
+            
+            self.console.print(table)
+    
+    def show_inventory(self, items: list):
+        """Muestra las existencias de cada ítem y resalta las que están bajo su umbral."""
+        table = Table(title="[bold]Inventario de Comida[/]", box=box.ROUNDED)
+        table.add_column("ID", style="cyan")
+        table.add_column("Código", style="yellow")
+        table.add_column("Producto", style="magenta")
+        table.add_column("Existencias", justify="right")
+        table.add_column("Umbral", justify="right", style="white")
+        
+        for item in items:
+            if item['stock'] is None:
+                stock = "[dim]Sin control[/]"
+            elif item['stock'] <= item['threshold']:
+                stock = f"[red]{item['stock']}[/]"
+            else:
+                stock = f"[green]{item['stock']}[/]"
+            table.add_row(
+                str(item['item_id']),
+                item['code'],
+                item['product'],
+                stock,
+                str(item['threshold'])
+            )
+        
+        self.console.print(table)
+    
     def get_food_item_data(self,include_id: bool = True,is_update: bool = False,
         current_data: Dict = None) -> Optional[Dict]:
         data: Dict = {}
@@ -211,9 +270,9 @@ class FoodView:
 
         return data
 
-    def select_food_items(self, items: list) -> list:
+    def select_food_items(self, menu: MenuSnapshot) -> list:
         """Permite seleccionar items del menú para agregar a una compra."""
-        self.show_food_items(items)
+        self.show_menu(menu)
         selected_items = []
         
         while True:
@@ -225,7 +284,7 @@ class FoodView:
             if code.lower() == 'fin':
                 break
             
-            item = next((i for i in items if i['code'].lower() == code.lower()), None)
+            item = menu.by_code(code)
             if item:
                 quantity = int(Prompt.ask(f"Cantidad para '{item['product']}'", default="1"))
                 selected_items.append({'item': item, 'quantity': quantity})
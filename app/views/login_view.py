@@ -3,10 +3,12 @@ from rich.panel import Panel
 from rich.prompt import Prompt
 from datetime import datetime
 import pwinput
+from typing import Optional
 
 # Importando recursos necesarios
 from core.database import Database
 from controllers.user_controller import UserController
+from services.auth_service import AuthService
 
 # Configuración
 from config import Config
@@ -14,9 +16,14 @@ from config import Config
 class LoginView:
     """Vista para el proceso de login y registro de usuarios."""
     
-    def __init__(self):
+    def __init__(self, user_controller: Optional[UserController] = None,
+                 auth_service: Optional[AuthService] = None):
         self.console = Console()
-        self.user_controller = UserController(Database(str(Config.DATA_DIR)))
+        if user_controller is None:
+            user_controller = (auth_service.user_controller if auth_service
+                               else UserController(Database(str(Config.DATA_DIR))))
+        self.user_controller = user_controller
+        self.auth_service = auth_service or AuthService(user_controller.db, user_controller)
         self.max_attempts = 3  # Máximo de intentos permitidos
     
     def show_login_menu(self):
@@ -28,14 +35,18 @@ class LoginView:
         return Prompt.ask("Seleccione una ID:", choice=["1", "2", "0"])
         
     def show_login(self):
-        """Muestra el formulario de login con límite de intentos y opción de 'volver'."""
+        """
+        Muestra el formulario de login con límite de intentos y opción de 'volver'.
+        Cada contraseña se verifica una sola vez con ``AuthService.login``, que
+        además inicia la sesión. Devuelve el usuario autenticado, "volver" o None.
+        """
         self.console.print(Panel.fit("[bold]Iniciar Sesión[/]", border_style="blue"))
         
         for attempt in range(self.max_attempts):
             username = Prompt.ask("[cyan]Usuario[/]").strip()
             
             if username.lower() == "volver":
-                return "volver", "volver"
+                return "volver"
 
             if not username:
                 self.console.print("[red]Error: El usuario no puede estar vacío[/]")
@@ -54,14 +65,15 @@ class LoginView:
                     password = pwinput.pwinput(prompt="", mask="*").strip()
 
                     if password.lower() == "volver":
-                        return "volver", "volver"
+                        return "volver"
 
                     if password == "":
                         raise ValueError("La contraseña no puede estar vacía")
 
-                    if self.user_controller.check_password_user(username, password):
+                    user = self.auth_service.login(username, password)
+                    if user:
                         self.show_login_success()
-                        return username, password
+                        return user
 
                     remaining = self.max_attempts - (pwd_attempt + 1)
                     if remaining > 0:
@@ -69,7 +81,7 @@ class LoginView:
 
                 except (EOFError, KeyboardInterrupt):
                     self.console.print("\n[red]Entrada interrumpida. Abortando proceso de login.[/]")
-                    return None, None
+                    return None
                 except Exception as e:
                     self.console.print(f"[red]Error al ingresar la contraseña: {e}[/]")
                     break
@@ -78,7 +90,7 @@ class LoginView:
                 self.console.print(f"[yellow]Intento {attempt + 1} de {self.max_attempts} fallido. Intente nuevamente.[/]")
 
         self.console.print("[red]Ha excedido el número máximo de intentos. Volviendo al menú principal...[/]")
-        return None, None
+        return None
 
     def show_register(self):
         """Muestra el formulario de registro y devuelve los datos del usuario."""
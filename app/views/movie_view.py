@@ -3,6 +3,9 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt
 from rich import box
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
 
 # Importando recursos necesarios
 from core.database import Database
@@ -14,10 +17,11 @@ from config import Config
 class MovieView:
     """Vista para gestión de películas."""
     
-    def __init__(self):
+    def __init__(self, db: Optional[Database] = None,
+                 cinema_controller: Optional[CinemaController] = None):
         self.console = Console()
-        self.db = Database(str(Config.DATA_DIR))
-        self.cinema_controller = CinemaController(self.db)
+        self.db = db or Database(str(Config.DATA_DIR))
+        self.cinema_controller = cinema_controller or CinemaController(self.db)
     
     def show_movie_menu(self, is_admin: bool):
         """Muestra el menú de películas según el tipo de usuario con estilo uniforme."""
@@ -37,9 +41,10 @@ class MovieView:
                 ("3", "Agregar película"),
                 ("4", "Actualizar película"),
                 ("5", "Desactivar película"),
+                ("6", "Generar programación"),
                 ("0", "Volver al menú principal"),
             ]
-            valid_choices = ["1", "2", "3", "4", "5", "0"]
+            valid_choices = ["1", "2", "3", "4", "5", "6", "0"]
         else:
             opciones = [
                 ("1", "Ver cartelera completa"),
@@ -127,10 +132,11 @@ class MovieView:
         self.console.print("\n[bold]Buscar Película[/]")
         self.console.print("1. Por título")
         self.console.print("2. Por categoría")
+        self.console.print("3. Texto libre (título, director, sinopsis, categoría, idioma)")
         self.console.print("[dim]Presione Enter sin escribir nada para volver.[/]\n")
 
         while True:
-            choice = Prompt.ask("Seleccione criterio (1-2)").strip()
+            choice = Prompt.ask("Seleccione criterio (1-3)").strip()
             if choice == "":
                 self.console.print("[yellow]Volviendo al menú...[/]")
                 return None 
@@ -140,6 +146,9 @@ class MovieView:
             elif choice == "2":
                 categoria = Prompt.ask("Ingrese categoría").strip()
                 return {'category': categoria}
+            elif choice == "3":
+                texto = Prompt.ask("Ingrese las palabras a buscar").strip()
+                return {'text': texto}
             else:
                 self.console.print("[red]Opción inválida. Intente nuevamente.[/]")
         
@@ -325,4 +334,41 @@ class MovieView:
                 disp_text
             )
 
-        self.console.print(table)
\ No newline at end of file
+        self.console.print(table)
+    
+    def ask_schedule_params(self) -> Optional[Dict]:
+        """Pide la fecha inicial y la cantidad de días a programar (None para volver)."""
+        self.console.print(Panel.fit("[bold]Generar programación[/]", border_style="blue"))
+        while True:
+            resp = Prompt.ask("Fecha inicial (YYYY-MM-DD, 'volver' para regresar)",
+                              default=(date.today() + timedelta(days=1)).isoformat()).strip()
+            if resp.lower() == "volver":
+                return None
+            try:
+                start_date = datetime.strptime(resp, "%Y-%m-%d").date()
+                break
+            except ValueError:
+                self.console.print("[red]Formato inválido.[/]")
+        days = Prompt.ask("Cantidad de días", default="7").strip()
+        return {
+            "start_date": start_date,
+            "days": int(days) if days.isdigit() and int(days) > 0 else 7
+        }
+    
+    def show_schedule_summary(self, schedule: List[Dict], movies: List[Dict]):
+        """Resume la programación generada: funciones por día y por película."""
+        titles = {m["movie_id"]: m["title"] for m in movies}
+        by_day = Counter(st["date"] for st in schedule)
+        by_movie = Counter(st["movie_id"] for st in schedule)
+        table = Table(title=f"Programación generada ({len(schedule)} funciones)", box=box.ROUNDED)
+        table.add_column("Fecha", style="cyan")
+        table.add_column("Funciones", justify="right")
+        for day, count in sorted(by_day.items()):
+            table.add_row(day, str(count))
+        self.console.print(table)
+        table = Table(title="Funciones por película", box=box.ROUNDED)
+        table.add_column("Película", style="magenta")
+        table.add_column("Funciones", justify="right")
+        for movie_id, count in by_movie.most_common():
+            table.add_row(titles.get(movie_id, "N/D"), str(count))
+        self.console.print(table)
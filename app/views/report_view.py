@@ -5,8 +5,12 @@ from rich import box
 from datetime import datetime
 from typing import Optional, List, Dict
 
+from services.occupancy_series import downsample
+
 class ReportView:
     """Vista para mostrar menús y tablas de reportes."""
+    PAGE_SIZE = 20  # Filas por página en los listados largos
+
     def __init__(self):
         self.console = Console()
 
@@ -19,14 +23,17 @@ class ReportView:
             ("1","Reporte de ventas"),
             ("2","Reporte por película"),
             ("3","Reporte por usuario"),
+            ("4","Ocupación por función"),
+            ("5","Rankings (mayores/menores ventas)"),
+            ("6","Cierre de caja del día"),
             ("0","Volver al menú principal"),
         ]:
             table.add_row(id_, desc)
         self.console.print(table)
 
         while True:
-            opt = Prompt.ask("Seleccione una ID [0-3]").strip()
-            if opt in {"0","1","2","3"}:
+            opt = Prompt.ask("Seleccione una ID [0-6]").strip()
+            if opt in {"0","1","2","3","4","5","6"}:
                 return opt
             self.console.print("[red]Opción inválida[/]")
 
@@ -57,22 +64,188 @@ class ReportView:
         panel.add_row(msg)
         self.console.print(panel)
 
+    def _show_paginated(self, title: str, columns: List[str], rows: List[List[str]],
+                        page_size: int = PAGE_SIZE):
+        """Muestra filas de a `page_size` por página; Enter avanza, 'q' termina."""
+        pages = max(1, -(-len(rows) // page_size))
+        for page in range(pages):
+            table = Table(title=f"{title} ({page + 1}/{pages})" if pages > 1 else title,
+                          box=box.ROUNDED)
+            for i, name in enumerate(columns):
+                if i == 0:
+                    table.add_column(name, style="cyan")
+                elif i == len(columns) - 1:
+                    table.add_column(name, justify="right", style="yellow")
+                else:
+                    table.add_column(name, style="magenta")
+            for row in rows[page * page_size:(page + 1) * page_size]:
+                table.add_row(*row)
+            self.console.print(table)
+            if page < pages - 1:
+                if Prompt.ask("Enter para ver más, 'q' para terminar", default="").strip().lower() == "q":
+                    break
+
     def show_sales_by_movie(self, data: List[Dict]):
         """Muestra tabla con ventas por película."""
-        table = Table(title="Ventas por Película", box=box.ROUNDED)
-        table.add_column("ID", style="cyan")
-        table.add_column("Título", style="magenta")
-        table.add_column("Ventas", justify="right", style="yellow")
-        for row in data:
-            table.add_row(str(row["movie_id"]), row["title"], f"{row['sales']:,.2f}")
-        self.console.print(table)
+        rows = [[str(r["movie_id"]), r["title"], f"{r['sales']:,.2f}"] for r in data]
+        self._show_paginated("Ventas por Película", ["ID", "Título", "Ventas"], rows)
 
     def show_sales_by_user(self, data: List[Dict]):
         """Muestra tabla con ventas por usuario."""
-        table = Table(title="Ventas por Usuario", box=box.ROUNDED)
+        rows = [[str(r["user_id"]), r["username"], f"{r['sales']:,.2f}"] for r in data]
+        self._show_paginated("Ventas por Usuario", ["ID", "Usuario", "Ventas"], rows)
+
+    def ask_leaderboard(self) -> Optional[Dict]:
+        """Pregunta qué ranking mostrar: entidad, cantidad y orden."""
+        table = Table(title="Rankings", box=box.ROUNDED, border_style="magenta")
+        table.add_column("ID", justify="center")
+        table.add_column("Descripción")
+        for id_, desc in [("1", "Películas"), ("2", "Usuarios"), ("3", "Funciones"), ("4", "Comida"), ("0", "Volver")]:
+            table.add_row(id_, desc)
+        self.console.print(table)
+        kind = Prompt.ask("Seleccione una ID", choices=["0", "1", "2", "3", "4"])
+        if kind == "0":
+            return None
+        n = Prompt.ask("Cantidad de posiciones", default="10").strip()
+        order = Prompt.ask("Orden (mayores/menores)", choices=["mayores", "menores"], default="mayores")
+        return {
+            "kind": {"1": "movies", "2": "users", "3": "showtimes", "4": "food"}[kind],
+            "n": int(n) if n.isdigit() and int(n) > 0 else 10,
+            "bottom": order == "menores"
+        }
+
+    def show_leaderboard(self, kind: str, data: List[Dict], bottom: bool = False):
+        """Muestra un ranking numerado de películas, usuarios, funciones o comida."""
+        label = "Menores" if bottom else "Mayores"
+        if kind == "movies":
+            title, columns = f"{label} ventas por película", ["#", "ID", "Título", "Ventas"]
+            rows = [[str(r["movie_id"]), r["title"]] for r in data]
+        elif kind == "users":
+            title, columns = f"{label} compras por usuario", ["#", "ID", "Usuario", "Ventas"]
+            rows = [[str(r["user_id"]), r["username"]] for r in data]
+        elif kind == "food":
+            title, columns = f"{label} ventas de comida", ["#", "ID", "Producto", "Unidades", "Ventas"]
+            rows = [[str(r["item_id"]), r["product"], str(r["quantity"])] for r in data]
+        else:
+            title, columns = f"{label} ventas por función", ["#", "ID", "Película", "Función", "Ventas"]
+            rows = [[str(r["showtime_id"]), r["title"], r["showtime"]] for r in data]
+        rows = [
+            [str(pos)] + row + [f"{r['sales']:,.2f}"]
+            for pos, (row, r) in enumerate(zip(rows, data), start=1)
+        ]
+        self._show_paginated(title, columns, rows)
+
+    @staticmethod
+    def _sparkline(values: List[float], top: float) -> str:
+        """Representa una serie con bloques de altura proporcional a `top`."""
+        blocks = "▁▂▃▄▅▆▇█"
+        if top <= 0:
+            return ""
+        return "".join(blocks[min(len(blocks) - 1, int(v / top * (len(blocks) - 1)))] for v in values)
+
+    def show_occupancy(self, data: List[Dict], max_points: int = 16):
+        """Muestra la ocupación final de cada función y su evolución reducida."""
+        table = Table(title="Ocupación por Función", box=box.ROUNDED)
         table.add_column("ID", style="cyan")
-        table.add_column("Usuario", style="magenta")
-        table.add_column("Ventas", justify="right", style="yellow")
+        table.add_column("Función", style="magenta", no_wrap=True)
+        table.add_column("Vendidos", justify="right", style="green")
+        table.add_column("Reservas", justify="right", style="yellow")
+        table.add_column("Retenidos", justify="right", style="yellow")
+        table.add_column("Ocupación", justify="right")
+        table.add_column("Evolución", style="blue", no_wrap=True)
         for row in data:
-            table.add_row(str(row["user_id"]), row["username"], f"{row['sales']:,.2f}")
-        self.console.print(table)
\ No newline at end of file
+            capacity = row["capacity"] or 1
+            occupancy = (row["sold"] + row["holds"]) / capacity
+            points = downsample(row["points"], max_points)
+            table.add_row(
+                str(row["showtime_id"]), row["showtime"], str(row["sold"]),
+                str(row["reserved"]), str(row["holds"]), f"{occupancy:.0%}",
+                self._sparkline([p["sold"] + p["holds"] for p in points], capacity)
+            )
+        self.console.print(table)
+
+    def show_occupancy_detail(self, row: Dict, max_points: int = 20):
+        """Muestra la serie de una función reducida a `max_points` instantes."""
+        table = Table(title=f"Función {row['showtime_id']} - {row['showtime']}", box=box.ROUNDED)
+        table.add_column("Instante", style="cyan")
+        table.add_column("Vendidos", justify="right", style="green")
+        table.add_column("Reservas", justify="right", style="yellow")
+        table.add_column("Retenidos", justify="right", style="yellow")
+        for p in downsample(row["points"], max_points):
+            table.add_row(p["time"][:16], str(p["sold"]), str(p["reserved"]), str(p["holds"]))
+        if row.get("untimed_sales"):
+            self.console.print(f"[dim]{row['untimed_sales']} ventas sin pago registrado se cuentan desde el inicio.[/]")
+        self.console.print(table)
+
+    def ask_showtime_detail(self) -> Optional[int]:
+        """Pregunta el ID de la función a detallar; None si se deja vacío."""
+        resp = Prompt.ask("ID de función para ver el detalle (vacío para omitir)", default="").strip()
+        return int(resp) if resp.isdigit() else None
+
+    def ask_counted_cash(self) -> Optional[float]:
+        """Pregunta el efectivo contado en caja; None si se deja vacío."""
+        resp = Prompt.ask("Efectivo contado en caja (vacío para omitir)", default="").strip()
+        if not resp:
+            return None
+        try:
+            return self._parse_amount(resp)
+        except ValueError:
+            self.console.print("[red]Monto inválido.[/]")
+            return self.ask_counted_cash()
+
+    @staticmethod
+    def _parse_amount(text: str) -> float:
+        """
+        Convierte un monto escrito con separadores a float: '150.000' y
+        '150,000' son miles; '1500.50', '1500,50', '1.500,50' y '1,500.50'
+        llevan decimales. Con ambos separadores el último es el decimal; con
+        uno solo es decimal si aparece una vez seguido de 1 o 2 dígitos.
+        """
+        text = text.strip().replace(" ", "").replace("$", "")
+        if "." in text and "," in text:
+            decimal = "." if text.rfind(".") > text.rfind(",") else ","
+        elif text.count(".") == 1 or text.count(",") == 1:
+            separator = "." if "." in text else ","
+            decimal = separator if len(text.rsplit(separator, 1)[1]) in (1, 2) else None
+        else:
+            decimal = None
+        thousands = [s for s in ".," if s != decimal]
+        for separator in thousands:
+            text = text.replace(separator, "")
+        if decimal:
+            text = text.replace(decimal, ".")
+        return float(text)
+
+    def show_cash_close(self, close: Dict):
+        """Muestra el cierre de caja: totales por método y por operador con sus diferencias."""
+        methods = Table(title=f"Cierre de caja {close['day']}", box=box.ROUNDED)
+        methods.add_column("Método", style="magenta")
+        methods.add_column("Pagos", justify="right")
+        methods.add_column("Bruto", justify="right")
+        methods.add_column("Devoluciones", justify="right", style="red")
+        methods.add_column("Neto", justify="right", style="green")
+        for name, m in close['methods'].items():
+            methods.add_row(name, str(m['count']), f"{m['gross']:,.2f}",
+                            f"{m['refunds']:,.2f}", f"{m['net']:,.2f}")
+        methods.add_row("[bold]Total[/]", str(close['payments']), f"{close['gross']:,.2f}",
+                        f"{close['refunds']:,.2f}", f"[bold]{close['net']:,.2f}[/]")
+        self.console.print(methods)
+
+        operators = Table(title="Efectivo por operador", box=box.ROUNDED)
+        operators.add_column("Operador", style="cyan")
+        operators.add_column("Neto", justify="right")
+        operators.add_column("Efectivo esperado", justify="right")
+        operators.add_column("Recibido - cambio", justify="right")
+        operators.add_column("Diferencia", justify="right")
+        for operator_id, o in close['operators'].items():
+            style = "green" if o['discrepancy'] == 0 else "red"
+            operators.add_row(operator_id, f"{o['net']:,.2f}", f"{o['cash_expected']:,.2f}",
+                              f"{o['cash_in']:,.2f}", f"[{style}]{o['discrepancy']:,.2f}[/]")
+        self.console.print(operators)
+
+        if close['counted_cash'] is not None:
+            style = "green" if close['counted_difference'] == 0 else "red"
+            self.console.print(
+                f"Efectivo contado: {close['counted_cash']:,.2f} - esperado: "
+                f"{close['cash_expected']:,.2f} = [{style}]{close['counted_difference']:,.2f}[/]"
+            )
@@ -4,7 +4,7 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt
 from rich import box
-from typing import List
+from typing import List, Optional
 
 # Importando recursos necesarios
 from core.database import Database
@@ -17,11 +17,13 @@ from config import Config
 
 class ReservationView:
     """Vista para reservación y gestión de reservas."""
-    def __init__(self):
-        self.db = Database(str(Config.DATA_DIR))
+    def __init__(self, db: Optional[Database] = None,
+                 movie_view: Optional[MovieView] = None,
+                 showtime_controller: Optional[ShowtimeController] = None):
+        self.db = db or Database(str(Config.DATA_DIR))
         self.console = Console()
-        self.movie_view = MovieView()
-        self.showtime_controller = ShowtimeController(self.db)
+        self.movie_view = movie_view or MovieView(self.db)
+        self.showtime_controller = showtime_controller or ShowtimeController(self.db)
     
     def show_reservation_menu(self):
         """Muestra el menú de reservaciones con estilo uniforme."""
@@ -131,13 +133,33 @@ class ReservationView:
         
         return int(Prompt.ask("Ingrese ID de la reserva a cancelar"))
     
-    def select_reservation_to_convert(self, reservations: list):
-        """Permite seleccionar una reserva para convertir a ticket."""
+    def select_reservation_to_convert(self, reservations: list) -> List[int]:
+        """Permite seleccionar una o varias reservas (IDs separados por coma) para convertir a ticket."""
         self.show_reservations(reservations)
         if not reservations:
-            return None
+            return []
         
-        return int(Prompt.ask("Ingrese ID de la reserva a convertir"))
+        while True:
+            raw = Prompt.ask("Ingrese ID(s) de la(s) reserva(s) a convertir (separados por coma)")
+            try:
+                return [int(part) for part in raw.split(",") if part.strip()]
+            except ValueError:
+                self.console.print("[red]Ingrese solo IDs numéricos separados por coma[/]")
+    
+    def show_conversion_results(self, results: List[dict]):
+        """Muestra el resultado de convertir cada reserva a ticket."""
+        table = Table(title="Conversión de reservas", box=box.ROUNDED)
+        table.add_column("Reserva", style="cyan")
+        table.add_column("Resultado")
+        table.add_column("Ticket", style="green")
+        for result in results:
+            ticket = result.get('ticket')
+            table.add_row(
+                str(result['reservation_id']),
+                "[green]Convertida[/]" if result['ok'] else f"[red]{result['error']}[/]",
+                str(ticket['ticket_id']) if ticket else "-"
+            )
+        self.console.print(table)
     
     def select_seat(self, available_seats: List[str]) -> str:
         """Muestra y permite seleccionar un asiento disponible"""
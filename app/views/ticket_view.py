@@ -4,7 +4,7 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt
 from rich import box
-from typing import List
+from typing import List, Optional
 
 # Importando recursos necesarios
 from core.database import Database
@@ -17,11 +17,13 @@ from config import Config
 
 class TicketView:
     """Vista para compra y gestión de tickets."""
-    def __init__(self):
-        self.db = Database(str(Config.DATA_DIR))
+    def __init__(self, db: Optional[Database] = None,
+                 movie_view: Optional[MovieView] = None,
+                 showtime_controller: Optional[ShowtimeController] = None):
+        self.db = db or Database(str(Config.DATA_DIR))
         self.console = Console()
-        self.movie_view = MovieView()
-        self.showtime_controller = ShowtimeController(self.db)
+        self.movie_view = movie_view or MovieView(self.db)
+        self.showtime_controller = showtime_controller or ShowtimeController(self.db)
         
     def show_ticket_menu(self):
         """Muestra el menú de tickets con estilo uniforme."""
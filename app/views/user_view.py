@@ -16,10 +16,11 @@ from config import Config
 class UserView:
     """Vista para gestión de usuarios."""
     
-    def __init__(self):
+    def __init__(self, db: Optional[Database] = None,
+                 user_controller: Optional[UserController] = None):
         self.console = Console()
-        self.db = Database(str(Config.DATA_DIR))
-        self.user_controller = UserController(self.db)
+        self.db = db or Database(str(Config.DATA_DIR))
+        self.user_controller = user_controller or UserController(self.db)
         
     def show_user_menu(self, is_admin: bool):
         """Muestra el menú de gestión de usuarios con estilo uniforme."""
@@ -38,9 +39,11 @@ class UserView:
                 ("3", "Crear usuario"),
                 ("4", "Actualizar usuario"),
                 ("5", "Desactivar usuario"),
+                ("6", "Importar usuarios (CSV/JSONL)"),
+                ("7", "Exportar usuarios (CSV/JSONL)"),
                 ("0", "Volver al menú principal"),
             ]
-            valid_choices = ["1", "2", "3", "4", "5", "0"]
+            valid_choices = ["1", "2", "3", "4", "5", "6", "7", "0"]
         else:
             opciones = [
                 ("1", "Mi Perfil"),
@@ -206,10 +209,11 @@ class UserView:
             self.console.print("1. Por ID")
             self.console.print("2. Por username")
             self.console.print("3. Por nombre")
+            self.console.print("4. Texto libre (usuario, nombre, email o identificación)")
             self.console.print("[dim]Presione Enter sin escribir nada para volver.[/]\n")
 
             while True:
-                choice = Prompt.ask("Seleccione criterio (1-3)").strip()
+                choice = Prompt.ask("Seleccione criterio (1-4)").strip()
                 if choice == "":
                     self.console.print("[yellow]Volviendo al menú...[/]")
                     return None
@@ -222,5 +226,41 @@ class UserView:
                 elif choice == "3":
                     name_part = Prompt.ask("Ingrese parte del nombre").strip()
                     return {"name": name_part} if name_part else {}
+                elif choice == "4":
+                    text = Prompt.ask("Ingrese el texto a buscar").strip()
+                    return {"text": text} if text else {}
                 else:
-                    self.console.print("[red]Opción inválida. Intente nuevamente.[/]")
\ No newline at end of file
+                    self.console.print("[red]Opción inválida. Intente nuevamente.[/]")
+
+    def ask_file_path(self, label: str) -> Optional[str]:
+        """Pide la ruta de un archivo .csv o .jsonl; None si se deja vacío."""
+        path = Prompt.ask(f"{label} (.csv o .jsonl, Enter para volver)", default="").strip()
+        return path or None
+
+    def show_import_result(self, result: dict, max_rows: int = 20):
+        """Muestra el resumen de una importación y las primeras filas rechazadas."""
+        rejected = result.get('rejected', [])
+        self.console.print(
+            f"[green]Importados: {result.get('imported', 0)}[/]  "
+            f"[red]Rechazados: {len(rejected)}[/]"
+        )
+        if not rejected:
+            return
+        table = Table(title="Filas rechazadas", box=box.ROUNDED)
+        table.add_column("Línea", justify="right", style="cyan")
+        table.add_column("Usuario", style="magenta")
+        table.add_column("Motivo", style="red")
+        for row in rejected[:max_rows]:
+            table.add_row(str(row['line']), str(row['username'] or ""), row['reason'])
+        self.console.print(table)
+        if len(rejected) > max_rows:
+            self.console.print(f"[dim]... y {len(rejected) - max_rows} filas más.[/]")
+
+    def show_users_page(self, users: list, page: int, total: int, page_size: int) -> bool:
+        """Muestra una página de resultados; devuelve True si se pide la siguiente."""
+        pages = max(1, -(-total // page_size))
+        self.show_users(users)
+        self.console.print(f"[dim]Página {page + 1} de {pages} ({total} resultados)[/]")
+        if page + 1 >= pages:
+            return False
+        return Prompt.ask("Enter para ver más, 'q' para terminar", default="").strip().lower() != "q"